@@ -1,20 +1,37 @@
+import logging
+import time
 import typing
 from collections.abc import Callable
+from dataclasses import dataclass
 from functools import wraps
 from typing import Any, Generic, Literal, Protocol, TypeVar, cast, overload
 
+from django.conf import settings
 from django.contrib.auth.views import redirect_to_login as redirect_to_login_url
+from django.db import connection
 from django.http import HttpResponse
 
 from recipeyak.api.base.exceptions import APIError, RequestValidationError
 from recipeyak.api.base.json import json_loads
+from recipeyak.api.base.metrics import (
+    QueryBudgetExceededError,
+    QueryRecorder,
+    endpoint_metrics,
+)
 from recipeyak.api.base.request import AnonymousHttpRequest, AuthedHttpRequest
 from recipeyak.api.base.response import JsonResponse
 from recipeyak.api.base.serialization import Params
 
+log = logging.getLogger(__name__)
+
 _P = TypeVar("_P", bound="Params | None", contravariant=True)
 
 
+@dataclass(slots=True)
+class _Timings:
+    serialize: float = 0.0
+
+
 class AuthedView(Protocol, Generic[_P]):
     def __call__(self, request: AuthedHttpRequest, params: _P) -> Any: ...
 
@@ -38,22 +55,72 @@ class AnyView(Protocol):
 
 @overload
 def endpoint(
-    *, auth_required: Literal[False], redirect_to_login: bool = ...
+    *,
+    auth_required: Literal[False],
+    redirect_to_login: bool = ...,
+    query_budget: int | Callable[[], int] | None = ...,
 ) -> Callable[[AnonView[_P]], AnonView[_P]]: ...
 
 
 @overload
 def endpoint(
-    *, auth_required: Literal[True] = ..., redirect_to_login: bool = ...
+    *,
+    auth_required: Literal[True] = ...,
+    redirect_to_login: bool = ...,
+    query_budget: int | Callable[[], int] | None = ...,
 ) -> Callable[[AuthedView[_P]], AuthedView[_P]]: ...
 
 
 def endpoint(
-    *, auth_required: bool = True, redirect_to_login: bool = False
+    *,
+    auth_required: bool = True,
+    redirect_to_login: bool = False,
+    query_budget: int | Callable[[], int] | None = None,
 ) -> Callable[[AnyView], AnyView]:
+    """
+    `query_budget` is the most queries a request should make, including
+    loading the session & user. Going over fails tests & logs a warning
+    otherwise. Pass a function for budgets depending on config, it's called
+    per request.
+    """
+
     def decorator_func(func: AnyView) -> AnyView:
         @wraps(func)
         def wrapper(request: Any, **kwargs: Any) -> HttpResponse:
+            recorder = QueryRecorder()
+            timings = _Timings()
+            response: HttpResponse | None = None
+            try:
+                with connection.execute_wrapper(recorder):
+                    response = handle(request, kwargs, timings)
+            finally:
+                budget = query_budget() if callable(query_budget) else query_budget
+                budget_exceeded = budget is not None and recorder.count > budget
+                endpoint_metrics.record(
+                    endpoint=func.__name__,
+                    queries=recorder.count,
+                    db_seconds=recorder.duration,
+                    serialize_seconds=timings.serialize,
+                    response_bytes=(
+                        len(response.content)
+                        if response is not None and not response.streaming
+                        else 0
+                    ),
+                    budget_exceeded=budget_exceeded,
+                )
+            if budget_exceeded:
+                message = (
+                    f"{func.__name__} made {recorder.count} queries, budget is {budget}"
+                )
+                if settings.TESTING:
+                    raise QueryBudgetExceededError(message)
+                log.warning(message)
+            assert response is not None
+            return response
+
+        def handle(
+            request: Any, kwargs: dict[str, Any], timings: _Timings
+        ) -> HttpResponse:
             if auth_required and not request.user.is_authenticated:
                 if redirect_to_login:
                     return redirect_to_login_url(
@@ -73,7 +140,10 @@ def endpoint(
                 return HttpResponse(status=204)
             if isinstance(response_data, HttpResponse):
                 return response_data
-            return JsonResponse(response_data)
+            start = time.perf_counter()
+            response = JsonResponse(response_data)
+            timings.serialize = time.perf_counter() - start
+            return response
 
         return wrapper
 
@@ -0,0 +1,182 @@
+"""
+Per-endpoint request metrics, recorded by `endpoint`.
+
+Queries are counted with `connection.execute_wrapper` so this works in
+production, where `connection.queries` is only populated with DEBUG.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, replace
+from typing import Any
+
+# (name, type, help, stats attribute)
+MetricTable = Sequence[tuple[str, str, str, str]]
+
+
+def render_prometheus(
+    metrics: MetricTable, samples: Iterable[tuple[dict[str, str], object]]
+) -> str:
+    """
+    Render in the Prometheus text exposition format, a series for each
+    `(labels, stats)` in `samples`.
+
+    Each gunicorn worker keeps its own stats, so we label them with the pid
+    to keep series from different workers apart.
+    """
+    pid = os.getpid()
+    samples = list(samples)
+    lines = list[str]()
+    for name, kind, help_text, attr in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, stats in samples:
+            label_text = ",".join(
+                f'{key}="{value}"'
+                for key, value in (labels | {"pid": str(pid)}).items()
+            )
+            lines.append(f"{name}{{{label_text}}} {getattr(stats, attr)}")
+    return "\n".join(lines) + "\n"
+
+
+class QueryBudgetExceededError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class QueryRecorder:
+    """
+    Pass to `connection.execute_wrapper` to count queries & time spent in
+    the database.
+    """
+
+    count: int = 0
+    duration: float = 0.0
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    response_bytes: int = 0
+    budget_exceeded: int = 0
+
+
+_METRICS: MetricTable = [
+    (
+        "recipeyak_endpoint_requests_total",
+        "counter",
+        "Requests handled by the endpoint.",
+        "requests",
+    ),
+    (
+        "recipeyak_endpoint_queries_total",
+        "counter",
+        "Database queries made by the endpoint.",
+        "queries",
+    ),
+    (
+        "recipeyak_endpoint_queries_max",
+        "gauge",
+        "Most database queries made by a single request since startup.",
+        "max_queries",
+    ),
+    (
+        "recipeyak_endpoint_db_seconds_total",
+        "counter",
+        "Time spent executing database queries.",
+        "db_seconds",
+    ),
+    (
+        "recipeyak_endpoint_serialize_seconds_total",
+        "counter",
+        "Time spent serializing responses.",
+        "serialize_seconds",
+    ),
+    (
+        "recipeyak_endpoint_response_bytes_total",
+        "counter",
+        "Size of response bodies.",
+        "response_bytes",
+    ),
+    (
+        "recipeyak_endpoint_query_budget_exceeded_total",
+        "counter",
+        "Requests that made more queries than the endpoint's budget.",
+        "budget_exceeded",
+    ),
+]
+
+
+class EndpointMetrics:
+    """
+    Aggregated stats for each endpoint in this process.
+    """
+
+    def __init__(self) -> None:
+        self._stats = dict[str, EndpointStats]()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        *,
+        endpoint: str,
+        queries: int,
+        db_seconds: float,
+        serialize_seconds: float,
+        response_bytes: int,
+        budget_exceeded: bool,
+    ) -> None:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = EndpointStats()
+            stats.requests += 1
+            stats.queries += queries
+            stats.max_queries = max(stats.max_queries, queries)
+            stats.db_seconds += db_seconds
+            stats.serialize_seconds += serialize_seconds
+            stats.response_bytes += response_bytes
+            stats.budget_exceeded += budget_exceeded
+
+    def snapshot(self) -> dict[str, EndpointStats]:
+        with self._lock:
+            return {name: replace(stats) for name, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def prometheus(self) -> str:
+        return render_prometheus(
+            _METRICS,
+            (
+                ({"endpoint": endpoint}, stats)
+                for endpoint, stats in sorted(self.snapshot().items())
+            ),
+        )
+
+
+endpoint_metrics = EndpointMetrics()
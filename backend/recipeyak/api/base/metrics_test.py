@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection
+from django.test.client import Client, RequestFactory
+from pytest_django.fixtures import SettingsWrapper
+
+from recipeyak import config
+from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.metrics import (
+    QueryBudgetExceededError,
+    endpoint_metrics,
+    render_prometheus,
+)
+from recipeyak.api.base.request import AnonymousHttpRequest
+from recipeyak.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@endpoint(auth_required=False, query_budget=2)
+def three_queries_view(request: AnonymousHttpRequest, params: None) -> dict[str, int]:
+    with connection.cursor() as cursor:
+        for _ in range(3):
+            cursor.execute("select 1")
+    return {"ok": 1}
+
+
+def test_endpoint_records_metrics(client: Client, user: User) -> None:
+    endpoint_metrics.clear()
+    client.force_login(user)
+
+    res = client.get("/api/v1/user/")
+    assert res.status_code == 200
+
+    stats = endpoint_metrics.snapshot()["user_retrieve_view"]
+    assert stats.requests == 1
+    assert stats.queries == stats.max_queries > 0
+    assert stats.db_seconds > 0
+    assert stats.response_bytes == len(res.content)
+    assert stats.budget_exceeded == 0
+
+
+def test_query_budget_exceeded_fails_tests() -> None:
+    with pytest.raises(QueryBudgetExceededError, match="made 3 queries, budget is 2"):
+        three_queries_view(RequestFactory().get("/"))  # type: ignore[call-arg, arg-type]
+
+
+def test_query_budget_exceeded_in_production(settings: SettingsWrapper) -> None:
+    """
+    Outside of tests we still serve the request, but count it.
+    """
+    settings.TESTING = False
+    endpoint_metrics.clear()
+
+    res = three_queries_view(RequestFactory().get("/"))  # type: ignore[call-arg, arg-type]
+
+    assert res.status_code == 200
+    stats = endpoint_metrics.snapshot()["three_queries_view"]
+    assert (stats.queries, stats.budget_exceeded) == (3, 1)
+
+
+def test_render_prometheus() -> None:
+    pid = os.getpid()
+    assert render_prometheus(
+        [
+            ("app_hits_total", "counter", "Hits.", "hits"),
+            ("app_size", "gauge", "Size.", "size"),
+        ],
+        [
+            ({"endpoint": "a"}, SimpleNamespace(hits=1, size=2)),
+            ({"endpoint": "b"}, SimpleNamespace(hits=3, size=4)),
+        ],
+    ) == (
+        "# HELP app_hits_total Hits.\n"
+        "# TYPE app_hits_total counter\n"
+        f'app_hits_total{{endpoint="a",pid="{pid}"}} 1\n'
+        f'app_hits_total{{endpoint="b",pid="{pid}"}} 3\n'
+        "# HELP app_size Size.\n"
+        "# TYPE app_size gauge\n"
+        f'app_size{{endpoint="a",pid="{pid}"}} 2\n'
+        f'app_size{{endpoint="b",pid="{pid}"}} 4\n'
+    )
+    assert render_prometheus(
+        [("app_hits_total", "counter", "Hits.", "hits")],
+        [({}, SimpleNamespace(hits=1))],
+    ).endswith(f'app_hits_total{{pid="{pid}"}} 1\n')
+
+
+def test_metrics_retrieve_view(
+    client: Client, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    endpoint_metrics.clear()
+    client.force_login(user)
+    assert client.get("/api/v1/user/").status_code == 200
+
+    # disabled without a token
+    monkeypatch.setattr(config, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(config, "METRICS_TOKEN", "secret")
+    res = client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong")
+    assert res.status_code == 404
+
+    res = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+    assert res.status_code == 200
+    assert res["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = res.content.decode()
+    assert "# TYPE recipeyak_endpoint_requests_total counter" in body
+    assert 'recipeyak_endpoint_requests_total{endpoint="user_retrieve_view",' in body
+    assert "# TYPE recipeyak_realtime_messages_dropped_total counter" in body
+    assert "# TYPE recipeyak_calendar_feed_polls_total counter" in body
+    assert "recipeyak_search_index_queue_size " in body
+    assert "# TYPE recipeyak_search_index_queue_lag_seconds gauge" in body
@@ -20,6 +20,18 @@ class JsonResponse(HttpResponse, Generic[_T]):
         super().__init__(content=content, **kwargs)
 
 
+class JsonBytesResponse(HttpResponse, Generic[_T]):
+    """
+    JSON that's already been serialized, e.g., by Postgres.
+
+    `_T` is the shape of the JSON, for the API schema.
+    """
+
+    def __init__(self, content: bytes, **kwargs: Any) -> None:
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=content, **kwargs)
+
+
 class YamlResponse(HttpResponse):
     """
     An HTTP response class that consumes data to be serialized to YAML.
@@ -3,14 +3,15 @@ from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any, Literal, Protocol
 
-from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from django.http import HttpRequest, HttpResponseNotAllowed
+from django.http.response import HttpResponseBase
 from django.urls import URLPattern, path, re_path
 
 Method = Literal["get", "post", "patch", "delete", "head"]
 
 
 class View(Protocol):
-    def __call__(self, request: Any, *args: Any, **kwargs: Any) -> HttpResponse: ...
+    def __call__(self, request: Any, *args: Any, **kwargs: Any) -> HttpResponseBase: ...
 
     @property
     def __name__(self) -> str: ...
@@ -29,7 +30,7 @@ def _method_router(
     *args: Any,
     method_to_view: dict[str, View],
     **kwargs: dict[str, Any],
-) -> HttpResponse:
+) -> HttpResponseBase:
     view = (
         method_to_view.get(request.method.lower())
         if request.method is not None
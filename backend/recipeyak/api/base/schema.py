@@ -23,6 +23,7 @@ import pydantic
 import typer
 
 from recipeyak.api.base.json import json_dumps
+from recipeyak.api.base.response import JsonBytesResponse
 from recipeyak.api.base.router import Route
 
 os.environ.setdefault("DEBUG", "1")
@@ -314,6 +315,8 @@ def _route_to_endpoint(route: Route) -> _Endpoint:
     endpoint_types = typing.get_type_hints(route.view)
     # grab the return type: -> T
     return_type = endpoint_types.pop("return")
+    if typing.get_origin(return_type) is JsonBytesResponse:
+        return_type = typing.get_args(return_type)[0]
     if return_type is type(None):
         return_type_schema = None
     else:
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Annotated
+
+import pydantic
+from django.db.models import Q, QuerySet
+from pydantic import Field
+
+from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.exceptions import APIError
+from recipeyak.api.base.request import AuthedHttpRequest
+from recipeyak.api.base.serialization import Params
+from recipeyak.api.calendar_serialization import (
+    CreatedBySerializer,
+    RecipeMetadataSerializer,
+    serialize_created_by,
+    serialize_recipe_metadata,
+)
+from recipeyak.models import Recipe, ScheduledRecipe, User, get_team
+
+
+class CalendarDaysListParams(Params):
+    start: date
+    end: date
+    cursor: Annotated[
+        str | None,
+        Field(description="The `next_cursor` from the previous page."),
+    ] = None
+    limit: Annotated[int, Field(ge=1, le=500)] = 200
+
+
+class CalendarDayScheduledRecipe(pydantic.BaseModel):
+    id: int
+    created: datetime
+    recipe_id: int
+    created_by_id: int | None
+
+
+class CalendarDay(pydantic.BaseModel):
+    on: date
+    scheduled_recipes: list[CalendarDayScheduledRecipe]
+
+
+class CalendarDaysListResponse(pydantic.BaseModel):
+    days: list[CalendarDay]
+    recipes: Annotated[
+        list[RecipeMetadataSerializer],
+        Field(description="The recipes scheduled on this page, once each."),
+    ]
+    users: Annotated[
+        list[CreatedBySerializer],
+        Field(description="The users who scheduled the recipes on this page."),
+    ]
+    next_cursor: Annotated[
+        str | None,
+        Field(
+            description="Pass as `cursor` to fetch the next page, which may continue the last day."
+        ),
+    ]
+
+
+def encode_cursor(*, on: date, scheduled_recipe_id: int) -> str:
+    return base64.urlsafe_b64encode(
+        f"{on.isoformat()},{scheduled_recipe_id}".encode()
+    ).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        on, scheduled_recipe_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split(",")
+        )
+        return date.fromisoformat(on), int(scheduled_recipe_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise APIError(code="invalid_cursor", message="Invalid cursor") from e
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledRecipeRow:
+    id: int
+    on: date
+    created: datetime
+    recipe_id: int
+    created_by_id: int | None
+
+
+def scheduled_recipes_page(
+    *, team_id: int, start: date, end: date, after: tuple[date, int] | None
+) -> QuerySet[ScheduledRecipe]:
+    """
+    Scheduled recipes in the date range ordered by `(on, id)`, which the
+    `(team_id, on, id)` index gives us without sorting.
+    """
+    queryset = ScheduledRecipe.objects.filter(
+        team_id=team_id, on__gte=start, on__lte=end
+    )
+    if after is not None:
+        after_on, after_id = after
+        # the on__gte lets the index scan start at the cursor's day
+        queryset = queryset.filter(on__gte=after_on).filter(
+            Q(on__gt=after_on) | Q(on=after_on, id__gt=after_id)
+        )
+    return queryset.order_by("on", "id")
+
+
+@endpoint(query_budget=6)
+def calendar_days_list_view(
+    request: AuthedHttpRequest, params: CalendarDaysListParams
+) -> CalendarDaysListResponse:
+    """
+    The team's schedule grouped by day, a page of scheduled recipes at a
+    time.
+
+    Recipes & users are listed once per page instead of with every
+    scheduled recipe. A day can span pages, so merge days with the same
+    `on`.
+    """
+    team_id = get_team(request.user).id
+    after = decode_cursor(params.cursor) if params.cursor is not None else None
+    # fetch an extra row to know if there's another page
+    rows = [
+        ScheduledRecipeRow(*row)
+        for row in scheduled_recipes_page(
+            team_id=team_id, start=params.start, end=params.end, after=after
+        ).values_list("id", "on", "created", "recipe_id", "created_by_id")[
+            : params.limit + 1
+        ]
+    ]
+    page = rows[: params.limit]
+
+    days = list[CalendarDay]()
+    for row in page:
+        if not days or days[-1].on != row.on:
+            days.append(CalendarDay(on=row.on, scheduled_recipes=[]))
+        days[-1].scheduled_recipes.append(
+            CalendarDayScheduledRecipe(
+                id=row.id,
+                created=row.created,
+                recipe_id=row.recipe_id,
+                created_by_id=row.created_by_id,
+            )
+        )
+
+    recipe_ids = {row.recipe_id for row in page}
+    user_ids = {row.created_by_id for row in page if row.created_by_id is not None}
+    recipes = (
+        Recipe.objects.filter(id__in=recipe_ids)
+        .select_related("primary_image")
+        .order_by("id")
+        if recipe_ids
+        else []
+    )
+    users = (
+        User.objects.filter(id__in=user_ids)
+        .select_related("profile_upload")
+        .order_by("id")
+        if user_ids
+        else []
+    )
+
+    next_cursor = (
+        encode_cursor(on=page[-1].on, scheduled_recipe_id=page[-1].id)
+        if len(rows) > params.limit
+        else None
+    )
+    return CalendarDaysListResponse(
+        days=days,
+        recipes=[serialize_recipe_metadata(recipe) for recipe in recipes],
+        users=[serialize_created_by(user) for user in users],
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.client import Client
+
+from recipeyak.api.calendar_days_list_view import scheduled_recipes_page
+from recipeyak.models import Recipe, ScheduledRecipe, Team, User
+
+pytestmark = pytest.mark.django_db
+
+
+def test_calendar_days_list_pagination(
+    client: Client, user: User, user2: User, recipe: Recipe, team: Team
+) -> None:
+    team.force_join(user2)
+    other_recipe = Recipe.objects.create(name="Soup", team=team)
+    start = date(2024, 1, 1)
+    for day in range(4):
+        for recipe_, created_by in [(recipe, user), (other_recipe, user2)]:
+            ScheduledRecipe.objects.create(
+                recipe=recipe_,
+                team=team,
+                on=start + timedelta(days=day),
+                created_by=created_by,
+            )
+    # outside of the range
+    ScheduledRecipe.objects.create(recipe=recipe, team=team, on=date(2024, 2, 1))
+    expected_ids = list(
+        ScheduledRecipe.objects.filter(team=team, on__lte=date(2024, 1, 31))
+        .order_by("on", "id")
+        .values_list("id", flat=True)
+    )
+    client.force_login(user)
+
+    seen_ids = []
+    days = []
+    cursor = None
+    pages = []
+    while True:
+        params: dict[str, str | int] = {
+            "start": "2024-01-01",
+            "end": "2024-01-31",
+            "limit": 3,
+        }
+        if cursor is not None:
+            params["cursor"] = cursor
+        res = client.get("/api/v1/calendar/days/", params)
+        assert res.status_code == 200
+        page = res.json()
+        pages.append(page)
+        for calendar_day in page["days"]:
+            days.append(calendar_day["on"])
+            seen_ids += [x["id"] for x in calendar_day["scheduled_recipes"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(pages) == 3
+    assert seen_ids == expected_ids
+    # the second day spans the first two pages
+    assert days == [
+        "2024-01-01",
+        "2024-01-02",
+        "2024-01-02",
+        "2024-01-03",
+        "2024-01-04",
+    ]
+    # recipes & users are listed once per page
+    first = pages[0]
+    assert [x["id"] for x in first["recipes"]] == sorted([recipe.id, other_recipe.id])
+    assert {x["name"] for x in first["recipes"]} == {recipe.name, "Soup"}
+    assert sorted(x["id"] for x in first["users"]) == sorted([user.id, user2.id])
+    assert first["days"][0]["scheduled_recipes"][0].keys() == {
+        "id",
+        "created",
+        "recipe_id",
+        "created_by_id",
+    }
+
+
+def test_calendar_days_list_errors(client: Client, user: User, team: Team) -> None:
+    client.force_login(user)
+    res = client.get(
+        "/api/v1/calendar/days/",
+        {"start": "2024-01-01", "end": "2024-01-31", "cursor": "bogus"},
+    )
+    assert res.status_code == 400
+
+
+def test_calendar_days_list_uses_index(team: Team) -> None:
+    """
+    Our test tables are tiny so Postgres would rather scan them, discourage
+    that to check the index covers the query.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("set local enable_seqscan = off")
+    plan = scheduled_recipes_page(
+        team_id=team.id,
+        start=date(2024, 1, 1),
+        end=date(2024, 1, 31),
+        after=(date(2024, 1, 10), 1),
+    ).explain()
+    assert "scheduled_recipe_team_on" in plan
+    # the index is in (on, id) order already
+    assert "Sort" not in plan
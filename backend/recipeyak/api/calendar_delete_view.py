@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from django.db import transaction
+
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
@@ -16,8 +18,11 @@ class CalendarDeleteParams(Params):
 def calendar_delete_view(
     request: AuthedHttpRequest, params: CalendarDeleteParams
 ) -> None:
-    team_id = get_team(request.user).id
-    get_scheduled_recipes(team_id).filter(id=params.scheduled_recipe_id).delete()
-    publish_calendar_event_deleted(
-        recipe_id=params.scheduled_recipe_id, team_id=team_id
-    )
+    team = get_team(request.user)
+    team_id = team.id
+    with transaction.atomic():
+        get_scheduled_recipes(team_id).filter(id=params.scheduled_recipe_id).delete()
+        team.invalidate_shoppinglists()
+        publish_calendar_event_deleted(
+            recipe_id=params.scheduled_recipe_id, team_id=team_id
+        )
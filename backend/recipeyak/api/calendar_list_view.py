@@ -36,7 +36,7 @@ class CalendarListResponse(TypedDict):
     scheduledRecipes: list[ScheduleRecipeSerializer]
 
 
-@endpoint()
+@endpoint(query_budget=4)
 def calendar_list_view(
     request: AuthedHttpRequest, params: CalendarListParams
 ) -> CalendarListResponse:
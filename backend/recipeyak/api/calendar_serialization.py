@@ -4,8 +4,9 @@ from datetime import date, datetime
 
 import pydantic
 
+from recipeyak.models.recipe import Recipe
 from recipeyak.models.scheduled_recipe import ScheduledRecipe
-from recipeyak.models.user import get_avatar_url
+from recipeyak.models.user import User, get_avatar_url
 
 
 class CreatedBySerializer(pydantic.BaseModel):
@@ -38,39 +39,45 @@ class ScheduleRecipeSerializer(pydantic.BaseModel):
     on: date
 
 
+def serialize_created_by(user: User) -> CreatedBySerializer:
+    return CreatedBySerializer(
+        id=user.id,
+        name=user.get_display_name(),
+        avatar_url=get_avatar_url(
+            email=user.email,
+            profile_upload_key=(
+                user.profile_upload.key if user.profile_upload is not None else None
+            ),
+        ),
+    )
+
+
+def serialize_recipe_metadata(recipe: Recipe) -> RecipeMetadataSerializer:
+    return RecipeMetadataSerializer(
+        id=recipe.id,
+        name=recipe.name,
+        author=recipe.author,
+        archivedAt=recipe.archived_at,
+        primaryImage=RecipePrimaryImageSerializer(
+            id=str(recipe.primary_image.id),
+            url=recipe.primary_image.public_url(),
+            backgroundUrl=recipe.primary_image.background_url,
+        )
+        if recipe.primary_image
+        else None,
+    )
+
+
 def serialize_scheduled_recipe(
     scheduled_recipe: ScheduledRecipe, user_id: int, team_id: int
 ) -> ScheduleRecipeSerializer:
     return ScheduleRecipeSerializer(
         id=scheduled_recipe.id,
         created=scheduled_recipe.created,
-        createdBy=CreatedBySerializer(
-            id=scheduled_recipe.created_by.id,
-            name=scheduled_recipe.created_by.get_display_name(),
-            avatar_url=get_avatar_url(
-                email=scheduled_recipe.created_by.email,
-                profile_upload_key=(
-                    scheduled_recipe.created_by.profile_upload.key
-                    if scheduled_recipe.created_by.profile_upload is not None
-                    else None
-                ),
-            ),
-        )
+        createdBy=serialize_created_by(scheduled_recipe.created_by)
         if scheduled_recipe.created_by
         else None,
-        recipe=RecipeMetadataSerializer(
-            id=scheduled_recipe.recipe_id,
-            name=scheduled_recipe.recipe.name,
-            author=scheduled_recipe.recipe.author,
-            archivedAt=scheduled_recipe.recipe.archived_at,
-            primaryImage=RecipePrimaryImageSerializer(
-                id=str(scheduled_recipe.recipe.primary_image.id),
-                url=scheduled_recipe.recipe.primary_image.public_url(),
-                backgroundUrl=scheduled_recipe.recipe.primary_image.background_url,
-            )
-            if scheduled_recipe.recipe.primary_image
-            else None,
-        ),
+        recipe=serialize_recipe_metadata(scheduled_recipe.recipe),
         on=scheduled_recipe.on,
         user=user_id,
         team=team_id,
@@ -23,7 +23,8 @@ class CalendarUpdateParams(Params):
 def calendar_update_view(
     request: AuthedHttpRequest, params: CalendarUpdateParams
 ) -> ScheduleRecipeSerializer:
-    team_id = get_team(request.user).id
+    team = get_team(request.user)
+    team_id = team.id
     scheduled_recipe = get_scheduled_recipes(team_id).get(id=params.scheduled_recipe_id)
     with transaction.atomic():
         scheduled_recipe.on = params.on
@@ -34,11 +35,12 @@ def calendar_update_view(
             after_on=params.on,
             actor=request.user,
         )
+        team.invalidate_shoppinglists()
 
-    res = serialize_scheduled_recipe(
-        scheduled_recipe, user_id=(request.user.id), team_id=(team_id)
-    )
+        res = serialize_scheduled_recipe(
+            scheduled_recipe, user_id=(request.user.id), team_id=(team_id)
+        )
 
-    publish_calendar_event(res, team_id)
+        publish_calendar_event(res, team_id)
 
     return res
@@ -1,3 +1,5 @@
+from collections.abc import Callable
+
 import pytest
 from django.test.client import Client
 
@@ -68,3 +70,25 @@ def test_update_checklist(
 
     res = client.get(url)
     assert res.json()[str(ingredient.id)] is True
+
+
+def test_update_checklist_query_count(
+    client: Client,
+    user: User,
+    team: Team,
+    recipe: Recipe,
+    assert_queries_dont_grow: Callable[..., None],
+) -> None:
+    recipe.team = team
+    recipe.save()
+    ingredient = recipe.ingredient_set.all()[0]
+    client.force_login(user)
+
+    assert_queries_dont_grow(
+        lambda: client.post(
+            f"/api/v1/cook-checklist/{recipe.id}/",
+            {"ingredient_id": ingredient.id, "checked": True},
+            content_type="application/json",
+        ),
+        recipes=[recipe],
+    )
@@ -13,7 +13,7 @@ class CookChecklistRetrieveParams(Params):
     recipe_id: int
 
 
-@endpoint()
+@endpoint(query_budget=4)
 def cook_checklist_retrieve_view(
     request: AuthedHttpRequest, params: CookChecklistRetrieveParams
 ) -> dict[int, bool]:
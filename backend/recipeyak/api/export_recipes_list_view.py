@@ -107,7 +107,7 @@ def pydantic_to_dict(obj: object) -> object:
 
 
 def export_recipes(team: Team, pk: str | None) -> list[ExportRecipe] | ExportRecipe:
-    queryset = filter_recipes(team=team).prefetch_related("step_set", "ingredient_set")
+    queryset = filter_recipes(team=team, profile="export")
 
     if pk is not None:
         r = get_object_or_404(queryset, pk=pk)
@@ -125,7 +125,7 @@ class ExportRecipesListParams(Params):
     pk: str | None = None
 
 
-@endpoint(redirect_to_login=True)
+@endpoint(redirect_to_login=True, query_budget=7)
 def export_recipes_list_view(
     request: AuthedHttpRequest, params: ExportRecipesListParams
 ) -> HttpResponse:
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+
 import pytest
 from django.test import Client
 
@@ -119,3 +121,19 @@ tags:
 - bar
 """
     )
+
+
+def test_bulk_export_query_count(
+    c: Client,
+    user: User,
+    recipe: Recipe,
+    recipe2: Recipe,
+    team: Team,
+    assert_queries_dont_grow: Callable[..., None],
+) -> None:
+    for r in (recipe, recipe2):
+        r.team = team
+        r.save()
+    c.force_login(user)
+
+    assert_queries_dont_grow(lambda: c.get("/recipes.json"), recipes=[recipe, recipe2])
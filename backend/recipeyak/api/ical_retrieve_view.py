@@ -1,13 +1,87 @@
-from datetime import datetime, timedelta
-from typing import Any
+from datetime import date, datetime, timedelta
 
-import sentry_sdk
 from django.db import connection
 from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.utils.text import slugify
 from django.views.decorators.http import require_http_methods
 
-from recipeyak.ical import Event, calendar
+from recipeyak.ical import Event, calendar, render_event
+from recipeyak.ical_cache import CachedCalendar, CalendarCache
+
+# id, on, created, recipe_id, recipe_time, recipe_name
+_Row = tuple[int, date, datetime, int, str | None, str]
+
+calendar_cache = CalendarCache(maxsize=128)
+
+
+def _render_event(row: _Row) -> str:
+    id, on, created, recipe_id, recipe_time, recipe_name = row
+    return render_event(
+        Event(
+            id=f"core_scheduledrecipe:{id}",
+            description=f"Takes about {recipe_time}" if recipe_time else "",
+            url=f"https://recipeyak.com/recipes/{recipe_id}-{slugify(recipe_name)}",
+            start=on,
+            end=on + timedelta(days=1),
+            created=created,
+            transparent="TRANSPARENT",
+            summary=recipe_name,
+            modified=created,
+        )
+    )
+
+
+def _build_calendar(
+    *,
+    team_id: int,
+    team_name: str,
+    version: datetime,
+    previous: CachedCalendar | None,
+) -> tuple[CachedCalendar, int]:
+    """
+    Render the team's calendar, reusing the events from `previous` whose rows
+    haven't changed, returning it with how many events we rendered.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select
+  scheduled_recipe.id,
+  scheduled_recipe."on",
+  scheduled_recipe.created,
+  recipe.id,
+  recipe.time,
+  recipe.name
+from core_scheduledrecipe scheduled_recipe
+join core_recipe recipe on scheduled_recipe.recipe_id = recipe.id
+where scheduled_recipe.created > now() - '2 years'::interval
+and scheduled_recipe.team_id = %(team_id)s
+order by "on"
+""",
+            {"team_id": team_id},
+        )
+        rows: list[_Row] = cursor.fetchall()
+    previous_events = previous.events if previous is not None else {}
+    events = dict[int, tuple[tuple[object, ...], str]]()
+    rendered = 0
+    for row in rows:
+        cached_event = previous_events.get(row[0])
+        if cached_event is not None and cached_event[0] == row:
+            events[row[0]] = cached_event
+        else:
+            events[row[0]] = (row, _render_event(row))
+            rendered += 1
+    body = "".join(
+        calendar(
+            id="-//Recipe Yak//Schedule//EN",
+            name="Scheduled Recipes",
+            description=f"Recipe Yak Schedule for Team {team_name}",
+            events=(event for _, event in events.values()),
+        )
+    ).encode()
+    return CachedCalendar(version=version, body=body, events=events), rendered
 
 
 @require_http_methods(["GET", "HEAD"])
@@ -19,32 +93,17 @@ def ical_retrieve_view(
 
     We limit the recipes to the last year to avoid having the response size
     gradually increasing & time.
+
+    Calendar apps poll this constantly, so the ETag & Last-Modified come from
+    the team's `schedule_modified`, letting us answer 304 without loading the
+    schedule, and we cache the rendered feed for the other polls. Recipes
+    falling out of the window don't change it, clients keep them until the
+    next change.
     """
     with connection.cursor() as cursor:
         cursor.execute(
             """
-select
-  json_object(
-    'team_name': core_team.name,
-    'scheduled_recipes': (
-      select json_agg(scheduled_recipe)
-      from (
-        select json_object(
-          'id': scheduled_recipe.id,
-          'on': scheduled_recipe."on",
-          'created': scheduled_recipe.created,
-          'recipe_id': recipe.id,
-          'recipe_time': recipe.time,
-          'recipe_name': recipe.name
-        ) scheduled_recipe
-        from core_scheduledrecipe scheduled_recipe
-        join core_recipe recipe on scheduled_recipe.recipe_id = recipe.id
-        where scheduled_recipe.created > now() - '2 years'::interval
-        and scheduled_recipe.team_id = %(team_id)s
-        order by "on"
-      ) sub
-    )
-  )
+select core_team.name, core_team.schedule_modified
 from
   core_membership
   join core_team on core_team.id = core_membership.team_id
@@ -56,41 +115,38 @@ where
             {"team_id": team_id, "calendar_secret_key": ical_id},
         )
         row = cursor.fetchone()
-        if row is None:
-            return HttpResponse(status=404)
-        col: dict[str, Any] = row[0]
-        team_name: str = col["team_name"]
-        scheduled_recipes: list[dict[str, Any]] = col["scheduled_recipes"] or []
+    if row is None:
+        return HttpResponse(status=404)
+    team_name: str = row[0]
+    schedule_modified: datetime = row[1]
 
-    with sentry_sdk.start_span(
-        op="recipeyak.ical.render", description="create icalendar"
-    ):
-        events = []
-        for s in scheduled_recipes:
-            description = f"Takes about {s['recipe_time']}" if s["recipe_time"] else ""
-            slug_name = slugify(s["recipe_name"])
-            start_date = datetime.fromisoformat(s["on"])
-            created = datetime.fromisoformat(s["created"])
-            events.append(
-                Event(
-                    id=f"core_scheduledrecipe:{s['id']}",
-                    description=description,
-                    url=f"https://recipeyak.com/recipes/{s['recipe_id']}-{slug_name}",
-                    start=start_date,
-                    end=start_date + timedelta(days=1),
-                    created=created,
-                    transparent="TRANSPARENT",
-                    summary=s["recipe_name"],
-                    modified=created,
-                )
+    etag = quote_etag(str(int(schedule_modified.timestamp() * 1_000_000)))
+    last_modified = int(schedule_modified.timestamp())
+    response: HttpResponse | None = get_conditional_response(
+        request,  # type: ignore[arg-type]
+        etag=etag,
+        last_modified=last_modified,
+    )
+    if response is not None:
+        calendar_cache.record(not_modified=True)
+    else:
+        cached = calendar_cache.get(team_id)
+        if cached is None or cached.version != schedule_modified:
+            cached, rendered = _build_calendar(
+                team_id=team_id,
+                team_name=team_name,
+                version=schedule_modified,
+                previous=cached,
             )
-        cal = calendar(
-            id="-//Recipe Yak//Schedule//EN",
-            name="Scheduled Recipes",
-            description=f"Recipe Yak Schedule for Team {team_name}",
-            events=events,
-        )
-        response = HttpResponse()
-        response["Content-Type"] = "text/calendar"
-        response.content = cal
+            calendar_cache.set(team_id, cached)
+            calendar_cache.record(
+                events_rendered=rendered, events_reused=len(cached.events) - rendered
+            )
+        else:
+            calendar_cache.record()
+        response = HttpResponse(cached.body, content_type="text/calendar")
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # clients can keep the feed, but have to check it's still current
+    response["Cache-Control"] = "no-cache"
     return response
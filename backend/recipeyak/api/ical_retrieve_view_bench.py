@@ -0,0 +1,108 @@
+# ruff: noqa: T201
+"""
+Benchmark the calendar feed for a team with lots of scheduled recipes,
+comparing a full build, a cached poll, and rebuilding after moving a recipe.
+
+Creates the schedule in a transaction that's rolled back, so it's safe to
+point at a dev database.
+
+    python -m recipeyak.api.ical_retrieve_view_bench --events 5000
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from uuid import uuid4
+
+import django
+import typer
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "recipeyak.django.settings")
+django.setup()
+from django.db import transaction  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from recipeyak.api.ical_retrieve_view import (  # noqa: E402
+    calendar_cache,
+    ical_retrieve_view,
+)
+from recipeyak.models import Recipe, ScheduledRecipe, Team, User  # noqa: E402
+
+
+def _create_schedule(*, events: int) -> tuple[Team, str, list[ScheduledRecipe]]:
+    user = User.objects.create_user(email=f"bench-{uuid4().hex}@example.com")
+    team = Team.objects.create(name="bench")
+    membership = team.force_join(user)
+    membership.calendar_sync_enabled = True
+    membership.save()
+    recipes = Recipe.objects.bulk_create(
+        Recipe(name=f"recipe {i}, with a comma", time="1 hour", team=team)
+        for i in range(200)
+    )
+    scheduled = ScheduledRecipe.objects.bulk_create(
+        ScheduledRecipe(
+            recipe=recipes[i % len(recipes)],
+            team=team,
+            on=date(2024, 1, 1) + timedelta(days=i % 600),
+        )
+        for i in range(events)
+    )
+    return team, membership.calendar_secret_key, scheduled
+
+
+def _time(fn: Callable[[], HttpResponse], *, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main(
+    events: list[int] = [500, 5_000],  # noqa: B006
+    rounds: int = 5,
+) -> None:
+    """
+    Time the feed's rebuilds & cached polls.
+    """
+    factory = RequestFactory()
+    for n in events:
+        with transaction.atomic():
+            team, ical_id, scheduled = _create_schedule(events=n)
+
+            def poll(team: Team = team, ical_id: str = ical_id) -> HttpResponse:
+                request = factory.get(f"/t/{team.id}/ical/{ical_id}/schedule.ics")
+                return ical_retrieve_view(request, team_id=team.id, ical_id=ical_id)
+
+            def full(team: Team = team) -> HttpResponse:
+                calendar_cache.clear()
+                return poll()
+
+            def move(
+                scheduled: list[ScheduledRecipe] = scheduled,
+            ) -> HttpResponse:
+                moved = scheduled[0]
+                moved.on += timedelta(days=1)
+                moved.save()
+                return poll()
+
+            full_sec = _time(full, rounds=rounds)
+            cached_sec = _time(poll, rounds=rounds)
+            move_sec = _time(move, rounds=rounds)
+            size = len(poll().content)
+            stats = calendar_cache.stats()
+            transaction.set_rollback(True)
+        print(
+            f"events={n:>5} full={full_sec * 1000:7.1f}ms "
+            f"cached={cached_sec * 1000:6.2f}ms "
+            f"move one={move_sec * 1000:6.1f}ms "
+            f"bytes={size} rendered={stats.events_rendered} "
+            f"reused={stats.events_reused}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -2,9 +2,12 @@ from datetime import date
 from urllib.parse import urlparse
 
 import pytest
+from django.db import connection
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from syrupy.assertion import SnapshotAssertion
 
+from recipeyak.api.ical_retrieve_view import calendar_cache
 from recipeyak.models import Recipe, ScheduledRecipe, Team, User, get_random_ical_id
 from recipeyak.models.membership import Membership
 
@@ -216,3 +219,101 @@ def test_get_ical_view_404_when_disabled(
     membership.save()
     res = client.get(url, HTTP_ACCEPT="text/calendar")
     assert res.status_code == 404
+
+
+def test_ical_conditional_get(
+    client: Client,
+    user: User,
+    recipe: Recipe,
+    team: Team,
+) -> None:
+    """
+    Calendar apps poll the feed, we answer 304 while the schedule hasn't
+    changed, without loading it.
+    """
+    scheduled = ScheduledRecipe.objects.create(
+        recipe=recipe, team=team, on=date(1976, 7, 6)
+    )
+    membership = Membership.objects.filter(user=user).get(team=team)
+    membership.calendar_sync_enabled = True
+    membership.save()
+    url = f"/t/{team.id}/ical/{membership.calendar_secret_key}/schedule.ics"
+
+    res = client.get(url)
+    assert res.status_code == 200
+    assert res["Cache-Control"] == "no-cache"
+    etag = res["ETag"]
+
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+    assert not any(
+        "core_scheduledrecipe" in q["sql"] for q in queries.captured_queries
+    ), "unchanged feeds shouldn't query the scheduled recipes"
+    assert res["ETag"] == etag
+    res = client.get(url, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"])
+    assert res.status_code == 304
+
+    def changed() -> bool:
+        nonlocal etag
+        res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        if res.status_code == 304:
+            return False
+        assert res.status_code == 200
+        etag = res["ETag"]
+        return True
+
+    scheduled.on = date(1976, 7, 7)
+    scheduled.save()
+    assert changed()
+
+    recipe.name = "Fancy soup"
+    recipe.save()
+    assert changed()
+    assert not changed()
+
+    team.name = "Renamed"
+    team.save()
+    assert changed()
+
+    scheduled.delete()
+    assert changed()
+
+
+def test_ical_cache(client: Client, user: User, recipe: Recipe, team: Team) -> None:
+    """
+    Polls share the team's rendered feed, and changes only re-render the
+    events that changed.
+    """
+    calendar_cache.clear()
+    scheduled = [
+        ScheduledRecipe.objects.create(recipe=recipe, team=team, on=date(1976, 7, day))
+        for day in (6, 7, 10)
+    ]
+    membership = Membership.objects.filter(user=user).get(team=team)
+    membership.calendar_sync_enabled = True
+    membership.save()
+    url = f"/t/{team.id}/ical/{membership.calendar_secret_key}/schedule.ics"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get(url)
+    assert res.status_code == 200
+    assert res.content == first.content
+    assert not any(
+        "core_scheduledrecipe" in q["sql"] for q in queries.captured_queries
+    ), "cache hit shouldn't query the scheduled recipes"
+
+    stats = calendar_cache.stats()
+    assert (stats.polls, stats.rebuilds, stats.events_rendered) == (2, 1, 3)
+
+    scheduled[0].on = date(1976, 7, 20)
+    scheduled[0].save()
+    res = client.get(url)
+    assert res.status_code == 200
+    assert b"DTSTART;VALUE=DATE:19760720" in res.content
+
+    stats = calendar_cache.stats()
+    assert (stats.rebuilds, stats.events_rendered, stats.events_reused) == (2, 4, 2)
+    assert stats.cached_teams == 1
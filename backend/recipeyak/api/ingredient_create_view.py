@@ -21,8 +21,8 @@ from recipeyak.models import (
     filter_recipes,
     get_team,
 )
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class IngredientCreateParams(Params):
@@ -42,7 +42,8 @@ def ingredient_create_view(
     recipe = get_object_or_404(filter_recipes(team=team), pk=params.recipe_id)
 
     with transaction.atomic():
-        ingredient = Ingredient.objects.create(
+        flush_queued_recipe_version(recipe_id=params.recipe_id, actor=request.user)
+        ingredient = Ingredient(
             quantity=params.quantity,
             name=params.name,
             description=params.description,
@@ -50,6 +51,8 @@ def ingredient_create_view(
             optional=params.optional is not None and params.optional,
             position=params.position,
         )
+        ingredient.update_parsed_fields()
+        ingredient.save()
         RecipeChange.objects.create(
             recipe=recipe,
             actor=request.user,
@@ -57,7 +60,13 @@ def ingredient_create_view(
             after=ingredient_to_text(ingredient),
             change_type=ChangeType.INGREDIENT_CREATE,
         )
-        save_recipe_version(recipe_id=params.recipe_id, actor=request.user)
+        enqueue_recipe_version(recipe_id=params.recipe_id, actor=request.user)
+        team.invalidate_shoppinglists()
 
-    publish_recipe(recipe_id=recipe.id, team_id=team.id)
-    return serialize_ingredient(ingredient)
+        res = serialize_ingredient(ingredient)
+        publish_recipe(
+            recipe_id=recipe.id,
+            team_id=team.id,
+            patch=RecipePatch(kind="ingredient", op="upsert", id=res.id, value=res),
+        )
+    return res
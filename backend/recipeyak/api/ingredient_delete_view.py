@@ -8,8 +8,8 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.serializers.recipe import ingredient_to_text
 from recipeyak.models import ChangeType, RecipeChange, filter_ingredients, get_team
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class IngredientDeleteParams(Params):
@@ -25,6 +25,7 @@ def ingredient_delete_view(
         filter_ingredients(team=team), pk=params.ingredient_id
     )
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=ingredient.recipe_id, actor=request.user)
         recipe_id = ingredient.recipe.id
         RecipeChange.objects.create(
             recipe=ingredient.recipe,
@@ -34,5 +35,10 @@ def ingredient_delete_view(
             change_type=ChangeType.INGREDIENT_DELETE,
         )
         filter_ingredients(team=team).filter(pk=params.ingredient_id).delete()
-        save_recipe_version(recipe_id=recipe_id, actor=request.user)
-    publish_recipe(recipe_id=ingredient.recipe_id, team_id=team.id)
+        enqueue_recipe_version(recipe_id=recipe_id, actor=request.user)
+        team.invalidate_shoppinglists()
+        publish_recipe(
+            recipe_id=ingredient.recipe_id,
+            team_id=team.id,
+            patch=RecipePatch(kind="ingredient", op="delete", id=params.ingredient_id),
+        )
@@ -15,8 +15,8 @@ from recipeyak.api.serializers.recipe import (
     serialize_ingredient,
 )
 from recipeyak.models import ChangeType, RecipeChange, filter_ingredients, get_team
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 StrStripped: TypeAlias = Annotated[str, StringConstraints(strip_whitespace=True)]
 
@@ -51,6 +51,7 @@ def ingredient_update_view(
     )
 
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=ingredient.recipe_id, actor=request.user)
         before = ingredient_to_text(ingredient)
         if params.quantity is not None:
             ingredient.quantity = params.quantity
@@ -62,6 +63,7 @@ def ingredient_update_view(
             ingredient.position = params.position
         if params.optional is not None:
             ingredient.optional = params.optional
+        ingredient.update_parsed_fields()
         ingredient.save()
         RecipeChange.objects.create(
             recipe=ingredient.recipe,
@@ -70,8 +72,14 @@ def ingredient_update_view(
             after=ingredient_to_text(ingredient),
             change_type=ChangeType.INGREDIENT_UPDATE,
         )
-        save_recipe_version(recipe_id=ingredient.recipe_id, actor=request.user)
+        enqueue_recipe_version(recipe_id=ingredient.recipe_id, actor=request.user)
+        team.invalidate_shoppinglists()
 
-    publish_recipe(recipe_id=ingredient.recipe_id, team_id=team.id)
+        res = serialize_ingredient(ingredient)
+        publish_recipe(
+            recipe_id=ingredient.recipe_id,
+            team_id=team.id,
+            patch=RecipePatch(kind="ingredient", op="upsert", id=res.id, value=res),
+        )
 
-    return serialize_ingredient(ingredient)
+    return res
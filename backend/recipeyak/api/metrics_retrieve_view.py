@@ -0,0 +1,54 @@
+import hmac
+
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import require_http_methods
+
+from recipeyak import config
+from recipeyak.api.base.metrics import endpoint_metrics
+from recipeyak.api.ical_retrieve_view import calendar_cache
+from recipeyak.api.unwrap import unwrap
+from recipeyak.realtime import publisher
+
+
+def _search_index_queue_metrics() -> str:
+    """
+    The queue `recipeyak.jobs.live_search_sync` works through, lag is how
+    long the oldest entry has been waiting.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select count(*), coalesce(extract(epoch from now() - min(created)), 0)
+from recipe_index_queue
+"""
+        )
+        size, lag = unwrap(cursor.fetchone())
+    return (
+        "# HELP recipeyak_search_index_queue_size Recipe changes waiting to be indexed.\n"
+        "# TYPE recipeyak_search_index_queue_size gauge\n"
+        f"recipeyak_search_index_queue_size {size}\n"
+        "# HELP recipeyak_search_index_queue_lag_seconds Age of the oldest change waiting to be indexed.\n"
+        "# TYPE recipeyak_search_index_queue_lag_seconds gauge\n"
+        f"recipeyak_search_index_queue_lag_seconds {float(lag)}\n"
+    )
+
+
+@require_http_methods(["GET", "HEAD"])
+def metrics_retrieve_view(request: HttpRequest) -> HttpResponse:
+    """
+    Per-endpoint query counts & timings, the realtime publisher's queue, the
+    calendar feed cache, and the search index queue, for Prometheus to scrape.
+    """
+    authorization = request.headers.get("Authorization", "")
+    if not config.METRICS_TOKEN or not hmac.compare_digest(
+        authorization, f"Bearer {config.METRICS_TOKEN}"
+    ):
+        return HttpResponse(status=404)
+    return HttpResponse(
+        endpoint_metrics.prometheus()
+        + publisher.prometheus()
+        + calendar_cache.prometheus()
+        + _search_index_queue_metrics(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from pydantic import model_validator
 
@@ -8,7 +9,7 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.serializers.recipe import NoteSerializer, serialize_note
 from recipeyak.models import Note, Upload, filter_recipes, get_team
-from recipeyak.realtime import publish_recipe
+from recipeyak.realtime import RecipePatch, publish_recipe
 
 
 class NoteCreateParams(Params):
@@ -23,26 +24,32 @@ class NoteCreateParams(Params):
         return self
 
 
-@endpoint()
+@endpoint(query_budget=9)
 def note_create_view(
     request: AuthedHttpRequest, params: NoteCreateParams
 ) -> NoteSerializer:
     team = get_team(request.user)
     recipe = get_object_or_404(filter_recipes(team=team), pk=params.recipe_id)
 
-    note = Note.objects.create(
-        text=params.text,
-        created_by=request.user,
-        last_modified_by=request.user,
-        recipe=recipe,
-    )
-    Upload.objects.filter(
-        id__in=params.attachment_upload_ids, created_by=request.user
-    ).update(note=note)
-
-    publish_recipe(recipe_id=recipe.id, team_id=team.id)
-
-    return serialize_note(
-        note,
-        primary_image_id=recipe.primary_image_id,
-    )
+    with transaction.atomic():
+        note = Note.objects.create(
+            text=params.text,
+            created_by=request.user,
+            last_modified_by=request.user,
+            recipe=recipe,
+        )
+        Upload.objects.filter(
+            id__in=params.attachment_upload_ids, created_by=request.user
+        ).update(note=note)
+
+        res = serialize_note(
+            note,
+            primary_image_id=recipe.primary_image_id,
+        )
+        publish_recipe(
+            recipe_id=recipe.id,
+            team_id=team.id,
+            patch=RecipePatch(kind="note", op="upsert", id=res.id, value=res),
+        )
+
+    return res
@@ -1,7 +1,10 @@
+from collections.abc import Callable
+
 import pytest
 from django.test.client import Client
 
 from recipeyak.fixtures import create_recipe, create_team, create_user
+from recipeyak.models import Recipe, User
 
 pytestmark = pytest.mark.django_db
 
@@ -32,3 +35,21 @@ def test_updating_other_users_note() -> None:
         "loc": ["param-that-shouldn't-be-allowed"],
         "msg": "Extra inputs are not permitted",
     }
+
+
+def test_note_create_query_count(
+    client: Client,
+    user: User,
+    recipe: Recipe,
+    assert_queries_dont_grow: Callable[..., None],
+) -> None:
+    client.force_login(user)
+
+    assert_queries_dont_grow(
+        lambda: client.post(
+            f"/api/v1/recipes/{recipe.id}/notes/",
+            {"text": "great recipe!", "attachment_upload_ids": []},
+            content_type="application/json",
+        ),
+        recipes=[recipe],
+    )
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from django.db import transaction
+
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.models import filter_notes, get_team
-from recipeyak.realtime import publish_recipe
+from recipeyak.realtime import RecipePatch, publish_recipe
 
 
 class NoteDeleteParams(Params):
@@ -19,5 +21,10 @@ def note_delete_view(request: AuthedHttpRequest, params: NoteDeleteParams) -> No
         .filter(pk=params.note_id, created_by=request.user)
         .first()
     ):
-        note.delete()
-        publish_recipe(recipe_id=note.recipe_id, team_id=team.id)
+        with transaction.atomic():
+            note.delete()
+            publish_recipe(
+                recipe_id=note.recipe_id,
+                team_id=team.id,
+                patch=RecipePatch(kind="note", op="delete", id=params.note_id),
+            )
@@ -9,7 +9,7 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.serializers.recipe import NoteSerializer, serialize_note
 from recipeyak.models import Upload, filter_notes, get_team
-from recipeyak.realtime import publish_recipe
+from recipeyak.realtime import RecipePatch, publish_recipe
 from recipeyak.versioning import save_note_version
 
 
@@ -47,6 +47,11 @@ def note_update_view(
                 note=note
             )
         note.save()
-    publish_recipe(recipe_id=note.recipe_id, team_id=team.id)
+        res = serialize_note(note, primary_image_id=note.recipe.primary_image_id)
+        publish_recipe(
+            recipe_id=note.recipe_id,
+            team_id=team.id,
+            patch=RecipePatch(kind="note", op="upsert", id=res.id, value=res),
+        )
 
-    return serialize_note(note, primary_image_id=note.recipe.primary_image_id)
+    return res
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Literal
 
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from psycopg2.errors import UniqueViolation
 
@@ -30,15 +30,18 @@ def reaction_create_view(
 
     note = get_object_or_404(filter_notes(team=team), pk=params.note_id)
     reaction = Reaction(emoji=params.type, created_by=request.user, note=note)
-    try:
-        reaction.save()
-    except IntegrityError as e:
-        if (
-            isinstance(e.__cause__, UniqueViolation)
-            and e.__cause__.diag.constraint_name == "one_reaction_per_user"
-        ):
-            reaction = user_reactions(user=request.user).filter(note=note).get()
-        else:
-            raise
-    publish_recipe(recipe_id=note.recipe_id, team_id=team.id)
+    with transaction.atomic():
+        try:
+            # a savepoint, so the transaction survives the unique violation
+            with transaction.atomic():
+                reaction.save()
+        except IntegrityError as e:
+            if (
+                isinstance(e.__cause__, UniqueViolation)
+                and e.__cause__.diag.constraint_name == "one_reaction_per_user"
+            ):
+                reaction = user_reactions(user=request.user).filter(note=note).get()
+            else:
+                raise
+        publish_recipe(recipe_id=note.recipe_id, team_id=team.id)
     return next(iter(serialize_reactions([reaction])))
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from django.db import transaction
+
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
@@ -21,6 +23,7 @@ def reaction_delete_view(
         .first()
     ):
         recipe = reaction.note.recipe
-        reaction.delete()
-        if recipe.team_id:
-            publish_recipe(recipe_id=recipe.id, team_id=recipe.team_id)
+        with transaction.atomic():
+            reaction.delete()
+            if recipe.team_id:
+                publish_recipe(recipe_id=recipe.id, team_id=recipe.team_id)
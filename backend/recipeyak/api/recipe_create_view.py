@@ -72,16 +72,16 @@ def _create_recipe_from_scrape(*, scrape: ScrapeResult, team: Team) -> Recipe:
             position = ordering.position_after(position)
         for ingredient in group.ingredients:
             parsed_ingredient = parse_ingredient(ingredient)
-            ingredients.append(
-                Ingredient(
-                    position=position,
-                    recipe=recipe,
-                    quantity=parsed_ingredient.quantity,
-                    name=parsed_ingredient.name,
-                    description=parsed_ingredient.description,
-                    optional=parsed_ingredient.optional,
-                )
+            new_ingredient = Ingredient(
+                position=position,
+                recipe=recipe,
+                quantity=parsed_ingredient.quantity,
+                name=parsed_ingredient.name,
+                description=parsed_ingredient.description,
+                optional=parsed_ingredient.optional,
             )
+            new_ingredient.update_parsed_fields()
+            ingredients.append(new_ingredient)
             position = ordering.position_after(position)
     Ingredient.objects.bulk_create(ingredients)
     Section.objects.bulk_create(sections)
@@ -22,6 +22,7 @@ def recipe_delete_view(request: AuthedHttpRequest, params: RecipeDeleteParams) -
     with transaction.atomic():
         recipe = filter_recipe_or_404(team=team, recipe_id=params.recipe_id)
         recipe.delete()
+        team.invalidate_shoppinglists()
         # no need to save version, since we aren't "updating" the recipe, we
         # have the previous post-update version saved already
-    publish_recipe(recipe_id=recipe.id, team_id=team.id)
+        publish_recipe(recipe_id=recipe.id, team_id=team.id)
@@ -31,7 +31,7 @@ class RecipeRecentlyCreatedItem(pydantic.BaseModel):
     createdBy: CreatedByResponse | None
 
 
-@endpoint()
+@endpoint(query_budget=4)
 def recipe_recently_created_view(
     request: AuthedHttpRequest, params: None
 ) -> list[RecipeRecentlyCreatedItem]:
@@ -23,7 +23,7 @@ class RecipeRecentlyViewedItem(TypedDict):
     primaryImage: PrimaryImageDict | None
 
 
-@endpoint()
+@endpoint(query_budget=4)
 def recipe_recently_viewed_view(
     request: AuthedHttpRequest, params: None
 ) -> list[RecipeRecentlyViewedItem]:
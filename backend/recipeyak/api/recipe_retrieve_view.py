@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+from typing import Annotated, Literal
+
 from django.db import connection
+from django.http import Http404
+from pydantic import Field
 
+from recipeyak import config
 from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.json import json_dumps
 from recipeyak.api.base.request import AuthedHttpRequest
+from recipeyak.api.base.response import JsonBytesResponse
 from recipeyak.api.base.serialization import Params
-from recipeyak.api.serializers.recipe import RecipeSerializer, serialize_recipe
+from recipeyak.api.serializers.recipe import (
+    RecipeSerializer,
+    serialize_recipe,
+    serialize_recipe_json,
+)
 from recipeyak.models import (
     filter_recipe_or_404,
     get_team,
@@ -14,14 +25,41 @@ from recipeyak.models import (
 
 class RecipeRetrieveParams(Params):
     recipe_id: int
+    include: Annotated[
+        Literal["versions"] | None,
+        Field(description="Embed every previous version of the Recipe."),
+    ] = None
+
+
+def _query_budget() -> int:
+    # the python engine prefetches each relation separately
+    return 23 if config.RECIPE_DETAIL_ENGINE == "python" else 5
 
 
-@endpoint()
+@endpoint(query_budget=_query_budget)
 def recipe_retrieve_view(
     request: AuthedHttpRequest, params: RecipeRetrieveParams
-) -> RecipeSerializer:
+) -> JsonBytesResponse[RecipeSerializer]:
     team = get_team(request.user)
-    recipe = filter_recipe_or_404(recipe_id=params.recipe_id, team=team)
+    include_versions = params.include == "versions"
+    if config.RECIPE_DETAIL_ENGINE == "sql":
+        recipe_json = serialize_recipe_json(
+            recipe_id=params.recipe_id,
+            team_id=team.id,
+            user_id=request.user.id,
+            include_versions=include_versions,
+        )
+        if recipe_json is None:
+            raise Http404
+    else:
+        recipe = filter_recipe_or_404(
+            recipe_id=params.recipe_id, team=team, profile="detail"
+        )
+        recipe_json = json_dumps(
+            serialize_recipe(
+                recipe, user=request.user, include_versions=include_versions
+            )
+        )
     with connection.cursor() as cursor:
         cursor.execute(
             """
@@ -43,7 +81,7 @@ def recipe_retrieve_view(
                         recipe_view.count
                     END
             """,
-            {"user_id": request.user.id, "recipe_id": recipe.id},
+            {"user_id": request.user.id, "recipe_id": params.recipe_id},
         )
 
-    return serialize_recipe(recipe, user=request.user)
+    return JsonBytesResponse(recipe_json)
@@ -1,8 +1,27 @@
+from datetime import UTC, datetime, timedelta
+
 import pytest
+from django.db import connection
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from syrupy.assertion import SnapshotAssertion
+from syrupy.filters import props
 
-from recipeyak.models import Recipe, User
+from recipeyak import config
+from recipeyak.api.base.json import json_dumps, json_loads
+from recipeyak.api.serializers.recipe import serialize_recipe, serialize_recipe_json
+from recipeyak.models import (
+    Note,
+    Reaction,
+    Recipe,
+    RecipeFavorite,
+    TimelineEvent,
+    Upload,
+    User,
+    filter_recipe_or_404,
+)
 from recipeyak.models.team import Team
+from recipeyak.versioning import save_recipe_version
 
 pytestmark = pytest.mark.django_db
 
@@ -30,3 +49,180 @@ def test_accessing_recipes(
 
     res = client.get(f"/api/v1/recipes/{recipe.id}/")
     assert res.status_code == 403
+
+
+def _add_timeline(recipe: Recipe, user: User, user2: User) -> None:
+    """
+    Notes, reactions, uploads & events covering everything the serializers
+    format.
+    """
+    profile_upload = Upload.objects.create(
+        bucket="b", key="profiles/me.png", content_type="image/png", created_by=user
+    )
+    user.profile_upload = profile_upload
+    user.save()
+    user2.name = ""
+    user2.save()
+
+    note = Note.objects.create(recipe=recipe, text="with photos", created_by=user2)
+    for key in ["1/a b/pic.jpg", "1/crème%20brûlée?.png", "1/ok-name_1.2~.gif"]:
+        Upload.objects.create(
+            bucket="b",
+            key=key,
+            content_type="image/jpeg",
+            created_by=user2,
+            note=note,
+            recipe=recipe,
+            background_url="data:image/jpeg;base64,abc",
+        )
+    Reaction.objects.create(emoji="❤️", created_by=user, note=note)
+    Reaction.objects.create(emoji="😆", created_by=user2, note=note)
+
+    scraped_image = Upload.objects.create(
+        bucket="b", key="scraped/img.jpg", content_type="image/jpeg", recipe=recipe
+    )
+    recipe.primary_image = scraped_image
+    recipe.source = "https://cooking.nytimes.com/recipes/1015413-pumpkin-pie"
+    recipe.tags = ["dinner", "quick"]
+    recipe.servings = "4"
+    recipe.archived_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)
+    recipe.save()
+
+    TimelineEvent.objects.create(action="created", recipe=recipe)
+    TimelineEvent.objects.create(action="archived", recipe=recipe, created_by=user)
+    TimelineEvent.objects.create(
+        action="set_primary_image", recipe=recipe, created_by=user
+    )
+    today = datetime.now(UTC).date()
+    assert recipe.team is not None
+    for days in [-30, -21, 0, 7, 21, 22]:
+        recipe.schedule(on=today + timedelta(days=days), team=recipe.team, user=user)
+    RecipeFavorite.objects.create(recipe=recipe, user=user)
+    save_recipe_version(recipe_id=recipe.id, actor=user)
+    save_recipe_version(recipe_id=recipe.id, actor=None)
+
+
+def test_recipe_detail_sql_matches_python(
+    user: User,
+    user2: User,
+    team: Team,
+    recipe: Recipe,
+    monkeypatch: pytest.MonkeyPatch,
+    snapshot: SnapshotAssertion,
+) -> None:
+    monkeypatch.setattr(config, "STORAGE_HOSTNAME", "images.example.com")
+    _add_timeline(recipe, user, user2)
+
+    for include_versions in [False, True]:
+        for recipe_user in [user, user2]:
+            recipe_json = serialize_recipe_json(
+                recipe_id=recipe.id,
+                team_id=team.id,
+                user_id=recipe_user.id,
+                include_versions=include_versions,
+            )
+            recipe = filter_recipe_or_404(
+                recipe_id=recipe.id, team=team, profile="detail"
+            )
+            assert recipe_json == json_dumps(
+                serialize_recipe(
+                    recipe, user=recipe_user, include_versions=include_versions
+                )
+            )
+
+    assert recipe_json is not None
+    assert json_loads(recipe_json) == snapshot(
+        exclude=props("id", "note_id", "created", "modified", "created_at", "on")
+    )
+
+    # user-created primary images are credited to the user
+    upload = Upload.objects.create(
+        bucket="b", key="mine.jpg", content_type="image/jpeg", created_by=user
+    )
+    recipe.primary_image = upload
+    recipe.save()
+    recipe = filter_recipe_or_404(recipe_id=recipe.id, team=team, profile="detail")
+    assert serialize_recipe_json(
+        recipe_id=recipe.id, team_id=team.id, user_id=user.id
+    ) == json_dumps(serialize_recipe(recipe, user=user))
+
+    assert (
+        serialize_recipe_json(recipe_id=recipe.id, team_id=team.id + 1, user_id=user.id)
+        is None
+    )
+
+
+@pytest.mark.parametrize(
+    ("key", "url"),
+    [
+        # `with_path` doesn't requote, so even valid escapes get their `%` encoded
+        ("scraper/a%20b.jpg", "https://images.example.com/scraper/a%2520b.jpg"),
+        ("scraper/100%.jpg", "https://images.example.com/scraper/100%25.jpg"),
+        (
+            "1/crème brûlée.jpg",
+            "https://images.example.com/1/cr%C3%A8me%20br%C3%BBl%C3%A9e.jpg",
+        ),
+        # and it resolves `.` & `..` segments, e.g., a `..` file name
+        ("1/abc/..", "https://images.example.com/1/"),
+        ("1/abc/.", "https://images.example.com/1/abc/"),
+        ("1/./abc/photo.jpg", "https://images.example.com/1/abc/photo.jpg"),
+        ("1/abc/../photo.jpg", "https://images.example.com/1/photo.jpg"),
+        ("1/é/../a b.jpg", "https://images.example.com/1/a%20b.jpg"),
+        ("..", "https://images.example.com"),
+        ("1/abc/../../..", "https://images.example.com"),
+        ("/../a.jpg", "https://images.example.com/a.jpg"),
+        # a leading `/` doesn't double up
+        ("/scraper/a.jpg", "https://images.example.com/scraper/a.jpg"),
+        ("1//a.jpg", "https://images.example.com/1//a.jpg"),
+    ],
+)
+def test_recipe_detail_sql_upload_urls(
+    user: User,
+    team: Team,
+    recipe: Recipe,
+    key: str,
+    url: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(config, "STORAGE_HOSTNAME", "images.example.com")
+    upload = Upload.objects.create(
+        bucket="b", key=key, content_type="image/jpeg", recipe=recipe
+    )
+    recipe.primary_image = upload
+    recipe.save()
+
+    recipe_json = serialize_recipe_json(
+        recipe_id=recipe.id, team_id=team.id, user_id=user.id
+    )
+    recipe = filter_recipe_or_404(recipe_id=recipe.id, team=team, profile="detail")
+    assert recipe_json == json_dumps(serialize_recipe(recipe, user=user))
+    assert recipe_json is not None
+    assert json_loads(recipe_json)["primaryImage"]["url"] == url
+
+
+@pytest.mark.parametrize("engine", ["python", "sql"])
+def test_recipe_retrieve_engines(
+    client: Client,
+    user: User,
+    user2: User,
+    team: Team,
+    recipe: Recipe,
+    engine: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(config, "RECIPE_DETAIL_ENGINE", engine)
+    _add_timeline(recipe, user, user2)
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get(f"/api/v1/recipes/{recipe.id}/")
+    assert res.status_code == 200
+    assert res.json()["primaryImage"]["author"] == "nytimes"
+    # session, user, team & recording the view, plus one query per relation
+    # with the python engine or one query for everything with sql
+    assert len(queries) == (25 if engine == "python" else 8)
+    assert res.json()["versions"] == []
+
+    res = client.get(f"/api/v1/recipes/{recipe.id}/", {"include": "versions"})
+    assert res.status_code == 200
+    assert len(res.json()["versions"]) == 2
@@ -22,7 +22,7 @@ class RecipeTimelineParams(Params):
     recipe_id: int
 
 
-@endpoint()
+@endpoint(query_budget=7)
 def recipe_timeline_view(
     request: AuthedHttpRequest, params: RecipeTimelineParams
 ) -> list[RecipeTimelineItem]:
@@ -21,7 +21,7 @@ from recipeyak.models import (
 from recipeyak.models.recipe_favorite import RecipeFavorite
 from recipeyak.models.upload import Upload
 from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class RecipeUpdateParams(Params):
@@ -48,6 +48,7 @@ def recipe_update_view(
     recipe = filter_recipe_or_404(recipe_id=params.recipe_id, team=team)
 
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=recipe.id, actor=request.user)
         provided_fields = set(params.dict(exclude_unset=True))
         changes = []
         fields = [
@@ -126,10 +127,28 @@ def recipe_update_view(
                     recipe=recipe,
                     upload=upload,
                 ).save()
-        recipe.save()
-        save_recipe_version(recipe_id=recipe.id, actor=request.user)
-    publish_recipe(recipe_id=recipe.id, team_id=team.id)
+        # not a full save, that'd write back a stale `realtime_seq`
+        recipe.save(
+            update_fields=[
+                "name",
+                "author",
+                "time",
+                "tags",
+                "servings",
+                "source",
+                "archived_at",
+                "primary_image",
+                "modified",
+            ]
+        )
+        enqueue_recipe_version(recipe_id=recipe.id, actor=request.user)
+        if "name" in provided_fields:
+            # shopping lists include the recipe names
+            team.invalidate_shoppinglists()
+        publish_recipe(recipe_id=recipe.id, team_id=team.id)
 
     team = get_team(request.user)
-    recipe = filter_recipe_or_404(team=team, recipe_id=params.recipe_id)
+    recipe = filter_recipe_or_404(
+        team=team, recipe_id=params.recipe_id, profile="detail"
+    )
     return serialize_recipe(recipe, user=request.user)
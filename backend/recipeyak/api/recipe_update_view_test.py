@@ -1,7 +1,16 @@
 import pytest
+from django.db.models import F
 from django.test.client import Client
 
-from recipeyak.models import ChangeType, Ingredient, Recipe, RecipeChange, Step, User
+from recipeyak.models import (
+    ChangeType,
+    Ingredient,
+    Recipe,
+    RecipeChange,
+    Step,
+    User,
+    filter_recipe_or_404,
+)
 from recipeyak.models.team import Team
 
 pytestmark = pytest.mark.django_db
@@ -123,6 +132,41 @@ def test_recipe_name_update(
     assert change.recipe.id == recipe.id
 
 
+def test_recipe_update_keeps_realtime_seq(
+    client: Client,
+    recipe: Recipe,
+    user: User,
+    team: Team,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Another edit publishing while we update the recipe, shouldn't have its
+    `realtime_seq` overwritten with the one we loaded.
+    """
+
+    # imported here so the module keeps conftest's patched publish_recipe
+    from recipeyak.api import recipe_update_view
+
+    def load_then_publish(**kwargs: object) -> Recipe:
+        loaded = filter_recipe_or_404(**kwargs)  # type: ignore[arg-type]
+        Recipe.objects.filter(id=loaded.id).update(realtime_seq=F("realtime_seq") + 1)
+        return loaded
+
+    monkeypatch.setattr(recipe_update_view, "filter_recipe_or_404", load_then_publish)
+    client.force_login(user)
+    res = client.patch(
+        f"/api/v1/recipes/{recipe.id}/",
+        {"name": "A different title."},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+
+    recipe.refresh_from_db()
+    assert recipe.name == "A different title."
+    # once while updating, once while loading the response
+    assert recipe.realtime_seq == 2
+
+
 def test_recipe_source_update(
     client: Client, recipe: Recipe, user: User, team: Team
 ) -> None:
@@ -264,6 +308,53 @@ def test_ingredient_update(
     assert change.recipe.id == recipe.id
 
 
+@pytest.mark.parametrize(
+    "quantity",
+    [
+        "1/0 cups",
+        # more digits than the parsed columns hold
+        "1" * 120,
+        "1/" + "7" * 110,
+    ],
+)
+def test_ingredient_unparsable_quantity(
+    client: Client, recipe: Recipe, user: User, team: Team, quantity: str
+) -> None:
+    """
+    Quantities we can't parse are saved unparsed, shopping lists parse them on
+    read.
+    """
+    recipe.team = team
+    recipe.save()
+    client.force_login(user)
+    res = client.post(
+        f"/api/v1/recipes/{recipe.id}/ingredients/",
+        {"quantity": "1 cup", "name": "flour", "description": "", "position": "a"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    ingredient = Ingredient.objects.get(id=res.json()["id"])
+    assert ingredient.parsed_name == "flour"
+
+    res = client.patch(
+        f"/api/v1/ingredients/{ingredient.id}/",
+        {"quantity": quantity},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    ingredient.refresh_from_db()
+    assert ingredient.parsed_name is None
+    assert ingredient.parsed_quantity_numerator is None
+
+    res = client.post(
+        f"/api/v1/recipes/{recipe.id}/ingredients/",
+        {"quantity": quantity, "name": "salt", "description": "", "position": "b"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    assert Ingredient.objects.get(id=res.json()["id"]).parsed_name is None
+
+
 def test_ingredient_delete(
     client: Client, recipe: Recipe, user: User, ingredient: Ingredient, team: Team
 ) -> None:
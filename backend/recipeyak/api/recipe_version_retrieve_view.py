@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.http import Http404
+
+from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.request import AuthedHttpRequest
+from recipeyak.api.base.serialization import Params
+from recipeyak.api.serializers.recipe import RecipeVersionSerializer, get_recipe_version
+from recipeyak.models import filter_recipe_or_404, get_team
+
+
+class RecipeVersionRetrieveParams(Params):
+    recipe_id: int
+    version_id: int
+
+
+@endpoint(query_budget=5)
+def recipe_version_retrieve_view(
+    request: AuthedHttpRequest, params: RecipeVersionRetrieveParams
+) -> RecipeVersionSerializer:
+    team = get_team(request.user)
+    recipe = filter_recipe_or_404(recipe_id=params.recipe_id, team=team)
+    version = get_recipe_version(recipe_id=recipe.id, version_id=params.version_id)
+    if version is None:
+        raise Http404
+    return version
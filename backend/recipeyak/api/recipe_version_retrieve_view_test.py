@@ -0,0 +1,33 @@
+import pytest
+from django.test.client import Client
+
+from recipeyak.models import Recipe, User
+from recipeyak.models.recipe_historical import RecipeHistorical
+from recipeyak.versioning import save_recipe_version
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recipe_version_retrieve(
+    client: Client, user: User, user2: User, recipe: Recipe
+) -> None:
+    save_recipe_version(recipe_id=recipe.id, actor=user)
+    version = RecipeHistorical.objects.get(recipe=recipe)
+    url = f"/api/v1/recipes/{recipe.id}/versions/{version.id}/"
+
+    client.force_login(user)
+    res = client.get(url)
+    assert res.status_code == 200
+    assert res.json()["id"] == version.id
+    assert res.json()["name"] == recipe.name
+    # sections are mixed in with the ingredients
+    assert len(res.json()["ingredients"]) == (
+        recipe.ingredient_set.count() + recipe.section_set.count()
+    )
+    assert len(res.json()["steps"]) == recipe.step_set.count()
+
+    res = client.get(f"/api/v1/recipes/{recipe.id}/versions/{version.id + 1}/")
+    assert res.status_code == 404
+
+    client.force_login(user2)
+    assert client.get(url).status_code == 404
@@ -1,8 +1,15 @@
+from datetime import UTC, datetime, timedelta
+
 import pytest
 from django.test.client import Client
 
+from recipeyak import config
 from recipeyak.fixtures import create_recipe, create_team, create_user
+from recipeyak.models.ingredient_historical import IngredientHistorical
 from recipeyak.models.recipe_historical import RecipeHistorical
+from recipeyak.models.recipe_version_queue import RecipeVersionQueue
+from recipeyak.models.step_historical import StepHistorical
+from recipeyak.versioning import save_queued_recipe_versions, save_recipe_version
 
 pytestmark = pytest.mark.django_db
 
@@ -212,3 +219,193 @@ def test_ingredient_delete_saves_version() -> None:
 
     assert res.status_code == 204
     assert RecipeHistorical.objects.filter(recipe_id=recipe.id).count() == before + 1
+
+
+def test_versions_share_unchanged_rows() -> None:
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    client.force_login(user)
+    step = recipe.step_set.order_by("position")[:1].get()
+
+    res = client.patch(
+        f"/api/v1/steps/{step.id}/",
+        {"text": "Updated step text"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+
+    first, second = RecipeHistorical.objects.filter(recipe_id=recipe.id).order_by(
+        "created", "id"
+    )
+    assert second.ingredient_historical_ids == first.ingredient_historical_ids
+    assert second.section_historical_ids == first.section_historical_ids
+    # only the edited step is copied
+    assert StepHistorical.objects.filter(recipe_historical=second).count() == 1
+    assert first.step_historical_ids is not None
+    assert second.step_historical_ids is not None
+    assert len(set(first.step_historical_ids) & set(second.step_historical_ids)) == 1
+
+    # versions are still complete snapshots
+    first_json = client.get(f"/api/v1/recipes/{recipe.id}/versions/{first.id}/").json()
+    second_json = client.get(
+        f"/api/v1/recipes/{recipe.id}/versions/{second.id}/"
+    ).json()
+    assert [s["text"] for s in first_json["steps"]] == [
+        "Place egg in boiling water and cook for ten minutes",
+        "serve",
+    ]
+    assert [s["text"] for s in second_json["steps"]] == ["Updated step text", "serve"]
+    assert first_json["ingredients"] == second_json["ingredients"]
+    assert len(second_json["ingredients"]) == 4
+
+
+def test_versions_saved_before_sharing_rows() -> None:
+    """
+    Versions without row ids own their rows.
+    """
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    client.force_login(user)
+    version = RecipeHistorical.objects.get(recipe_id=recipe.id)
+    url = f"/api/v1/recipes/{recipe.id}/versions/{version.id}/"
+    before = client.get(url).json()
+
+    RecipeHistorical.objects.filter(id=version.id).update(
+        ingredient_historical_ids=None,
+        section_historical_ids=None,
+        step_historical_ids=None,
+    )
+    assert client.get(url).json() == before
+
+    # the next version shares the legacy version's rows
+    step = recipe.step_set.order_by("position")[:1].get()
+    step.text = "Updated step text"
+    step.save()
+    save_recipe_version(recipe_id=recipe.id, actor=user)
+    latest = RecipeHistorical.objects.filter(recipe_id=recipe.id).latest("id")
+    assert latest.ingredient_historical_ids is not None
+    assert set(latest.ingredient_historical_ids) == set(
+        IngredientHistorical.objects.filter(recipe_historical=version).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def test_coalesced_versions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Edits in quick succession are saved as one version, once they settle.
+    """
+    monkeypatch.setattr(config, "RECIPE_VERSION_COALESCE_SECONDS", 60)
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    client.force_login(user)
+    before = RecipeHistorical.objects.filter(recipe_id=recipe.id).count()
+
+    ingredients = list(recipe.ingredient_set.all())
+    assert len(ingredients) > 1
+    for ingredient in ingredients:
+        res = client.patch(
+            f"/api/v1/ingredients/{ingredient.id}/",
+            {"name": f"updated {ingredient.id}"},
+            content_type="application/json",
+        )
+        assert res.status_code == 200
+    assert RecipeVersionQueue.objects.filter(recipe_id=recipe.id).count() == len(
+        ingredients
+    )
+    assert RecipeHistorical.objects.filter(recipe_id=recipe.id).count() == before
+
+    window = timedelta(seconds=60)
+    now = datetime.now(UTC)
+    # still editing
+    assert save_queued_recipe_versions(window=window, now=now) == 0
+
+    assert save_queued_recipe_versions(window=window, now=now + window) == 1
+    assert not RecipeVersionQueue.objects.filter(recipe_id=recipe.id).exists()
+    assert RecipeHistorical.objects.filter(recipe_id=recipe.id).count() == before + 1
+    latest = RecipeHistorical.objects.filter(recipe_id=recipe.id).latest("id")
+    assert latest.actor == user
+    assert latest.ingredient_historical_ids is not None
+    assert sorted(
+        IngredientHistorical.objects.filter(
+            id__in=latest.ingredient_historical_ids
+        ).values_list("name", flat=True)
+    ) == sorted(f"updated {ingredient.id}" for ingredient in ingredients)
+
+
+def test_coalesced_versions_per_actor(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Edits from different people in the same window are saved as separate
+    versions, each credited to whoever made them.
+    """
+    monkeypatch.setattr(config, "RECIPE_VERSION_COALESCE_SECONDS", 60)
+    user = create_user()
+    user2 = create_user(email="b.person@example.com")
+    team = create_team(user=user)
+    team.force_join(user2)
+    user2.schedule_team = team
+    user2.save()
+    recipe = create_recipe(team=team, user=user)
+    before = RecipeHistorical.objects.filter(recipe_id=recipe.id).count()
+    first, second = list(recipe.ingredient_set.all())[:2]
+
+    for editor, ingredient in [(user, first), (user, second), (user2, second)]:
+        client = Client()
+        client.force_login(editor)
+        res = client.patch(
+            f"/api/v1/ingredients/{ingredient.id}/",
+            {"name": f"{editor.email} {ingredient.id}"},
+            content_type="application/json",
+        )
+        assert res.status_code == 200
+
+    # user2's edit saved user's edits
+    assert RecipeVersionQueue.objects.filter(recipe_id=recipe.id).count() == 1
+    window = timedelta(seconds=60)
+    assert (
+        save_queued_recipe_versions(window=window, now=datetime.now(UTC) + window) == 1
+    )
+
+    versions = list(
+        RecipeHistorical.objects.filter(recipe_id=recipe.id).order_by("id")[before:]
+    )
+    assert [version.actor for version in versions] == [user, user2]
+    names = [
+        set(
+            IngredientHistorical.objects.filter(
+                id__in=version.ingredient_historical_ids or []
+            ).values_list("name", flat=True)
+        )
+        for version in versions
+    ]
+    assert {f"{user.email} {first.id}", f"{user.email} {second.id}"} <= names[0]
+    assert {f"{user.email} {first.id}", f"{user2.email} {second.id}"} <= names[1]
+    assert f"{user.email} {second.id}" not in names[1]
+
+
+def test_coalesced_versions_for_deleted_recipe(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(config, "RECIPE_VERSION_COALESCE_SECONDS", 60)
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    client.force_login(user)
+    step = recipe.step_set.all()[:1].get()
+    res = client.delete(f"/api/v1/steps/{step.id}/")
+    assert res.status_code == 204
+    recipe_id = recipe.id
+    recipe.delete()
+
+    window = timedelta(seconds=60)
+    assert (
+        save_queued_recipe_versions(window=window, now=datetime.now(UTC) + window) == 0
+    )
+    assert not RecipeVersionQueue.objects.filter(recipe_id=recipe_id).exists()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Annotated
+
+import pydantic
+from pydantic import Field
+
+from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.exceptions import APIError
+from recipeyak.api.base.request import AuthedHttpRequest
+from recipeyak.api.base.serialization import Params
+from recipeyak.api.serializers.recipe import (
+    RecipeVersionSummaryResponse,
+    list_recipe_versions,
+)
+from recipeyak.models import filter_recipe_or_404, get_team
+
+
+class RecipeVersionsListParams(Params):
+    recipe_id: int
+    cursor: Annotated[
+        str | None,
+        Field(description="The `next_cursor` from the previous page."),
+    ] = None
+    limit: Annotated[int, Field(ge=1, le=100)] = 20
+
+
+class RecipeVersionsListResponse(pydantic.BaseModel):
+    versions: list[RecipeVersionSummaryResponse]
+    next_cursor: Annotated[
+        str | None,
+        Field(description="Pass as `cursor` to fetch the next page of versions."),
+    ]
+
+
+def encode_cursor(*, created: datetime, version_id: int) -> str:
+    return base64.urlsafe_b64encode(
+        f"{created.isoformat()},{version_id}".encode()
+    ).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created, version_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split(",")
+        )
+        return datetime.fromisoformat(created), int(version_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise APIError(code="invalid_cursor", message="Invalid cursor") from e
+
+
+@endpoint(query_budget=5)
+def recipe_versions_list_view(
+    request: AuthedHttpRequest, params: RecipeVersionsListParams
+) -> RecipeVersionsListResponse:
+    """
+    Summaries of the Recipe's previous versions, newest first.
+
+    Fetch a version's ingredients & steps with the version retrieve endpoint.
+    """
+    team = get_team(request.user)
+    recipe = filter_recipe_or_404(recipe_id=params.recipe_id, team=team)
+    before = decode_cursor(params.cursor) if params.cursor is not None else None
+    # fetch an extra row to know if there's another page
+    rows = list_recipe_versions(
+        recipe_id=recipe.id, before=before, limit=params.limit + 1
+    )
+    page = rows[: params.limit]
+    next_cursor = (
+        encode_cursor(created=page[-1][0], version_id=page[-1][1].id)
+        if len(rows) > params.limit
+        else None
+    )
+    return RecipeVersionsListResponse(
+        versions=[version for _created, version in page], next_cursor=next_cursor
+    )
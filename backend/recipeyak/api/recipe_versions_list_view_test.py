@@ -0,0 +1,66 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.test.client import Client
+
+from recipeyak.models import Recipe, User
+from recipeyak.models.recipe_historical import RecipeHistorical
+from recipeyak.versioning import save_recipe_version
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recipe_versions_list_pagination(
+    client: Client, user: User, recipe: Recipe
+) -> None:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    for day in range(5):
+        save_recipe_version(
+            recipe_id=recipe.id, actor=user, created=start + timedelta(days=day)
+        )
+    # same timestamp as the newest version, the id breaks the tie
+    save_recipe_version(
+        recipe_id=recipe.id, actor=None, created=start + timedelta(days=4)
+    )
+    expected_ids = list(
+        RecipeHistorical.objects.filter(recipe=recipe)
+        .order_by("-created", "-id")
+        .values_list("id", flat=True)
+    )
+    client.force_login(user)
+
+    seen_ids = []
+    cursor = None
+    pages = 0
+    while True:
+        params: dict[str, str | int] = {"limit": 4}
+        if cursor is not None:
+            params["cursor"] = cursor
+        res = client.get(f"/api/v1/recipes/{recipe.id}/versions/", params)
+        assert res.status_code == 200
+        pages += 1
+        seen_ids += [version["id"] for version in res.json()["versions"]]
+        cursor = res.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 2
+    assert seen_ids == expected_ids
+    # summaries don't include the snapshot
+    version = res.json()["versions"][0]
+    assert version.keys() == {"id", "created_at", "actor"}
+    assert version["actor"]["id"] == user.id
+
+
+def test_recipe_versions_list_errors(
+    client: Client, user: User, user2: User, recipe: Recipe
+) -> None:
+    save_recipe_version(recipe_id=recipe.id, actor=user)
+
+    client.force_login(user)
+    res = client.get(f"/api/v1/recipes/{recipe.id}/versions/", {"cursor": "bogus"})
+    assert res.status_code == 400
+
+    client.force_login(user2)
+    res = client.get(f"/api/v1/recipes/{recipe.id}/versions/")
+    assert res.status_code == 404
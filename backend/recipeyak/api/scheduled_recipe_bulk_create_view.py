@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Annotated
+
+import pydantic
+from django.db import transaction
+from django.http import Http404
+from pydantic import Field
+
+from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.request import AuthedHttpRequest
+from recipeyak.api.base.serialization import Params
+from recipeyak.api.calendar_serialization import (
+    ScheduleRecipeSerializer,
+    serialize_scheduled_recipe,
+)
+from recipeyak.models import Recipe, ScheduledRecipe, get_team
+from recipeyak.realtime import publish_calendar_events
+
+
+class ScheduledRecipeBulkCreateItem(pydantic.BaseModel):
+    recipe: int
+    on: date
+
+
+class ScheduledRecipeBulkCreateParams(Params):
+    scheduled_recipes: Annotated[
+        list[ScheduledRecipeBulkCreateItem], Field(min_length=1, max_length=500)
+    ]
+
+
+class ScheduledRecipeBulkCreateResponse(pydantic.BaseModel):
+    scheduled_recipes: list[ScheduleRecipeSerializer]
+
+
+@endpoint(query_budget=8)
+def scheduled_recipe_bulk_create_view(
+    request: AuthedHttpRequest, params: ScheduledRecipeBulkCreateParams
+) -> ScheduledRecipeBulkCreateResponse:
+    """
+    Schedule many recipes at once, like when planning out a month.
+
+    Either every recipe is scheduled or none are.
+    """
+    team = get_team(request.user)
+
+    recipe_ids = {item.recipe for item in params.scheduled_recipes}
+    recipes = {
+        recipe.id: recipe
+        for recipe in Recipe.objects.filter(
+            team=team, id__in=recipe_ids
+        ).select_related("primary_image")
+    }
+    if len(recipes) != len(recipe_ids):
+        raise Http404
+
+    with transaction.atomic():
+        scheduled_recipes = ScheduledRecipe.objects.bulk_create(
+            ScheduledRecipe(
+                recipe=recipes[item.recipe],
+                on=item.on,
+                team=team,
+                created_by=request.user,
+            )
+            for item in params.scheduled_recipes
+        )
+        team.invalidate_shoppinglists()
+
+        res = [
+            serialize_scheduled_recipe(
+                scheduled_recipe, user_id=request.user.id, team_id=team.id
+            )
+            for scheduled_recipe in scheduled_recipes
+        ]
+
+        publish_calendar_events(res, team_id=team.id)
+    return ScheduledRecipeBulkCreateResponse(scheduled_recipes=res)
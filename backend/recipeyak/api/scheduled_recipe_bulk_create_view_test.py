@@ -0,0 +1,155 @@
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+
+from recipeyak import realtime
+from recipeyak.api import scheduled_recipe_bulk_create_view
+from recipeyak.api.base.json import json_loads
+from recipeyak.models import Recipe, ScheduledRecipe, Team, Upload, User
+
+# imported before conftest patches it out for the other tests
+from recipeyak.realtime import (
+    publish_calendar_events as unpatched_publish_calendar_events,
+)
+from recipeyak.realtime_transport import MAX_MESSAGE_BYTES, Message
+
+pytestmark = pytest.mark.django_db
+
+
+def test_bulk_scheduling_recipes(
+    client: Client,
+    user: User,
+    team: Team,
+    recipes: list[Recipe],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Scheduling a month of recipes is a fixed number of queries & one realtime
+    message.
+    """
+    publish = MagicMock()
+    monkeypatch.setattr(
+        scheduled_recipe_bulk_create_view, "publish_calendar_events", publish
+    )
+    shoppinglist_version = team.shoppinglist_version
+    items = [
+        {
+            "recipe": recipes[i % len(recipes)].id,
+            "on": str(date(1976, 7, 1) + timedelta(days=i)),
+        }
+        for i in range(30)
+    ]
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as queries:
+        res = client.post(
+            "/api/v1/calendar/bulk/",
+            {"scheduled_recipes": items},
+            content_type="application/json",
+        )
+    assert res.status_code == 200
+    assert len(queries) == 11
+
+    scheduled = res.json()["scheduled_recipes"]
+    assert [{"recipe": s["recipe"]["id"], "on": s["on"]} for s in scheduled] == items
+    assert {s["createdBy"]["id"] for s in scheduled} == {user.id}
+    assert ScheduledRecipe.objects.filter(team=team).count() == 30
+
+    publish.assert_called_once()
+    assert [s.id for s in publish.call_args.args[0]] == [s["id"] for s in scheduled]
+
+    team.refresh_from_db()
+    assert team.shoppinglist_version == shoppinglist_version + 1
+
+
+def test_bulk_scheduling_is_all_or_nothing(
+    client: Client, user: User, team: Team, recipe: Recipe, recipe2: Recipe
+) -> None:
+    """
+    A recipe from another team means none of them are scheduled.
+    """
+    recipe2.team = Team.objects.create(name="other team")
+    recipe2.save()
+    client.force_login(user)
+
+    res = client.post(
+        "/api/v1/calendar/bulk/",
+        {
+            "scheduled_recipes": [
+                {"recipe": recipe.id, "on": "1976-07-06"},
+                {"recipe": recipe2.id, "on": "1976-07-07"},
+            ]
+        },
+        content_type="application/json",
+    )
+    assert res.status_code == 404
+    assert not ScheduledRecipe.objects.exists()
+
+    res = client.post(
+        "/api/v1/calendar/bulk/",
+        {"scheduled_recipes": []},
+        content_type="application/json",
+    )
+    assert res.status_code == 400
+
+
+def test_bulk_scheduling_splits_realtime_messages(
+    client: Client,
+    user: User,
+    team: Team,
+    recipes: list[Recipe],
+    monkeypatch: pytest.MonkeyPatch,
+    django_capture_on_commit_callbacks: Callable[
+        ..., AbstractContextManager[list[Callable[[], None]]]
+    ],
+) -> None:
+    """
+    The most recipes we'll schedule at once, with image placeholders, don't
+    fit in one Ably message.
+    """
+    monkeypatch.setattr(
+        scheduled_recipe_bulk_create_view,
+        "publish_calendar_events",
+        unpatched_publish_calendar_events,
+    )
+    submitted = list[Message]()
+    monkeypatch.setattr(realtime.publisher, "submit", submitted.append)
+    for recipe in recipes:
+        recipe.primary_image = Upload.objects.create(
+            bucket="recipeyak",
+            key=f"{recipe.id}/image.jpg",
+            content_type="image/jpeg",
+            recipe=recipe,
+            background_url="data:image/jpeg;base64," + "A" * 1_000,
+        )
+        recipe.save()
+    items = [
+        {
+            "recipe": recipes[i % len(recipes)].id,
+            "on": str(date(1976, 7, 1) + timedelta(days=i)),
+        }
+        for i in range(500)
+    ]
+    client.force_login(user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        res = client.post(
+            "/api/v1/calendar/bulk/",
+            {"scheduled_recipes": items},
+            content_type="application/json",
+        )
+    assert res.status_code == 200
+
+    assert len(submitted) > 1
+    for message in submitted:
+        assert message.name == "scheduled_recipes_updated"
+        assert len(message.name) + len(str(message.data).encode()) <= MAX_MESSAGE_BYTES
+    assert [s["id"] for m in submitted for s in json_loads(str(m.data))] == [
+        s["id"] for s in res.json()["scheduled_recipes"]
+    ]
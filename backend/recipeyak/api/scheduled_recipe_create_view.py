@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from recipeyak.api.base.decorators import endpoint
@@ -21,7 +22,7 @@ class ScheduledRecipeCreateParams(Params):
     on: date
 
 
-@endpoint()
+@endpoint(query_budget=11)
 def scheduled_recipe_create_view(
     request: AuthedHttpRequest, params: ScheduledRecipeCreateParams
 ) -> ScheduleRecipeSerializer:
@@ -29,14 +30,15 @@ def scheduled_recipe_create_view(
 
     recipe = get_object_or_404(filter_recipes(team=team), id=params.recipe)
 
-    scheduled_recipe = recipe.schedule(
-        on=params.on,
-        user=request.user,
-        team=get_object_or_404(get_teams(request.user), pk=team.id),
-    )
-    res = serialize_scheduled_recipe(
-        scheduled_recipe, user_id=request.user.id, team_id=team.id
-    )
-
-    publish_calendar_event(res, team_id=team.id)
+    with transaction.atomic():
+        scheduled_recipe = recipe.schedule(
+            on=params.on,
+            user=request.user,
+            team=get_object_or_404(get_teams(request.user), pk=team.id),
+        )
+        res = serialize_scheduled_recipe(
+            scheduled_recipe, user_id=request.user.id, team_id=team.id
+        )
+
+        publish_calendar_event(res, team_id=team.id)
     return res
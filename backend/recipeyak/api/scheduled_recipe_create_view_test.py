@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from datetime import date
 
 import pytest
@@ -38,3 +39,24 @@ def test_adding_to_team_calendar(
     scheduled = ScheduledRecipe.objects.get(id=res.json().get("id"))
     assert scheduled.team is not None
     assert scheduled.team.pk == team.pk
+
+
+def test_scheduled_recipe_create_query_count(
+    client: Client,
+    user: User,
+    team: Team,
+    recipe: Recipe,
+    assert_queries_dont_grow: Callable[..., None],
+) -> None:
+    recipe.team = team
+    recipe.save()
+    client.force_login(user)
+
+    assert_queries_dont_grow(
+        lambda: client.post(
+            "/api/v1/calendar/",
+            {"recipe": recipe.id, "on": date(1976, 7, 6)},
+            content_type="application/json",
+        ),
+        recipes=[recipe],
+    )
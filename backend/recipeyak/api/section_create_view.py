@@ -11,8 +11,8 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.serializers.recipe import SectionSerializer, serialize_section
 from recipeyak.models import ChangeType, Recipe, RecipeChange, Section
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class SectionCreateParams(Params):
@@ -30,6 +30,7 @@ def section_create_view(
         raise APIError(code="no_access", message="No access to recipe", status=403)
 
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=recipe.id, actor=request.user)
         RecipeChange.objects.create(
             recipe=recipe,
             actor=request.user,
@@ -51,8 +52,13 @@ def section_create_view(
                 section.position = ordering.FIRST_POSITION
 
         section.save()
-        save_recipe_version(recipe_id=recipe.id, actor=request.user)
+        enqueue_recipe_version(recipe_id=recipe.id, actor=request.user)
 
-    publish_recipe(recipe_id=recipe.id, team_id=recipe.team_id)
+        res = serialize_section(section)
+        publish_recipe(
+            recipe_id=recipe.id,
+            team_id=recipe.team_id,
+            patch=RecipePatch(kind="section", op="upsert", id=res.id, value=res),
+        )
 
-    return serialize_section(section)
+    return res
@@ -9,8 +9,8 @@ from recipeyak.api.base.permissions import has_recipe_access
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.models import ChangeType, RecipeChange, Section
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class SectionDeleteParams(Params):
@@ -29,6 +29,7 @@ def section_delete_view(
         )
 
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=recipe.id, actor=request.user)
         RecipeChange.objects.create(
             recipe=recipe,
             actor=request.user,
@@ -37,6 +38,10 @@ def section_delete_view(
             change_type=ChangeType.SECTION_DELETE,
         )
         section.delete()
-        save_recipe_version(recipe_id=recipe.id, actor=request.user)
+        enqueue_recipe_version(recipe_id=recipe.id, actor=request.user)
 
-    publish_recipe(recipe_id=recipe.id, team_id=recipe.team_id)
+        publish_recipe(
+            recipe_id=recipe.id,
+            team_id=recipe.team_id,
+            patch=RecipePatch(kind="section", op="delete", id=params.section_id),
+        )
@@ -10,8 +10,8 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.serializers.recipe import SectionSerializer, serialize_section
 from recipeyak.models import ChangeType, RecipeChange, Section
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class SectionUpdateParams(Params):
@@ -29,6 +29,7 @@ def section_update_view(
         raise APIError(code="no_access", message="No access to recipe", status=403)
 
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=section.recipe_id, actor=request.user)
         if params.title is not None:
             section.title = params.title
         if params.position is not None:
@@ -41,7 +42,12 @@ def section_update_view(
             change_type=ChangeType.SECTION_UPDATE,
         )
         section.save()
-        save_recipe_version(recipe_id=section.recipe_id, actor=request.user)
-    publish_recipe(recipe_id=section.recipe.id, team_id=section.recipe.team_id)
+        enqueue_recipe_version(recipe_id=section.recipe_id, actor=request.user)
+        res = serialize_section(section)
+        publish_recipe(
+            recipe_id=section.recipe.id,
+            team_id=section.recipe.team_id,
+            patch=RecipePatch(kind="section", op="upsert", id=res.id, value=res),
+        )
 
-    return serialize_section(section)
+    return res
@@ -9,6 +9,7 @@ import tldextract
 from django.db import connection
 from pydantic import Field
 
+from recipeyak.api.base.json import json_dumps, json_loads
 from recipeyak.models import (
     Ingredient,
     Note,
@@ -20,7 +21,7 @@ from recipeyak.models import (
 from recipeyak.models.reaction import Reaction
 from recipeyak.models.recipe_favorite import RecipeFavorite
 from recipeyak.models.timeline_event import TimelineEvent
-from recipeyak.models.upload import Upload
+from recipeyak.models.upload import Upload, public_url
 from recipeyak.models.user import get_avatar_url
 
 IGNORED_TIMELINE_EVENTS = {"set_primary_image", "remove_primary_image"}
@@ -202,7 +203,7 @@ class RecipeVersionActorResponse(pydantic.BaseModel):
     avatar_url: str
 
 
-class RecipeVersionResponse(pydantic.BaseModel):
+class RecipeVersionSerializer(pydantic.BaseModel):
     id: int
     created_at: str
     actor: RecipeVersionActorResponse | None
@@ -304,8 +305,16 @@ class RecipeSerializer(pydantic.BaseModel):
         UploadResponse | None, Field(description="The primary image of the Recipe.")
     ]
     versions: Annotated[
-        list[RecipeVersionResponse],
-        Field(description="The previous versions of the Recipe."),
+        list[RecipeVersionSerializer],
+        Field(
+            description="The previous versions of the Recipe. Empty unless requested with `include=versions`, otherwise use the versions endpoint."
+        ),
+    ]
+    realtime_seq: Annotated[
+        int,
+        Field(
+            description="Sequence number of the last realtime message about the Recipe, to apply the following messages' patches to this response."
+        ),
     ]
 
 
@@ -393,15 +402,18 @@ def serialize_section(section: Section) -> SectionSerializer:
     )
 
 
-def _get_versions(recipe_id: int) -> list[RecipeVersionResponse]:
-    with connection.cursor() as cur:
-        cur.execute(
-            """
-select 
-  json_object(
-    'id': recipe_historical.id,
-    'created_at': recipe_historical.created,
-    'actor': (
+def _version_rows_sql(table: str) -> str:
+    """
+    Rows of `table` in the `recipe_historical` version.
+    """
+    return f"""(
+      recipe_historical.{table}_ids is null
+      and {table}.recipe_historical_id = recipe_historical.id
+    ) or {table}.id = any(recipe_historical.{table}_ids)"""
+
+
+_RECIPE_VERSION_ACTOR_JSON = """
+    (
       select json_object(
         'id': id,
         'name': coalesce(name, email),
@@ -416,7 +428,15 @@ select
       )
       from core_myuser
       where core_myuser.id = recipe_historical.actor_id
-    ),
+    )
+"""
+
+# A recipe_historical row as a `RecipeVersionSerializer`
+_RECIPE_VERSION_JSON = f"""
+  json_object(
+    'id': recipe_historical.id,
+    'created_at': recipe_historical.created,
+    'actor': {_RECIPE_VERSION_ACTOR_JSON},
     'name': recipe_historical.name, 
     'author': recipe_historical.author,
     'source': recipe_historical.source,
@@ -451,7 +471,7 @@ select
           from
             ingredient_historical
           where
-            ingredient_historical.recipe_historical_id = recipe_historical.id
+            {_version_rows_sql("ingredient_historical")}
           union all (
             select
               json_object(
@@ -463,7 +483,7 @@ select
            from
             section_historical
            where
-            section_historical.recipe_historical_id = recipe_historical.id
+            {_version_rows_sql("section_historical")}
           )
        )
       order by 
@@ -482,12 +502,21 @@ select
         from
           step_historical
         where
-          step_historical.recipe_historical_id = recipe_historical.id
+          {_version_rows_sql("step_historical")}
         order by
           position asc
       ) sub
   )
 )
+"""
+
+
+def _get_versions(recipe_id: int) -> list[RecipeVersionSerializer]:
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+select
+{_RECIPE_VERSION_JSON}
 from recipe_historical 
 join core_recipe on core_recipe.id = recipe_historical.recipe_id
 where core_recipe.id = %(recipe_id)s
@@ -495,18 +524,90 @@ order by recipe_historical.created desc
 """,
             {"recipe_id": recipe_id},
         )
-        out: list[RecipeVersionResponse] = []
+        out: list[RecipeVersionSerializer] = []
         for row in cur.fetchall():
             obj = row[0]
             out.append(
-                RecipeVersionResponse.model_validate(
+                RecipeVersionSerializer.model_validate(
                     obj,
                 )
             )
         return out
 
 
-def serialize_recipe(recipe: Recipe, user: User) -> RecipeSerializer:
+class RecipeVersionSummaryResponse(pydantic.BaseModel):
+    id: int
+    created_at: str
+    actor: RecipeVersionActorResponse | None
+
+
+def list_recipe_versions(
+    *, recipe_id: int, before: tuple[datetime, int] | None, limit: int
+) -> list[tuple[datetime, RecipeVersionSummaryResponse]]:
+    """
+    Versions of the recipe, newest first, starting after the `(created, id)`
+    of `before`.
+
+    Returns each version's `created` alongside it to build the next cursor.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+select
+  recipe_historical.created,
+  json_object(
+    'id': recipe_historical.id,
+    'created_at': recipe_historical.created,
+    'actor': {_RECIPE_VERSION_ACTOR_JSON}
+  )
+from recipe_historical
+where
+  recipe_historical.recipe_id = %(recipe_id)s
+  and (
+    %(before_created)s::timestamptz is null
+    or (recipe_historical.created, recipe_historical.id)
+      < (%(before_created)s, %(before_id)s)
+  )
+order by recipe_historical.created desc, recipe_historical.id desc
+limit %(limit)s
+""",
+            {
+                "recipe_id": recipe_id,
+                "before_created": before[0] if before is not None else None,
+                "before_id": before[1] if before is not None else None,
+                "limit": limit,
+            },
+        )
+        return [
+            (created, RecipeVersionSummaryResponse.model_validate(obj))
+            for created, obj in cur.fetchall()
+        ]
+
+
+def get_recipe_version(
+    *, recipe_id: int, version_id: int
+) -> RecipeVersionSerializer | None:
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+select
+{_RECIPE_VERSION_JSON}
+from recipe_historical
+where
+  recipe_historical.id = %(version_id)s
+  and recipe_historical.recipe_id = %(recipe_id)s
+""",
+            {"recipe_id": recipe_id, "version_id": version_id},
+        )
+        row = cur.fetchone()
+    if row is None:
+        return None
+    return RecipeVersionSerializer.model_validate(row[0])
+
+
+def serialize_recipe(
+    recipe: Recipe, user: User, *, include_versions: bool = False
+) -> RecipeSerializer:
     ingredients = [serialize_ingredient(x) for x in recipe.ingredient_set.all()]
     steps = [serialize_step(x) for x in recipe.step_set.all()]
     recent_schedules = serialize_recent_schedules(recipe)
@@ -517,7 +618,7 @@ def serialize_recipe(recipe: Recipe, user: User) -> RecipeSerializer:
         if recipe.primary_image is not None
         else None
     )
-    versions = _get_versions(recipe.id)
+    versions = _get_versions(recipe.id) if include_versions else []
     return RecipeSerializer(
         id=recipe.id,
         name=recipe.name,
@@ -537,4 +638,369 @@ def serialize_recipe(recipe: Recipe, user: User) -> RecipeSerializer:
         primaryImage=primary_image,
         user_favorite=RecipeFavorite.objects.filter(recipe=recipe, user=user).exists(),
         versions=versions,
+        realtime_seq=recipe.realtime_seq,
     )
+
+
+def _iso_datetime_sql(column: str) -> str:
+    """
+    Format a timestamptz the way orjson formats the datetimes Django gives
+    us, Postgres trims trailing zeros from the fraction.
+    """
+    return f"""(
+      to_char({column} at time zone 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS')
+      || coalesce(nullif('.' || to_char({column} at time zone 'UTC', 'US'), '.000000'), '')
+      || '+00:00'
+    )"""
+
+
+def _normalized_path_sql(key: str) -> str:
+    """
+    `key` with its `.` & `..` segments resolved like yarl's `_normalize_path`.
+
+    A segment is dropped when a later `..` pops it, i.e., when the running
+    count of segments minus `..`s drops below where it was after the segment.
+    """
+    return f"""(
+      select coalesce(
+        string_agg(seg, '/' order by i)
+          || case when {key} ~ '(^|/)\\.\\.?$' then '/' else '' end,
+        ''
+      )
+      from (
+        select
+          i,
+          seg,
+          depth,
+          min(depth) over (
+            order by i rows between 1 following and unbounded following
+          ) later_depth
+        from (
+          select
+            i,
+            seg,
+            sum(case seg when '..' then -1 when '.' then 0 else 1 end)
+              over (order by i) depth
+          from unnest(string_to_array({key}, '/')) with ordinality segments(seg, i)
+        ) running
+      ) resolved
+      where seg not in ('.', '..')
+        and (later_depth is null or later_depth >= depth)
+    )"""
+
+
+def _percent_encoded_sql(value: str) -> str:
+    """
+    Percent-encode `value`'s UTF-8 bytes like yarl does.
+    """
+    safe = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789!$&''()*+,-./:;=@_~"
+    return f"""(
+      select coalesce(
+        string_agg(
+          case
+            when byte < 128 then
+              case
+                when strpos('{safe}', chr(byte)) > 0 then chr(byte)
+                else '%%' || upper(lpad(to_hex(byte), 2, '0'))
+              end
+            else '%%' || upper(to_hex(byte))
+          end,
+          '' order by i
+        ),
+        ''
+      )
+      from (
+        select i, get_byte(convert_to({value}, 'UTF8'), i) byte
+        from generate_series(0, octet_length(convert_to({value}, 'UTF8')) - 1) i
+      ) value_bytes
+    )"""
+
+
+def _public_url_sql(key: str) -> str:
+    """
+    Same as `public_url`. yarl's `with_path` percent-encodes the key's UTF-8
+    bytes, without requoting, so a `%` is always encoded, even when it starts
+    a valid escape. It also resolves `.` & `..` segments and keeps a leading
+    `/` from doubling up with the host's.
+
+    Most keys don't need any of that, so they skip straight to the prefix.
+    """
+    return f"""(
+      case
+        when {key} is null then null
+        when {key} ~ '^[A-Za-z0-9!$&''()*+,\\-./:;=@_~]+$'
+          and {key} !~ '^/|(^|/)\\.\\.?(/|$)'
+          then %(upload_url_prefix)s || {key}
+        else (
+          select case
+            when path = '' then left(%(upload_url_prefix)s, -1)
+            when path like '/%%' then left(%(upload_url_prefix)s, -1) || path
+            else %(upload_url_prefix)s || path
+          end
+          from (
+            select {_percent_encoded_sql(_normalized_path_sql(key))} path
+          ) normalized
+        )
+      end
+    )"""
+
+
+def _public_user_sql(user_id: str) -> str:
+    """
+    A `PublicUser` for the user with `user_id`, null if there isn't one.
+    """
+    return f"""(
+      select json_object(
+        'id': public_user.id,
+        'name': coalesce(nullif(public_user.name, ''), public_user.email),
+        'email': public_user.email,
+        'avatar_url': coalesce(
+          {_public_url_sql("profile_upload.key")},
+          '/avatar/' || md5(public_user.email) || '?d=identicon&r=g'
+        )
+      )
+      from core_myuser public_user
+      left join core_upload profile_upload on profile_upload.id = public_user.profile_upload_id
+      where public_user.id = {user_id}
+    )"""
+
+
+_RECIPE_DETAIL_SQL = f"""
+with recipe as (
+  select *
+  from core_recipe
+  where id = %(recipe_id)s and team_id = %(team_id)s
+)
+select
+  json_object(
+    'id': recipe.id,
+    'name': recipe.name,
+    'author': recipe.author,
+    'source': recipe.source,
+    'time': recipe.time,
+    'servings': recipe.servings,
+    'ingredients': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': ingredient.id,
+            'quantity': ingredient.quantity,
+            'name': ingredient.name,
+            'description': ingredient.description,
+            'position': ingredient.position,
+            'optional': ingredient.optional
+          )
+          order by ingredient.position, ingredient.id
+        ),
+        '[]'::json
+      )
+      from core_ingredient ingredient
+      where ingredient.recipe_id = recipe.id
+    ),
+    'steps': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': step.id,
+            'text': step.text,
+            'position': step.position
+          )
+          order by step.position, step.id
+        ),
+        '[]'::json
+      )
+      from core_step step
+      where step.recipe_id = recipe.id
+    ),
+    'recentSchedules': (
+      select coalesce(
+        json_agg(
+          json_object('id': scheduled_recipe.id, 'on': scheduled_recipe."on")
+          order by scheduled_recipe."on" desc, scheduled_recipe.id
+        ),
+        '[]'::json
+      )
+      from core_scheduledrecipe scheduled_recipe
+      where
+        scheduled_recipe.recipe_id = recipe.id
+        and scheduled_recipe."on" between
+          (now() at time zone 'UTC')::date - 21
+          and (now() at time zone 'UTC')::date + 21
+    ),
+    'timelineItems': (
+      select coalesce(
+        json_agg(
+          timeline_item.item
+          order by timeline_item.kind, timeline_item.created desc, timeline_item.id
+        ),
+        '[]'::json
+      )
+      from (
+        select
+          0 kind,
+          note.created,
+          note.id,
+          json_object(
+            'id': note.id::text,
+            'text': note.text,
+            'created_by': {_public_user_sql("note.created_by_id")},
+            'created': {_iso_datetime_sql("note.created")},
+            'modified': {_iso_datetime_sql("note.modified")},
+            'attachments': (
+              select coalesce(
+                json_agg(
+                  json_object(
+                    'id': upload.id::text,
+                    'url': {_public_url_sql("upload.key")},
+                    'backgroundUrl': upload.background_url,
+                    'contentType': upload.content_type,
+                    'isPrimary': upload.id is not distinct from recipe.primary_image_id,
+                    'type': 'upload'
+                  )
+                  order by upload.id
+                ),
+                '[]'::json
+              )
+              from core_upload upload
+              where upload.note_id = note.id
+            ),
+            'reactions': (
+              select coalesce(
+                json_agg(
+                  json_object(
+                    'id': reaction.id::text,
+                    'type': reaction.emoji,
+                    'note_id': reaction.note_id,
+                    'user': {_public_user_sql("reaction.created_by_id")},
+                    'created': {_iso_datetime_sql("reaction.created")}
+                  )
+                  order by reaction.created desc, reaction.id
+                ),
+                '[]'::json
+              )
+              from core_reaction reaction
+              where reaction.note_id = note.id
+            ),
+            'type': 'note'
+          ) item
+        from core_note note
+        where note.recipe_id = recipe.id
+        union all
+        select
+          1 kind,
+          timeline_event.created,
+          timeline_event.id,
+          json_object(
+            'id': timeline_event.id,
+            'type': 'recipe',
+            'action': timeline_event.action,
+            'created_by': {_public_user_sql("timeline_event.created_by_id")},
+            'is_scraped': recipe.scrape_id is not null,
+            'created': {_iso_datetime_sql("timeline_event.created")}
+          ) item
+        from timeline_event
+        where
+          timeline_event.recipe_id = recipe.id
+          and timeline_event.action not in ('set_primary_image', 'remove_primary_image')
+      ) timeline_item
+    ),
+    'sections': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': section.id,
+            'title': section.title,
+            'position': section.position
+          )
+          order by section.position, section.id
+        ),
+        '[]'::json
+      )
+      from core_section section
+      where section.recipe_id = recipe.id
+    ),
+    'modified': {_iso_datetime_sql("recipe.modified")},
+    'created': {_iso_datetime_sql("recipe.created")},
+    'archived_at': {_iso_datetime_sql("recipe.archived_at")},
+    'user_favorite': exists (
+      select 1
+      from recipe_favorite
+      where recipe_favorite.recipe_id = recipe.id
+        and recipe_favorite.user_id = %(user_id)s
+    ),
+    'tags': recipe.tags,
+    'primaryImage': (
+      select json_object(
+        'id': upload.id::text,
+        'url': {_public_url_sql("upload.key")},
+        'backgroundUrl': upload.background_url,
+        'contentType': upload.content_type,
+        -- scraped images are credited to the site, see `scraped_source`
+        'author': (
+          select name from core_myuser where core_myuser.id = upload.created_by_id
+        )
+      )
+      from core_upload upload
+      where upload.id = recipe.primary_image_id
+    ),
+    'versions': case when %(include_versions)s then (
+      select coalesce(
+        json_agg(version.version order by version.created desc),
+        '[]'::json
+      )
+      from (
+        select
+          recipe_historical.created,
+{_RECIPE_VERSION_JSON} version
+        from recipe_historical
+        where recipe_historical.recipe_id = recipe.id
+      ) version
+    ) else '[]'::json end,
+    'realtime_seq': recipe.realtime_seq
+  )::text,
+  (
+    select upload_recipe.source
+    from core_upload upload
+    join core_recipe upload_recipe on upload_recipe.id = upload.recipe_id
+    where
+      upload.id = recipe.primary_image_id
+      and upload.created_by_id is null
+      and upload_recipe.source like 'http%%'
+  ) scraped_source
+from recipe
+"""
+
+
+def serialize_recipe_json(
+    *, recipe_id: int, team_id: int, user_id: int, include_versions: bool = False
+) -> bytes | None:
+    """
+    Same bytes as `json_dumps(serialize_recipe(...))`, built by Postgres in
+    one query rather than through the ORM & pydantic.
+
+    Returns None if the team doesn't have the recipe.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            _RECIPE_DETAIL_SQL,
+            {
+                "recipe_id": recipe_id,
+                "team_id": team_id,
+                "user_id": user_id,
+                "include_versions": include_versions,
+                "upload_url_prefix": public_url("/"),
+            },
+        )
+        row = cur.fetchone()
+    if row is None:
+        return None
+    recipe_json: str = row[0]
+    scraped_source: str | None = row[1]
+    # Postgres's json output has whitespace between tokens, so we compact it
+    recipe_data = json_loads(recipe_json)
+    if scraped_source is not None:
+        # Postgres doesn't know the public suffix list
+        recipe_data["primaryImage"]["author"] = tldextract.extract(
+            scraped_source
+        ).domain
+    return json_dumps(recipe_data)
@@ -0,0 +1,136 @@
+# ruff: noqa: T201
+"""
+Benchmark the recipe detail engines on recipes with lots of notes.
+
+Creates the recipes in a transaction that's rolled back, so it's safe to
+point at a dev database.
+
+    python -m recipeyak.api.serializers.recipe_bench --notes 100 --notes 500
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from uuid import uuid4
+
+import django
+import typer
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "recipeyak.django.settings")
+django.setup()
+from django.db import transaction  # noqa: E402
+
+from recipeyak.api.base.json import json_dumps  # noqa: E402
+from recipeyak.api.serializers.recipe import (  # noqa: E402
+    serialize_recipe,
+    serialize_recipe_json,
+)
+from recipeyak.models import (  # noqa: E402
+    Ingredient,
+    Note,
+    Reaction,
+    Recipe,
+    Step,
+    Team,
+    TimelineEvent,
+    Upload,
+    User,
+    filter_recipe_or_404,
+)
+
+
+def _create_recipe(*, notes: int) -> tuple[User, Team, Recipe]:
+    """
+    A well loved recipe, where every note has a photo & a few reactions.
+    """
+    users = [
+        User.objects.create_user(email=f"bench-{uuid4().hex}@example.com")
+        for _ in range(3)
+    ]
+    team = Team.objects.create(name="bench")
+    for user in users:
+        team.force_join(user)
+    recipe = Recipe.objects.create(name="bench", team=team, source="example.com")
+    Ingredient.objects.bulk_create(
+        Ingredient(
+            quantity=f"{i} cups", name=f"ingredient {i}", position=str(i), recipe=recipe
+        )
+        for i in range(15)
+    )
+    Step.objects.bulk_create(
+        Step(text=f"step {i}", position=str(i), recipe=recipe) for i in range(8)
+    )
+    created_notes = Note.objects.bulk_create(
+        Note(text=f"note {i}", created_by=users[i % 3], recipe=recipe)
+        for i in range(notes)
+    )
+    Upload.objects.bulk_create(
+        Upload(
+            bucket="bench",
+            key=f"{note.id}/photo.jpg",
+            content_type="image/jpeg",
+            created_by=note.created_by,
+            note=note,
+            recipe=recipe,
+        )
+        for note in created_notes
+    )
+    Reaction.objects.bulk_create(
+        Reaction(emoji="❤️", created_by=user, note=note)
+        for note in created_notes
+        for user in users
+        if user != note.created_by
+    )
+    TimelineEvent.objects.create(action="created", created_by=users[0], recipe=recipe)
+    return users[0], team, recipe
+
+
+def _time(fn: Callable[[], bytes | None], *, rounds: int) -> tuple[float, bytes | None]:
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds, result
+
+
+def main(
+    notes: list[int] = [10, 100, 300, 1_000],  # noqa: B006
+    rounds: int = 5,
+) -> None:
+    """
+    Compare serialize_recipe against serialize_recipe_json.
+    """
+    for n in notes:
+        with transaction.atomic():
+            user, team, recipe = _create_recipe(notes=n)
+
+            def python(
+                user: User = user, team: Team = team, recipe: Recipe = recipe
+            ) -> bytes:
+                detail = filter_recipe_or_404(
+                    recipe_id=recipe.id, team=team, profile="detail"
+                )
+                return json_dumps(serialize_recipe(detail, user=user))
+
+            def sql(
+                user: User = user, team: Team = team, recipe: Recipe = recipe
+            ) -> bytes | None:
+                return serialize_recipe_json(
+                    recipe_id=recipe.id, team_id=team.id, user_id=user.id
+                )
+
+            python_sec, python_json = _time(python, rounds=rounds)
+            sql_sec, sql_json = _time(sql, rounds=rounds)
+            transaction.set_rollback(True)
+        if python_json != sql_json:
+            raise SystemExit(f"output mismatch for notes={n}")
+        print(
+            f"notes={n:>5} python={python_sec * 1000:8.1f}ms sql={sql_sec * 1000:8.1f}ms "
+            f"speedup={python_sec / sql_sec:5.1f}x bytes={len(sql_json or b'')}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
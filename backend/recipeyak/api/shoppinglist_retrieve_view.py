@@ -1,21 +1,29 @@
 from datetime import date
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any, cast
 
 import pydantic
-from django.core.exceptions import ValidationError
-from django.db.models import QuerySet
+import structlog
+from django.db import connection
 from typing_extensions import TypedDict
 
+from recipeyak import config
 from recipeyak.api.base.decimal import fmt_decimal
 from recipeyak.api.base.decorators import endpoint
-from recipeyak.api.base.exceptions import APIError
 from recipeyak.api.base.json import json_dumps
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
-from recipeyak.category import category
-from recipeyak.combine import Ingredient, combine_ingredients
-from recipeyak.models import Ingredient as DBIngredient
-from recipeyak.models import ScheduledRecipe, ShoppingList, Team, get_team
-from recipeyak.parsing import Unit
+from recipeyak.models import ShoppingList, get_team
+from recipeyak.parsed_ingredient import (
+    ParsedIngredient,
+    combine_parsed_ingredients,
+    parse_ingredient_fields,
+)
+from recipeyak.parsing import _MASS, _VOLUME, BaseUnit, Unit
+from recipeyak.shoppinglist_cache import ShoppingListCache
+
+logger = structlog.stdlib.get_logger()
 
 
 class ShoppinglistRetrieveParams(Params):
@@ -25,16 +33,58 @@ class ShoppinglistRetrieveParams(Params):
 
 def get_scheduled_recipes(
     *, params: ShoppinglistRetrieveParams, team_id: int
-) -> QuerySet[ScheduledRecipe] | None:
-    team = Team.objects.filter(pk=team_id).first()
-    if team is None:
-        return None
-    try:
-        return team.scheduledrecipe_set.filter(on__gte=params.start).filter(
-            on__lte=params.end
+) -> list[dict[str, Any]]:
+    """
+    Fetch the scheduled recipes in the date range, along with their
+    ingredients, in one query.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select
+  json_object(
+    'scheduled_recipe_id': scheduled_recipe.id,
+    'recipe_id': recipe.id,
+    'recipe_name': recipe.name,
+    'ingredients': (
+      select coalesce(json_agg(ingredient), '[]'::json)
+      from (
+        select json_object(
+          'quantity': quantity,
+          'name': name,
+          'parsed_name': parsed_name,
+          'parsed_singular_name': parsed_singular_name,
+          'parsed_unit': parsed_unit,
+          'parsed_quantity_numerator': parsed_quantity_numerator,
+          'parsed_quantity_denominator': parsed_quantity_denominator,
+          'parsed_unknown_unit': parsed_unknown_unit,
+          'parsed_base_unit': parsed_base_unit,
+          'parsed_base_quantity_numerator': parsed_base_quantity_numerator,
+          'parsed_base_quantity_denominator': parsed_base_quantity_denominator,
+          'parsed_category': parsed_category
+        ) ingredient
+        from core_ingredient
+        where core_ingredient.recipe_id = recipe.id
+        order by position
+      ) sub
+    )
+  )
+from
+  core_scheduledrecipe scheduled_recipe
+  join core_recipe recipe on recipe.id = scheduled_recipe.recipe_id
+where
+  scheduled_recipe.team_id = %(team_id)s
+  and scheduled_recipe."on" >= %(start)s::date
+  and scheduled_recipe."on" <= %(end)s::date
+order by scheduled_recipe."on" desc, scheduled_recipe.id
+""",
+            {
+                "team_id": team_id,
+                "start": params.start.isoformat(),
+                "end": params.end.isoformat(),
+            },
         )
-    except (ValueError, ValidationError):
-        return None
+        return [row[0] for row in cursor.fetchall()]
 
 
 class ShoppingListRecipe(pydantic.BaseModel):
@@ -59,31 +109,53 @@ class ShoppinglistRetrieveResponse(TypedDict):
     recipes: list[ShoppingListRecipe]
 
 
-@endpoint()
-def shoppinglist_retrieve_view(
-    request: AuthedHttpRequest, params: ShoppinglistRetrieveParams
+shoppinglist_cache = ShoppingListCache[ShoppinglistRetrieveResponse](maxsize=256)
+
+
+def _parsed_ingredient(ingredient: dict[str, Any]) -> ParsedIngredient:
+    if ingredient["parsed_name"] is None:
+        # not backfilled yet
+        return parse_ingredient_fields(
+            quantity=ingredient["quantity"], name=ingredient["name"]
+        )
+    return ParsedIngredient(
+        name=ingredient["parsed_name"],
+        singular_name=ingredient["parsed_singular_name"],
+        unit=Unit(ingredient["parsed_unit"]),
+        quantity=Fraction(
+            ingredient["parsed_quantity_numerator"],
+            ingredient["parsed_quantity_denominator"],
+        ),
+        unknown_unit=ingredient["parsed_unknown_unit"],
+        base_unit=BaseUnit(ingredient["parsed_base_unit"]),
+        base_quantity=Fraction(
+            ingredient["parsed_base_quantity_numerator"],
+            ingredient["parsed_base_quantity_denominator"],
+        ),
+        category=ingredient["parsed_category"],
+    )
+
+
+def compute_shoppinglist_python(
+    *, params: ShoppinglistRetrieveParams, team_id: int
 ) -> ShoppinglistRetrieveResponse:
-    team_id = get_team(request.user).id
-    scheduled_recipes = get_scheduled_recipes(params=params, team_id=team_id)
-    if scheduled_recipes is None:
-        raise APIError(code="invalid_params", message="Couldn't find scheduled recipes")
+    """
+    Fetch every ingredient and combine them in Python.
+    """
     recipes = dict[int, ShoppingListRecipe]()
-    db_ingredients: list[DBIngredient] = []
-    for scheduled_recipe in scheduled_recipes:
-        db_ingredients += scheduled_recipe.recipe.ingredient_set.all()
-        recipes[scheduled_recipe.recipe.id] = ShoppingListRecipe(
-            scheduledRecipeId=scheduled_recipe.id,
-            recipeId=scheduled_recipe.recipe.id,
-            recipeName=scheduled_recipe.recipe.name,
+    ingredients: list[ParsedIngredient] = []
+    for scheduled_recipe in get_scheduled_recipes(params=params, team_id=team_id):
+        ingredients += (_parsed_ingredient(i) for i in scheduled_recipe["ingredients"])
+        recipes[scheduled_recipe["recipe_id"]] = ShoppingListRecipe(
+            scheduledRecipeId=scheduled_recipe["scheduled_recipe_id"],
+            recipeId=scheduled_recipe["recipe_id"],
+            recipeName=scheduled_recipe["recipe_name"],
         )
 
-    ingredients = [
-        Ingredient(quantity=i.quantity, name=i.name, description=i.description)
-        for i in db_ingredients
-    ]
-
+    # the combined names are always one of the ingredient's normalized names
+    categories = {ingredient.name: ingredient.category for ingredient in ingredients}
     ingredient_mapping: dict[str, IngredientResponse] = {}
-    for ingredient, quantities in combine_ingredients(ingredients).items():
+    for ingredient, quantities in combine_parsed_ingredients(ingredients).items():
         ingredient_mapping[ingredient] = {
             "quantities": [
                 {
@@ -93,9 +165,224 @@ def shoppinglist_retrieve_view(
                 }
                 for q in quantities
             ],
-            "category": category(ingredient),
+            "category": categories[ingredient],
         }
 
-    ShoppingList.objects.create(ingredients=json_dumps(ingredient_mapping).decode())
+    return {"ingredients": ingredient_mapping, "recipes": list(recipes.values())}
+
+
+def get_combined_ingredients(
+    *, params: ShoppinglistRetrieveParams, team_id: int
+) -> dict[str, Any]:
+    """
+    Sum the scheduled recipes' ingredients in the database using their parsed
+    fields, grouped like `combine_ingredients`.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+with scheduled_recipe as (
+  select scheduled_recipe.id, scheduled_recipe.recipe_id, scheduled_recipe."on"
+  from core_scheduledrecipe scheduled_recipe
+  where
+    scheduled_recipe.team_id = %(team_id)s
+    and scheduled_recipe."on" >= %(start)s::date
+    and scheduled_recipe."on" <= %(end)s::date
+),
+ingredient as (
+  select
+    row_number() over (
+      order by scheduled_recipe."on" desc, scheduled_recipe.id, core_ingredient.position
+    ) ordinal,
+    parsed_name,
+    parsed_singular_name,
+    parsed_unit,
+    parsed_unknown_unit,
+    parsed_base_unit,
+    parsed_category,
+    -- numeric division rounds to ~20 significant digits unless the dividend
+    -- has a larger scale
+    parsed_quantity_numerator::numeric(200, 80)
+      / parsed_quantity_denominator quantity,
+    parsed_base_quantity_numerator::numeric(200, 80)
+      / parsed_base_quantity_denominator base_quantity
+  from scheduled_recipe
+  join core_ingredient on core_ingredient.recipe_id = scheduled_recipe.recipe_id
+),
+grouped as materialized (
+  select
+    parsed_singular_name,
+    parsed_base_unit,
+    -- every unknown unit is its own base unit
+    case when parsed_base_unit = 'UNKNOWN' then parsed_unknown_unit end unknown_unit,
+    min(ordinal) ordinal,
+    count(distinct parsed_unit) unit_count,
+    sum(quantity) quantity,
+    sum(base_quantity) base_quantity,
+    -- mixed units are summed in the smallest one
+    (array_agg(parsed_unit order by base_quantity / quantity, ordinal))[1] unit
+  from ingredient
+  where parsed_singular_name is not null
+  group by 1, 2, 3
+),
+-- materialized so the join doesn't re-aggregate for every group
+display as materialized (
+  select
+    parsed_singular_name,
+    min(ordinal) ordinal,
+    -- use the most recent plural name, if there is one
+    (
+      array_agg(parsed_name order by ordinal desc)
+      filter (where parsed_name != parsed_singular_name)
+    )[1] plural_name,
+    coalesce(
+      (
+        array_agg(parsed_category order by ordinal desc)
+        filter (where parsed_name != parsed_singular_name)
+      )[1],
+      (array_agg(parsed_category order by ordinal))[1]
+    ) category
+  from ingredient
+  where parsed_singular_name is not null
+  group by 1
+)
+select
+  json_object(
+    'unparsed': exists (
+      select 1 from ingredient where parsed_singular_name is null
+    ),
+    'recipes': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'scheduled_recipe_id': scheduled_recipe.id,
+            'recipe_id': recipe.id,
+            'recipe_name': recipe.name
+          )
+          order by scheduled_recipe."on" desc, scheduled_recipe.id
+        ),
+        '[]'::json
+      )
+      from scheduled_recipe
+      join core_recipe recipe on recipe.id = scheduled_recipe.recipe_id
+    ),
+    'ingredients': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'name': coalesce(display.plural_name, grouped.parsed_singular_name),
+            'category': display.category,
+            'unit': grouped.unit,
+            'unknown_unit': grouped.unknown_unit,
+            'unit_count': grouped.unit_count,
+            -- as text so we don't lose any precision to floats
+            'quantity': grouped.quantity::text,
+            'base_quantity': grouped.base_quantity::text
+          )
+          order by display.ordinal, grouped.ordinal
+        ),
+        '[]'::json
+      )
+      from grouped
+      join display using (parsed_singular_name)
+    )
+  )
+""",
+            {
+                "team_id": team_id,
+                "start": params.start.isoformat(),
+                "end": params.end.isoformat(),
+            },
+        )
+        row = cursor.fetchone()
+        assert row is not None, "json_object always returns a row"
+        return cast(dict[str, Any], row[0])
+
+
+def compute_shoppinglist_sql(
+    *, params: ShoppinglistRetrieveParams, team_id: int
+) -> ShoppinglistRetrieveResponse:
+    """
+    Sum the ingredients in the database, so we only fetch one row per
+    ingredient & unit.
+    """
+    res = get_combined_ingredients(params=params, team_id=team_id)
+    if res["unparsed"]:
+        # we can only sum ingredients in the database once they're backfilled
+        logger.info("shoppinglist has unparsed ingredients", team_id=team_id)
+        return compute_shoppinglist_python(params=params, team_id=team_id)
+
+    recipes = dict[int, ShoppingListRecipe]()
+    for scheduled_recipe in res["recipes"]:
+        recipes[scheduled_recipe["recipe_id"]] = ShoppingListRecipe(
+            scheduledRecipeId=scheduled_recipe["scheduled_recipe_id"],
+            recipeId=scheduled_recipe["recipe_id"],
+            recipeName=scheduled_recipe["recipe_name"],
+        )
+
+    ingredient_mapping: dict[str, IngredientResponse] = {}
+    for ingredient in res["ingredients"]:
+        unit = Unit(ingredient["unit"])
+        # unary plus rounds to the context's precision, like summing in Python
+        if ingredient["unit_count"] == 1:
+            quantity = +Decimal(ingredient["quantity"])
+        else:
+            unit_lookup = _VOLUME if unit in _VOLUME else _MASS
+            quantity = Decimal(ingredient["base_quantity"]) / unit_lookup[unit]
+        ingredient_mapping.setdefault(
+            ingredient["name"],
+            {"quantities": [], "category": ingredient["category"]},
+        )["quantities"].append(
+            {
+                "quantity": fmt_decimal(quantity),
+                "unit": unit,
+                "unknown_unit": ingredient["unknown_unit"],
+            }
+        )
 
     return {"ingredients": ingredient_mapping, "recipes": list(recipes.values())}
+
+
+def compute_shoppinglist(
+    *, params: ShoppinglistRetrieveParams, team_id: int
+) -> ShoppinglistRetrieveResponse:
+    if config.SHOPPINGLIST_ENGINE == "sql":
+        return compute_shoppinglist_sql(params=params, team_id=team_id)
+    return compute_shoppinglist_python(params=params, team_id=team_id)
+
+
+@endpoint(query_budget=5)
+def shoppinglist_retrieve_view(
+    request: AuthedHttpRequest, params: ShoppinglistRetrieveParams
+) -> ShoppinglistRetrieveResponse:
+    team = get_team(request.user)
+    lookup = shoppinglist_cache.get(
+        team_id=team.id,
+        start=params.start,
+        end=params.end,
+        version=team.shoppinglist_version,
+    )
+    info = shoppinglist_cache.info()
+    logger.info(
+        "shoppinglist cache lookup",
+        team_id=team.id,
+        hit=lookup.value is not None,
+        hits=info.hits,
+        misses=info.misses,
+        size=info.currsize,
+    )
+    if lookup.value is not None:
+        return lookup.value
+
+    res = compute_shoppinglist(params=params, team_id=team.id)
+    # we only need a record of a shoppinglist when it changes
+    if lookup.stale is None or lookup.stale["ingredients"] != res["ingredients"]:
+        ShoppingList.objects.create(ingredients=json_dumps(res["ingredients"]).decode())
+    shoppinglist_cache.set(
+        team_id=team.id,
+        start=params.start,
+        end=params.end,
+        version=team.shoppinglist_version,
+        value=res,
+    )
+    return res
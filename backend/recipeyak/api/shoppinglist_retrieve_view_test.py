@@ -1,17 +1,30 @@
+import csv
 import json
 from datetime import date, timedelta
 from decimal import Decimal
+from pathlib import Path
 
 import pytest
+from django.db import connection
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from syrupy.assertion import SnapshotAssertion
 from syrupy.filters import props
 
+from recipeyak.api.base.json import json_dumps
+from recipeyak.api.shoppinglist_retrieve_view import (
+    ShoppinglistRetrieveParams,
+    compute_shoppinglist_python,
+    compute_shoppinglist_sql,
+    get_combined_ingredients,
+    shoppinglist_cache,
+)
 from recipeyak.combine import Ingredient as IngredientCumin
 from recipeyak.combine import (
     Quantity,
     combine_ingredients,
 )
+from recipeyak.combine_bench import _synthetic_ingredients
 from recipeyak.fixtures import (
     create_ingredient,
     create_recipe,
@@ -413,3 +426,202 @@ def test_shoppinglist_rounding_edge_cases(snapshot: SnapshotAssertion) -> None:
     assert res.status_code == 200
     rendered_quantity = res.json()
     assert rendered_quantity == snapshot(exclude=props("recipeId", "scheduledRecipeId"))
+
+
+@pytest.mark.parametrize("scheduled_count", [0, 1, 5, 20])
+def test_shoppinglist_query_count(scheduled_count: int) -> None:
+    """
+    The number of queries shouldn't grow with the number of scheduled recipes.
+    """
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    start = date(1976, 7, 6)
+    for i in range(scheduled_count):
+        recipe = create_recipe(team=team, user=user)
+        recipe.schedule(on=start + timedelta(days=i % 3), team=team, user=user)
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get(
+            "/api/v1/shoppinglist/", {"start": start, "end": start + timedelta(days=3)}
+        )
+    assert res.status_code == 200
+    # session, user, team, scheduled recipes & ingredients, shopping list
+    # insert, and 3 for the session middleware updating the session
+    assert len(queries) == 8
+    assert len(res.json()["recipes"]) == scheduled_count
+
+
+def test_shoppinglist_cache(
+    client: Client, user: User, team: Team, recipe: Recipe
+) -> None:
+    """
+    Reopening a shopping list shouldn't recompute it until something it
+    depends on changes, and we only record a shopping list when it changes.
+    """
+    shoppinglist_cache.clear()
+    client.force_login(user)
+    start = date(1976, 7, 6)
+    params = {"start": start, "end": start + timedelta(days=1)}
+    recipe.schedule(user=user, on=start, team=team)
+
+    res = client.get("/api/v1/shoppinglist/", params)
+    assert res.status_code == 200
+    first = res.json()
+    assert ShoppingList.objects.count() == 1
+
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get("/api/v1/shoppinglist/", params)
+    assert res.status_code == 200
+    assert res.json() == first
+    assert not any(
+        "core_scheduledrecipe" in q["sql"] for q in queries.captured_queries
+    ), "cache hit shouldn't query the scheduled recipes"
+    assert ShoppingList.objects.count() == 1
+    info = shoppinglist_cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    # a different range is a different entry
+    res = client.get(
+        "/api/v1/shoppinglist/", {"start": start, "end": start + timedelta(days=2)}
+    )
+    assert res.status_code == 200
+    assert shoppinglist_cache.info().currsize == 2
+
+    # updating an ingredient invalidates the cached list
+    ingredient = recipe.ingredient_set.get(name="egg")
+    res = client.patch(
+        f"/api/v1/ingredients/{ingredient.id}/",
+        {"quantity": "3 pounds"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    res = client.get("/api/v1/shoppinglist/", params)
+    assert res.status_code == 200
+    assert res.json()["ingredients"]["egg"]["quantities"] == [
+        {"quantity": "3", "unit": "POUND", "unknown_unit": None}
+    ]
+    assert ShoppingList.objects.count() == 3
+
+    # a write that doesn't change the result recomputes, but doesn't record
+    # another shopping list
+    res = client.patch(
+        f"/api/v1/ingredients/{ingredient.id}/",
+        {"position": "zzz"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    res = client.get("/api/v1/shoppinglist/", params)
+    assert res.status_code == 200
+    assert ShoppingList.objects.count() == 3
+    info = shoppinglist_cache.info()
+    assert (info.hits, info.misses) == (1, 4)
+
+    # unscheduling the recipe invalidates the cached list
+    scheduled_recipe = recipe.scheduledrecipe_set.get()
+    res = client.delete(f"/api/v1/calendar/{scheduled_recipe.id}/")
+    assert res.status_code == 204
+    res = client.get("/api/v1/shoppinglist/", params)
+    assert res.status_code == 200
+    assert res.json()["ingredients"] == {}
+
+
+def test_shoppinglist_parsed_columns(
+    client: Client, user: User, team: Team, recipe: Recipe
+) -> None:
+    """
+    Ingredients with parsed columns should give the same shopping list as
+    those we still have to parse.
+    """
+    create_ingredient(
+        recipe=recipe, quantity="1 1/3 cups", name="Green-Onions", position="x"
+    )
+    create_ingredient(recipe=recipe, quantity="2 bags", name="spinach", position="y")
+    client.force_login(user)
+    start = date(1976, 7, 6)
+    params = {"start": start, "end": start + timedelta(days=1)}
+    recipe.schedule(user=user, on=start, team=team)
+
+    res = client.get("/api/v1/shoppinglist/", params)
+    assert res.status_code == 200
+    unparsed = res.json()
+
+    for ingredient in recipe.ingredient_set.all():
+        assert ingredient.parsed_name is None
+        ingredient.update_parsed_fields()
+        ingredient.save()
+    team.invalidate_shoppinglists()
+
+    res = client.get("/api/v1/shoppinglist/", params)
+    assert res.status_code == 200
+    assert res.json() == unparsed
+
+
+def test_ingredient_writes_parse_fields(
+    client: Client, user: User, recipe: Recipe
+) -> None:
+    client.force_login(user)
+    res = client.post(
+        f"/api/v1/recipes/{recipe.id}/ingredients/",
+        {"quantity": "2 tbs", "name": "Soy-Sauce", "description": "", "position": "z"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    ingredient = Ingredient.objects.get(id=res.json()["id"])
+    assert ingredient.parsed_name == "soy sauce"
+    assert ingredient.parsed_unit == "TABLESPOON"
+    assert ingredient.parsed_category == "condiments"
+
+    res = client.patch(
+        f"/api/v1/ingredients/{ingredient.id}/",
+        {"quantity": "1 cup", "name": "rice"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    ingredient.refresh_from_db()
+    assert ingredient.parsed_name == "rice"
+    assert ingredient.parsed_unit == "CUP"
+    assert ingredient.parsed_quantity_numerator == 1
+    assert ingredient.parsed_quantity_denominator == 1
+
+
+def test_shoppinglist_sql_engine_matches_python(user: User, team: Team) -> None:
+    """
+    Summing in the database should give the same shopping list as summing in
+    Python.
+    """
+    with (Path() / "ingredients.csv").open() as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    start = date(1976, 7, 6)
+    for day in range(5):
+        recipe = create_recipe(team=team, user=user)
+        ingredients = [
+            Ingredient(
+                recipe=recipe,
+                quantity=ingredient.quantity,
+                name=ingredient.name,
+                position=str(position),
+            )
+            for position, ingredient in enumerate(
+                _synthetic_ingredients(names=names, size=200, seed=day)
+            )
+        ]
+        for ingredient in ingredients:
+            ingredient.update_parsed_fields()
+        Ingredient.objects.bulk_create(ingredients)
+        recipe.schedule(on=start + timedelta(days=day % 3), team=team, user=user)
+        recipe.schedule(on=start + timedelta(days=day), team=team, user=user)
+    params = ShoppinglistRetrieveParams(start=start, end=start + timedelta(days=4))
+    assert get_combined_ingredients(params=params, team_id=team.id)["unparsed"]
+    # the fixture's ingredients
+    for ingredient in Ingredient.objects.filter(parsed_name=None):
+        ingredient.update_parsed_fields()
+        ingredient.save()
+    assert not get_combined_ingredients(params=params, team_id=team.id)["unparsed"]
+
+    python = compute_shoppinglist_python(params=params, team_id=team.id)
+    sql = compute_shoppinglist_sql(params=params, team_id=team.id)
+
+    assert len(python["ingredients"]) > 100
+    assert json_dumps(sql) == json_dumps(python)
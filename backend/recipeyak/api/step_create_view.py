@@ -11,8 +11,8 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.serializers.recipe import StepSerializer, serialize_step
 from recipeyak.models import ChangeType, RecipeChange, Step, filter_recipes, get_team
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class StepCreateParams(Params):
@@ -21,7 +21,8 @@ class StepCreateParams(Params):
     recipe_id: int
 
 
-@endpoint()
+# most of these are snapshotting the recipe for its version
+@endpoint(query_budget=20)
 def step_create_view(
     request: AuthedHttpRequest, params: StepCreateParams
 ) -> StepSerializer:
@@ -29,6 +30,7 @@ def step_create_view(
     recipe = get_object_or_404(filter_recipes(team=team), pk=params.recipe_id)
 
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=params.recipe_id, actor=request.user)
         step = Step.objects.create(
             text=params.text, recipe=recipe, position=params.position
         )
@@ -39,7 +41,12 @@ def step_create_view(
             after=params.text,
             change_type=ChangeType.STEP_CREATE,
         )
-        save_recipe_version(recipe_id=params.recipe_id, actor=request.user)
+        enqueue_recipe_version(recipe_id=params.recipe_id, actor=request.user)
 
-    publish_recipe(recipe_id=recipe.id, team_id=recipe.team_id)
-    return serialize_step(step)
+        res = serialize_step(step)
+        publish_recipe(
+            recipe_id=recipe.id,
+            team_id=recipe.team_id,
+            patch=RecipePatch(kind="step", op="upsert", id=res.id, value=res),
+        )
+    return res
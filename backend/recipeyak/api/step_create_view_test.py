@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from itertools import count
 from typing import Any
 
 import pytest
@@ -90,3 +92,22 @@ def test_position_constraint(recipe: Recipe) -> None:
     Step.objects.create(recipe=recipe, position=100, text="alpha")
     with pytest.raises(IntegrityError):
         Step.objects.create(recipe=recipe, position=100, text="bravo")
+
+
+def test_step_create_query_count(
+    client: Client,
+    user: User,
+    recipe: Recipe,
+    assert_queries_dont_grow: Callable[..., None],
+) -> None:
+    client.force_login(user)
+    positions = count()
+
+    assert_queries_dont_grow(
+        lambda: client.post(
+            f"/api/v1/recipes/{recipe.id}/steps/",
+            {"text": "a step", "position": f"z{next(positions)}"},
+            content_type="application/json",
+        ),
+        recipes=[recipe],
+    )
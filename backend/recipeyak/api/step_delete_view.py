@@ -7,8 +7,8 @@ from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.models import ChangeType, RecipeChange, filter_steps, get_team
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class StepDeleteParams(Params):
@@ -21,6 +21,7 @@ def step_delete_view(request: AuthedHttpRequest, params: StepDeleteParams) -> No
     step = get_object_or_404(filter_steps(team=team), pk=params.step_id)
     recipe = step.recipe
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=recipe.id, actor=request.user)
         RecipeChange.objects.create(
             recipe=step.recipe,
             actor=request.user,
@@ -29,5 +30,9 @@ def step_delete_view(request: AuthedHttpRequest, params: StepDeleteParams) -> No
             change_type=ChangeType.STEP_DELETE,
         )
         step.delete()
-        save_recipe_version(recipe_id=recipe.id, actor=request.user)
-    publish_recipe(recipe_id=recipe.id, team_id=recipe.team_id)
+        enqueue_recipe_version(recipe_id=recipe.id, actor=request.user)
+        publish_recipe(
+            recipe_id=recipe.id,
+            team_id=recipe.team_id,
+            patch=RecipePatch(kind="step", op="delete", id=params.step_id),
+        )
@@ -11,8 +11,8 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.serializers.recipe import StepSerializer, serialize_step
 from recipeyak.models import ChangeType, RecipeChange, filter_steps, get_team
-from recipeyak.realtime import publish_recipe
-from recipeyak.versioning import save_recipe_version
+from recipeyak.realtime import RecipePatch, publish_recipe
+from recipeyak.versioning import enqueue_recipe_version, flush_queued_recipe_version
 
 
 class StepUpdateParams(Params):
@@ -29,6 +29,7 @@ def step_update_view(
     team = get_team(request.user)
     step = get_object_or_404(filter_steps(team=team), pk=params.step_id)
     with transaction.atomic():
+        flush_queued_recipe_version(recipe_id=step.recipe_id, actor=request.user)
         before_text = step.text
         if params.text is not None:
             step.text = params.text
@@ -43,8 +44,13 @@ def step_update_view(
             after=step.text,
             change_type=ChangeType.STEP_UPDATE,
         )
-        save_recipe_version(recipe_id=step.recipe_id, actor=request.user)
+        enqueue_recipe_version(recipe_id=step.recipe_id, actor=request.user)
 
-    publish_recipe(recipe_id=step.recipe.id, team_id=step.recipe.team_id)
+        res = serialize_step(step)
+        publish_recipe(
+            recipe_id=step.recipe.id,
+            team_id=step.recipe.team_id,
+            patch=RecipePatch(kind="step", op="upsert", id=res.id, value=res),
+        )
 
-    return serialize_step(step)
+    return res
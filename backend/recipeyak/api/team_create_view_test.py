@@ -1,6 +1,12 @@
+from datetime import timedelta
+from typing import Any
+
 import pytest
+from django.db.models import F
+from django.shortcuts import get_object_or_404
 from django.test.client import Client
 
+from recipeyak.api import team_update_view
 from recipeyak.models import Invite, Membership, Team, User
 
 pytestmark = pytest.mark.django_db
@@ -62,6 +68,40 @@ def test_updating_team_name(
     assert res.status_code == 403, "non-admin cannot update team"
 
 
+def test_updating_team_name_keeps_versions(
+    client: Client, team: Team, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    A schedule change while we rename the team shouldn't have its versions
+    overwritten with the ones we loaded, they key the shopping list & calendar
+    caches.
+    """
+
+    def load_then_change_schedule(*args: Any, **kwargs: Any) -> Team:
+        loaded: Team = get_object_or_404(*args, **kwargs)
+        loaded.invalidate_shoppinglists()
+        Team.objects.filter(id=loaded.id).update(
+            schedule_modified=F("schedule_modified") + timedelta(seconds=1)
+        )
+        return loaded
+
+    monkeypatch.setattr(
+        team_update_view, "get_object_or_404", load_then_change_schedule
+    )
+    before = Team.objects.get(id=team.id)
+    client.force_login(user)
+    res = client.patch(
+        f"/api/v1/t/{team.pk}/",
+        {"name": before.name},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+
+    after = Team.objects.get(id=team.id)
+    assert after.shoppinglist_version == before.shoppinglist_version + 1
+    assert after.schedule_modified == before.schedule_modified + timedelta(seconds=1)
+
+
 def test_deleting_team(
     client: Client,
     team: Team,
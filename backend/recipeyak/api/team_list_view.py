@@ -16,7 +16,7 @@ class TeamListItem(BaseModel):
     members: int
 
 
-@endpoint()
+@endpoint(query_budget=3)
 def team_list_view(request: AuthedHttpRequest, params: None) -> list[TeamListItem]:
     with connection.cursor() as cursor:
         cursor.execute(
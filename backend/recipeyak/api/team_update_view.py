@@ -35,7 +35,7 @@ def team_update_view(
 
     with transaction.atomic():
         team.name = params.name
-        team.save()
+        team.save(update_fields=["name", "modified"])
         team.force_join_admin(request.user)
 
     return TeamUpdateResponse(id=team.id, name=team.name)
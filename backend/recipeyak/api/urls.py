@@ -1,6 +1,7 @@
 from recipeyak.api.ably_retrieve_view import ably_retrieve_view
 from recipeyak.api.algolia_retrieve_view import algolia_retrieve_view
 from recipeyak.api.base.router import create_urlpatterns, route
+from recipeyak.api.calendar_days_list_view import calendar_days_list_view
 from recipeyak.api.calendar_delete_view import calendar_delete_view
 from recipeyak.api.calendar_generate_link_view import calendar_generate_link_view
 from recipeyak.api.calendar_list_view import calendar_list_view
@@ -23,6 +24,7 @@ from recipeyak.api.invite_list_view import invite_list_view
 from recipeyak.api.member_delete_view import member_delete_view
 from recipeyak.api.member_list_view import member_list_view
 from recipeyak.api.member_update_view import member_update_view
+from recipeyak.api.metrics_retrieve_view import metrics_retrieve_view
 from recipeyak.api.note_create_view import note_create_view
 from recipeyak.api.note_delete_view import note_delete_view
 from recipeyak.api.note_update_view import note_update_view
@@ -38,6 +40,11 @@ from recipeyak.api.recipe_recently_viewed_view import recipe_recently_viewed_vie
 from recipeyak.api.recipe_retrieve_view import recipe_retrieve_view
 from recipeyak.api.recipe_timeline_view import recipe_timeline_view
 from recipeyak.api.recipe_update_view import recipe_update_view
+from recipeyak.api.recipe_version_retrieve_view import recipe_version_retrieve_view
+from recipeyak.api.recipe_versions_list_view import recipe_versions_list_view
+from recipeyak.api.scheduled_recipe_bulk_create_view import (
+    scheduled_recipe_bulk_create_view,
+)
 from recipeyak.api.scheduled_recipe_create_view import scheduled_recipe_create_view
 from recipeyak.api.section_create_view import section_create_view
 from recipeyak.api.section_delete_view import section_delete_view
@@ -271,6 +278,16 @@ routes = [
         method="get",
         view=recipe_timeline_view,
     ),
+    route(
+        "api/v1/recipes/<int:recipe_id>/versions/",
+        method="get",
+        view=recipe_versions_list_view,
+    ),
+    route(
+        "api/v1/recipes/<int:recipe_id>/versions/<int:version_id>/",
+        method="get",
+        view=recipe_version_retrieve_view,
+    ),
     route(
         "api/v1/recipes/recently_viewed",
         method="get",
@@ -316,6 +333,16 @@ routes = [
         method="post",
         view=scheduled_recipe_create_view,
     ),
+    route(
+        "api/v1/calendar/bulk/",
+        method="post",
+        view=scheduled_recipe_bulk_create_view,
+    ),
+    route(
+        "api/v1/calendar/days/",
+        method="get",
+        view=calendar_days_list_view,
+    ),
     route(
         "api/v1/calendar/settings/",
         method="get",
@@ -391,6 +418,11 @@ routes = [
         method=("get", "head"),
         view=ical_retrieve_view,
     ),
+    route(
+        "metrics",
+        method=("get", "head"),
+        view=metrics_retrieve_view,
+    ),
     route(
         r"^api/v1/bot-recipes/(?P<recipe_id>[0-9]+)(-.*)?$",
         method="get",
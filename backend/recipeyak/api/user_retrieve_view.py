@@ -43,6 +43,6 @@ def serialize_user(user: User) -> UserSerializer:
     )
 
 
-@endpoint()
+@endpoint(query_budget=2)
 def user_retrieve_view(request: AuthedHttpRequest, params: None) -> UserSerializer:
     return serialize_user(request.user)
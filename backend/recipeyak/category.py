@@ -1,526 +1,110 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
 from functools import cache
-from typing import Any
 
-from recipeyak.inflect import singularize
+from recipeyak.departments import DEPARTMENT_MAPPING
+from recipeyak.inflection import singularize
 
-_DEPARTMENT_MAPPING = {
-    "alcohol": {
-        "wine",
-        "beer",
-        "rum",
-        "vodka",
-        "vermouth",
-        "amaretto",
-        "mirin",
-        "bourbon",
-        "brandy",
-        "scotch",
-        "cognac",
-        "sherry",
-        "guinness",
-        "stout",
-        "madeira",
-        "marsala",
-    },
-    "produce": {
-        "basil",
-        "coconut",
-        "blueberries",
-        "blackberries",
-        "raspberries",
-        "chile",
-        "chili",
-        "lemongrass",
-        "eggplant",
-        "cubanelle peppers",
-        "plum",
-        "apricots",
-        "sage",
-        "tarragon",
-        "yamaimo",
-        "romaine",
-        "habanero chile",
-        "snow pea",
-        "spring mix",
-        "dates",
-        "prunes",
-        "corn",
-        "tomatillos",
-        "salad",
-        "pico de gallo",
-        "peas",
-        "bean sprouts",
-        "passion fruit",
-        "mushroom",
-        "herbs",
-        "butternut squash",
-        "pasilla chilies",
-        "mulato chiles",
-        "haricot verts",
-        "haricots verts",
-        "greens",
-        "pomegranate",
-        "edamame",
-        "rhubarb",
-        "zucchini",
-        "watermelon",
-        "brussel sprouts",
-        "brussels sprouts",
-        "brusel sprouts",
-        "dill",
-        "beets",
-        "broccoli",
-        "berries",
-        "leeks",
-        "guacamole",
-        "ancho chiles",
-        "chipotle chiles",
-        "pequin chile",
-        "cascabel chile",
-        "arbor chile",
-        "chile negro",
-        "chile ancho",
-        "cauliflower",
-        "fennel",
-        "cranberries",
-        "scallion",
-        "bok choy",
-        "turnip",
-        "red chili",
-        "tofu",
-        "potato",
-        "pear",
-        "strawberries",
-        "strawberris",
-        "strawberry",
-        "grapefruit",
-        "serrano chile",
-        "thai chile",
-        "green chillies",
-        "green chiles",
-        "bird eye chillies",
-        "carrot",
-        "chive",
-        "avocado",
-        "watercress",
-        "cabbage",
-        "scallions",
-        "lime",
-        "thyme",
-        "radish",
-        "lemon",
-        "tomato",
-        "cherry",
-        "grape",
-        "lettuce",
-        "shallot",
-        "rosemary",
-        "apple",
-        "pineapple",
-        "banana",
-        "kale",
-        "cilantro",
-        "asparagus",
-        "spinach",
-        "orange",
-        "arugula",
-        "jalapeno",
-        "jalapeño",
-        "bell pepper",
-        "poblano pepper",
-        "fresno pepper",
-        "onion",
-        "parsley",
-        "parsely",
-        "mint",
-        "garlic",
-        "cloves garlic",
-        "ginger",
-        "clementine",
-        "celery",
-        "oregano",
-        "cucumber",
-    },
-    "meat": {
-        "chicken",
-        "shrimp",
-        "mussels",
-        "beef",
-        "pepperoni",
-        "pork",
-        "bacon",
-        "sausage",
-        "salmon",
-        "kielbasa",
-        "merguez",
-        "chuck-eye roast",
-        "pancetta",
-        "oxtails",
-        "ham",
-        "chuck roast",
-        "round roast",
-        "bratwurst",
-        "steak",
-        "prawns",
-        "turkey",
-        "veal",
-        "sirloin",
-        "chorizo",
-        "short ribs",
-        "shortribs",
-        "lamb",
-        "fish",
-        "brisket",
-    },
-    "cheese": {
-        "cheese",
-        "cheddar",
-        "colby jack",
-        "provolone",
-        "queso fresco",
-        "pepper jack",
-        "parmigiano",
-        "mascarpone",
-        "fontina",
-        "pecorino",
-        "feta",
-        "parmesan",
-        "gruyère",
-        "gruyere",
-        "mozzarella",
-    },
-    "dairy": {
-        "egg",
-        "milk",
-        "buttermilk",
-        "cream",
-        "ricotta",
-        "yogurt",
-        "yoghurt",
-        "butter",
-        "half-and-half",
-        "creme",
-        "creme fraiche",
-        "crème fraîche",
-    },
-    "baking": {
-        "sugar",
-        "granulated",
-        "flour",
-        "chocolate",
-        "choclate",
-        "poppy seeds",
-        "molasses",
-        "lard",
-        "ghee",
-        "gee",
-        "cocoa",
-        "food coloring",
-        "cocoa powder",
-        "coca powder",
-        "baking soda",
-        "baking powder",
-        "vegetable shortening",
-        "malted milk powder",
-        "corn syrup",
-        "coconut sugar",
-    },
-    "frozen": {
-        "bag potstickers",
-        "potstickers",
-        "phyllo dough",
-        "phyllo pastry",
-        "puff pastry",
-        "pie dough",
-        "pie crust",
-        "pie shell",
-        "frozen gyoza",
-    },
-    "bread": {
-        "bread",
-        "panettone",
-        "pita",
-        "naan",
-        "bun",
-        "loaf",
-        "burger bun",
-        "buns",
-        "challah",
-        "brioche",
-        "rolls",
-        "baguette",
-        "tortillas",
-        "barley rusks",
-        "sub roll",
-        "english muffins",
-        "bagel",
-        "hot dog buns",
-        "pizza dough",
-    },
-    "canned & packaged": {
-        "anchovy",
-        "fruit preserves",
-        "chickpeas",
-        "beans",
-        "sardines",
-        "pumpkin puree",
-        "papaya paste",
-        "canned tomatoes",
-        "crushed tomatoes",
-        "can whole tomatoes",
-        "can whole peeled tomatoes",
-        "cans of diced tomatoes",
-        "can San Marzano tomatoes",
-        "pumpkin purée",
-        "marinara sauce",
-        "arrabbiata sauce",
-        "oyster sauce",
-        "tomato paste",
-        "tuna",
-        "anchovies",
-        "adobo",
-        "broth",
-        "chicken broth",
-        "stock",
-        "coconut milk",
-        "cream of coconut",
-        "chicken stock",
-        "beef stock",
-        "fish stock",
-        "vegetable stock",
-    },
-    # kind of the misc category
-    "condiments": {
-        "tamari",
-        "pesto",
-        "horseradish",
-        "peanut butter",
-        "almond butter",
-        "doubanjiang",
-        "fish sauce",
-        "gochujang",
-        "pickled jalapeno",
-        "salsa",
-        "chimichurri",
-        "pickle",
-        "pizza sauce",
-        "aioli",
-        "mayo",
-        "mayonnaise",
-        "mango chutney",
-        "marshmallows",
-        "ketchup",
-        "ketcup",
-        "oil",
-        "olive oil",
-        "coconut oil",
-        "peanut oil",
-        "honey",
-        "dulce de leche",
-        "hot sauce",
-        "capers",
-        "vinegar",
-        "soy sauce",
-        "tamarind",
-        "tahini",
-        "tzatziki",
-        "sprinkles",
-        "sesame paste",
-        "mustard",
-        "seaweed",
-        "jam",
-        "maple syrup",
-        "marmite",
-        "sriracha",
-        "ya cai",
-        "yacai",
-        "curry paste",
-        "worcestershire sauce",
-        "bean paste",
-        "almond paste",
-        "agave nectar",
-        "olives",
-    },
-    "dry goods": {
-        "gingersnaps",
-        "pepitas",
-        "currants",
-        "powdered msg",
-        "graham cracker",
-        "tortilla chips",
-        "breadcrumbs",
-        "quinoa",
-        "raisins",
-        "matcha",
-        "masa harina",
-        "polenta",
-        "cornmeal",
-        "panko",
-        "orzo",
-        "oatmeal",
-        "oats",
-        "lentils",
-        "ladyfingers",
-        "nilla wafers",
-        "granola",
-        "fritos",
-        "bulgar",
-        "bulgur",
-        "millet",
-        "flax seed",
-        "coffee",
-        "espresso",
-        "chia",
-        "couscous",
-        "gelatin",
-        "amaranth",
-        "katsuobushi",
-        "ao nori",
-        "barley",
-        "farro",
-        "ramen",
-        "fettuccine",
-        "macaroni",
-        "fusilli",
-        "rotini",
-        "penne",
-        "rigatoni",
-        "yeast",
-        "rice",
-        "pasta",
-        "lasagna noodles",
-        "tapioca",
-        "cornstarch",
-        "noodles",
-        "spaghetti",
-        "pastina",
-        "split peas",
-    },
-    "spices": {
-        "asafetida",
-        "cinnamon",
-        "curry powder",
-        "sumac",
-        "peppercorns",
-        "za'atar",
-        "paprika",
-        "salt",
-        "furikake",
-        "caraway seeds",
-        "bati masala",
-        "masala",
-        "five-spice powder",
-        "mustard powder",
-        "garlic powder",
-        "allspice",
-        "onion powder",
-        "dried oregano",
-        "ground ginger",
-        "pepper",
-        "bay leaves",
-        "miso",
-        "cloves",
-        "fennel seed",
-        "ground clove",
-        "red chile flakes",
-        "chile flakes",
-        "chili flakes",
-        "chili powder",
-        "chilli powder",
-        "chile powder",
-        "cumin",
-        "coriander",
-        "corainder",
-        "vanilla",
-        "whole clove",
-        "nutmeg",
-        "turmeric",
-        "sesame seed",
-        "mustard seed",
-        "dried chilies",
-        "dried chiles",
-        "fenugreek",
-        "ground chiles",
-        "baharat",
-        "seasoning",
-        "star anise",
-        "marjoram",
-        "bay leaf",
-        "vanilla extract",
-        "lemon extract",
-        "almond extract",
-        "cardamom",
-        "cayenne",
-        "cream of tartar",
-        "garam masala",
-        "herbes de provence",
-        "saffron",
-        "niger seed",
-        "nigella seed",
-        "peperoncino flakes",
-    },
-    "nuts": {
-        "pecans",
-        "pecan",
-        "pine nuts",
-        "peanuts",
-        "walnut",
-        "almonds",
-        "nuts",
-        "cashews",
-        "pistachios",
-    },
-    "other": {
-        "cedar shakes",
-        "water",
-        "ice",
-        "gloves",
-        "skewers",
-    },
-}
+
+@dataclass(frozen=True, slots=True)
+class _Match:
+    category: str
+    # length of the ingredient in `DEPARTMENT_MAPPING`, longer matches win
+    length: int
+    words: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Automaton:
+    """
+    An Aho-Corasick automaton over the singularized words of each ingredient
+    in `DEPARTMENT_MAPPING`.
+    """
+
+    goto: list[dict[str, int]]
+    fail: list[int]
+    # every match ending at a state, including those reachable via `fail`
+    output: list[tuple[_Match, ...]]
 
 
 @cache
-def _create_trie() -> dict[str, Any]:
-    trie: dict[str, Any] = {}
-    for category, ingredients in _DEPARTMENT_MAPPING.items():
+def _create_automaton() -> _Automaton:
+    goto: list[dict[str, int]] = [{}]
+    matches: list[_Match | None] = [None]
+    for category, ingredients in DEPARTMENT_MAPPING.items():
         for ingredient in ingredients:
-            tree = trie
-            words = [singularize(x) for x in ingredient.replace("-", " ").split()]
-            for idx, word in enumerate(words):
-                if word in tree:
-                    tree = tree[word]
-                else:
-                    tree[word] = {}
-                    tree = tree[word]
-                is_last = idx == len(words) - 1
-                if is_last and "$" not in tree:
-                    tree["$"] = (category, len(ingredient))
+            words = ingredient.replace("-", " ").split()
+            state = 0
+            for word in words:
+                singular_word = singularize(word)
+                next_state = goto[state].get(singular_word)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][singular_word] = next_state
+                    goto.append({})
+                    matches.append(None)
+                state = next_state
+            # first ingredient wins when two singularize to the same words
+            if matches[state] is None:
+                matches[state] = _Match(
+                    category=category, length=len(ingredient), words=len(words)
+                )
 
-    return trie
+    fail = [0] * len(goto)
+    output: list[tuple[_Match, ...]] = [()] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        match = matches[state]
+        output[state] = (
+            (match, *output[fail[state]]) if match is not None else output[fail[state]]
+        )
+        for word, next_state in goto[state].items():
+            queue.append(next_state)
+            if state == 0:
+                continue
+            fallback = fail[state]
+            while fallback and word not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(word, 0)
 
+    return _Automaton(goto=goto, fail=fail, output=output)
 
-def _search(item: str) -> dict[str, set[int]]:
-    trie = _create_trie()
-    items = [singularize(x) for x in item.split()]
-    counts = defaultdict(set)
-    for start in range(len(items)):
-        tree = trie
-        for word in items[start:]:
-            if word not in tree:
-                break
-            tree = tree[word]
-            if "$" in tree:
-                cat, cnt = tree["$"]
-                counts[cat].add(cnt)
-    return counts
+
+def _search(item: str) -> str:
+    automaton = _create_automaton()
+    goto = automaton.goto
+    fail = automaton.fail
+    # category -> (longest match, first match position)
+    found = dict[str, tuple[int, tuple[int, int]]]()
+    state = 0
+    for end, word in enumerate(item.split()):
+        symbol = singularize(word)
+        while state and symbol not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(symbol, 0)
+        for match in automaton.output[state]:
+            position = (end - match.words + 1, end)
+            previous = found.get(match.category)
+            if previous is None:
+                found[match.category] = (match.length, position)
+            else:
+                found[match.category] = (
+                    max(previous[0], match.length),
+                    min(previous[1], position),
+                )
+    if not found:
+        return "unknown"
+    # prefer the longest match, breaking ties with whichever category matched
+    # first
+    return min(found, key=lambda cat: (-found[cat][0], found[cat][1]))
 
 
 def category(ingredient: str) -> str:
-    res = _search(
+    return _search(
         ingredient.lower()
         .replace("-", " ")
         .replace(",", "")
@@ -528,7 +112,13 @@ def category(ingredient: str) -> str:
         .replace("(", "")
         .replace("’", "'")  # noqa: RUF001
     )
-    if not res:
-        return "unknown"
 
-    return sorted(res.items(), key=lambda x: -max(x[1]))[0][0]
+
+def categorize_many(ingredients: Iterable[str]) -> dict[str, str]:
+    """
+    Categorize a batch of ingredients, like a shopping list, categorizing
+    each distinct name once.
+    """
+    return {
+        ingredient: category(ingredient) for ingredient in dict.fromkeys(ingredients)
+    }
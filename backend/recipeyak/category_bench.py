@@ -0,0 +1,107 @@
+# ruff: noqa: T201
+"""
+Benchmark for categorizing ingredients.
+
+    python -m recipeyak.category_bench --rounds 20
+"""
+
+import csv
+import time
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import typer
+
+from recipeyak.category import categorize_many, category
+from recipeyak.departments import DEPARTMENT_MAPPING
+from recipeyak.inflect import singularize
+
+
+@cache
+def _create_trie() -> dict[str, Any]:
+    trie: dict[str, Any] = {}
+    for category_, ingredients in DEPARTMENT_MAPPING.items():
+        for ingredient in ingredients:
+            tree = trie
+            words = [singularize(x) for x in ingredient.replace("-", " ").split()]
+            for idx, word in enumerate(words):
+                if word in tree:
+                    tree = tree[word]
+                else:
+                    tree[word] = {}
+                    tree = tree[word]
+                is_last = idx == len(words) - 1
+                if is_last and "$" not in tree:
+                    tree["$"] = (category_, len(ingredient))
+
+    return trie
+
+
+def _category_trie(ingredient: str) -> str:
+    """
+    The previous implementation, which walks the trie from every word.
+    """
+    trie = _create_trie()
+    items = [
+        singularize(x)
+        for x in ingredient.lower()
+        .replace("-", " ")
+        .replace(",", "")
+        .replace(")", "")
+        .replace("(", "")
+        .replace("’", "'")  # noqa: RUF001
+        .split()
+    ]
+    counts: defaultdict[str, set[int]] = defaultdict(set)
+    for start in range(len(items)):
+        tree = trie
+        for word in items[start:]:
+            if word not in tree:
+                break
+            tree = tree[word]
+            if "$" in tree:
+                cat, cnt = tree["$"]
+                counts[cat].add(cnt)
+    if not counts:
+        return "unknown"
+
+    return sorted(counts.items(), key=lambda x: -max(x[1]))[0][0]
+
+
+def _per_sec(
+    fn: Callable[[Sequence[str]], Any], items: Sequence[str], *, rounds: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(items)
+    return (len(items) * rounds) / (time.perf_counter() - start)
+
+
+def main(path: Path = Path("ingredients.csv"), rounds: int = 20) -> None:
+    """
+    Compare the automaton against the trie walk over the ingredient corpus.
+    """
+    with path.open() as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    print(f"corpus: path={path} rows={len(names)} rounds={rounds}")
+
+    # warm up the automaton & trie so we're only timing lookups
+    for name in names:
+        if category(name) != _category_trie(name):
+            raise SystemExit(f"category mismatch for {name!r}")
+
+    rate = _per_sec(lambda xs: [_category_trie(x) for x in xs], names, rounds=rounds)
+    print(f"trie: {rate:,.0f} ingredients/sec")
+    rate = _per_sec(lambda xs: [category(x) for x in xs], names, rounds=rounds)
+    print(f"automaton: {rate:,.0f} ingredients/sec")
+    # a shopping list has plenty of repeat ingredients
+    repeated = names * 4
+    rate = _per_sec(categorize_many, repeated, rounds=rounds)
+    print(f"categorize_many (4x repeats): {rate:,.0f} ingredients/sec")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -5,7 +5,9 @@ from textwrap import dedent
 
 from syrupy.assertion import SnapshotAssertion
 
-from recipeyak.category import _DEPARTMENT_MAPPING, category
+from recipeyak.category import categorize_many, category
+from recipeyak.category_bench import _category_trie
+from recipeyak.departments import DEPARTMENT_MAPPING
 
 
 def test_categorize_ingredients() -> None:
@@ -131,7 +133,7 @@ def test_categorize_ingredient_test_cases(snapshot: SnapshotAssertion) -> None:
 
 
 def test_no_overlap_between_categories() -> None:
-    mapping = {key: set(value) for key, value in _DEPARTMENT_MAPPING.items()}
+    mapping = {key: set(value) for key, value in DEPARTMENT_MAPPING.items()}
 
     for key, value in mapping.items():
         for other_key, other_value in mapping.items():
@@ -139,3 +141,15 @@ def test_no_overlap_between_categories() -> None:
                 continue
             overlap = value & other_value
             assert not overlap, f"{overlap} in {key} and {other_key}"
+
+
+def test_category_matches_trie() -> None:
+    """
+    The automaton should categorize exactly like walking the trie from every
+    word.
+    """
+    with (Path() / "ingredients.csv").open() as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    names += [x for ingredients in DEPARTMENT_MAPPING.values() for x in ingredients]
+
+    assert categorize_many(names) == {name: _category_trie(name) for name in names}
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 
-from recipeyak.inflect import singularize
-from recipeyak.parsing import BaseUnit, Quantity, parse_quantity
+from recipeyak.inflection import singularize
+from recipeyak.parsing import _MASS, _VOLUME, BaseUnit, Quantity, parse_quantity
 
 
 @dataclass(frozen=True, kw_only=True, slots=True)
@@ -19,40 +19,90 @@ def normalize_ingredient_name(*, name: str) -> str:
     return name.replace("-", " ").lower()
 
 
+def _sum_quantities(quantities: Sequence[Quantity]) -> Quantity:
+    """
+    Sum quantities that share a base unit in a single reduction.
+
+    Equivalent to folding them together with `Quantity.__add__`, including
+    where the rounding happens, but without allocating a `Quantity` and
+    converting to base units for every addition.
+    """
+    first, *rest = quantities
+    if not rest:
+        return first
+    if all(q.unit == first.unit for q in rest):
+        return Quantity(
+            quantity=sum((q.quantity for q in rest), first.quantity),
+            unit=first.unit,
+            unknown_unit=first.unknown_unit,
+        )
+
+    # Only mass & volume have more than one unit per base unit.
+    #
+    # Mixing units changes which unit we're accumulating in, which changes the
+    # rounding, so we still have to go in order.
+    unit_lookup = _VOLUME if first.unit in _VOLUME else _MASS
+    total = first.quantity
+    total_unit = first.unit
+    for q in rest:
+        if q.unit == total_unit:
+            total += q.quantity
+            continue
+        smallest_unit = total_unit if total_unit < q.unit else q.unit
+        total = (
+            unit_lookup[total_unit] * total + unit_lookup[q.unit] * q.quantity
+        ) / unit_lookup[smallest_unit]
+        total_unit = smallest_unit
+    return Quantity(quantity=total, unit=total_unit)
+
+
 def combine_ingredients(ingredients: Sequence[Ingredient]) -> dict[str, list[Quantity]]:
+    # many ingredients share a name, so only singularize each name once
+    singular_name = dict[str, str]()
+
+    def parse(ingr: Ingredient) -> tuple[str, str, Quantity]:
+        normalized_name = normalize_ingredient_name(name=ingr.name)
+        name = singular_name.get(normalized_name)
+        if name is None:
+            name = singular_name[normalized_name] = singularize(normalized_name)
+        return normalized_name, name, parse_quantity(ingr.quantity)
+
+    return combine_quantities(parse(ingr) for ingr in ingredients)
+
+
+def combine_quantities(
+    ingredients: Iterable[tuple[str, str, Quantity]],
+) -> dict[str, list[Quantity]]:
+    """
+    Combine already parsed ingredients, (normalized name, singular name,
+    quantity).
+
+    Group the quantities by name & base unit and then sum each group once,
+    rather than folding every ingredient into a running total.
+    """
     # being kind of dynamic with the types here so not the easiest on the eyes.
-    ingredient_map: dict[str, dict[BaseUnit | str | None, Quantity]] = defaultdict(dict)
+    ingredient_map: dict[str, dict[BaseUnit | str | None, list[Quantity]]] = (
+        defaultdict(dict)
+    )
 
     plural_name = dict[str, str]()
 
-    for ingr in ingredients:
-        normalized_name = normalize_ingredient_name(name=ingr.name)
-        quantity = parse_quantity(ingr.quantity)
+    for normalized_name, name, quantity in ingredients:
         base_unit = quantity.unit.base_unit()
-        name = singularize(normalized_name)
 
         # keep track of whether an ingredient should be plural
         if name != normalized_name:
             plural_name[name] = normalized_name
 
-        if base_unit == BaseUnit.UNKNOWN:
-            # For each Unit.UNKNOWN, we treat the unknown_unit, as a unique
-            # base value.
-            if quantity.unknown_unit not in ingredient_map[name]:
-                ingredient_map[name][quantity.unknown_unit] = quantity
-            else:
-                ingredient_map[name][quantity.unknown_unit] += quantity
-        elif name not in ingredient_map:
-            ingredient_map[name][base_unit] = quantity
-        else:
-            base_unit_quantity = ingredient_map[name].get(base_unit)
-            if base_unit_quantity is None:
-                ingredient_map[name][base_unit] = quantity
-            else:
-                ingredient_map[name][base_unit] = base_unit_quantity + quantity
+        # For each Unit.UNKNOWN, we treat the unknown_unit, as a unique
+        # base value.
+        group = quantity.unknown_unit if base_unit == BaseUnit.UNKNOWN else base_unit
+        ingredient_map[name].setdefault(group, []).append(quantity)
 
     output: dict[str, list[Quantity]] = defaultdict(list)
-    for ingre_name, unit_to_quantity in ingredient_map.items():
+    for ingre_name, group_to_quantities in ingredient_map.items():
         name = plural_name.get(ingre_name, ingre_name)
-        output[name] += unit_to_quantity.values()
+        output[name] += (
+            _sum_quantities(quantities) for quantities in group_to_quantities.values()
+        )
     return output
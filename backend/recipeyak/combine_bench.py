@@ -0,0 +1,151 @@
+# ruff: noqa: T201
+"""
+Benchmark for combining ingredients into a shopping list.
+
+    python -m recipeyak.combine_bench --size 5000 --size 50000
+"""
+
+import csv
+import random
+import time
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import typer
+
+from recipeyak.combine import Ingredient, combine_ingredients, normalize_ingredient_name
+from recipeyak.inflect import singularize
+from recipeyak.parsing import BaseUnit, Quantity, parse_quantity
+
+_QUANTITIES = [
+    "1",
+    "2",
+    "1/2",
+    "1 1/2",
+    "4-5",
+    "some",
+    "pinch",
+    "1 teaspoon",
+    "1/4 tsp",
+    "2 Tablespoons",
+    "1 Tablespoon + 1 teaspoon",
+    "1/3 cup",
+    "3/4 cup",
+    "2 cups",
+    "1 quart",
+    "500 ml",
+    "1 liter",
+    "4 ounces",
+    "1 lb",
+    "2 lbs",
+    "225 grams",
+    "1 kg",
+    "1 bag",
+    "2 cans",
+    "1 bunch",
+]
+
+
+def _combine_ingredients_fold(
+    ingredients: Sequence[Ingredient],
+) -> dict[str, list[Quantity]]:
+    """
+    The previous implementation, which folds one ingredient at a time with
+    `Quantity.__add__`.
+    """
+    ingredient_map: dict[str, dict[BaseUnit | str | None, Quantity]] = defaultdict(dict)
+
+    plural_name = dict[str, str]()
+
+    for ingr in ingredients:
+        normalized_name = normalize_ingredient_name(name=ingr.name)
+        quantity = parse_quantity(ingr.quantity)
+        base_unit = quantity.unit.base_unit()
+        name = singularize(normalized_name)
+
+        if name != normalized_name:
+            plural_name[name] = normalized_name
+
+        if base_unit == BaseUnit.UNKNOWN:
+            if quantity.unknown_unit not in ingredient_map[name]:
+                ingredient_map[name][quantity.unknown_unit] = quantity
+            else:
+                ingredient_map[name][quantity.unknown_unit] += quantity
+        elif name not in ingredient_map:
+            ingredient_map[name][base_unit] = quantity
+        else:
+            base_unit_quantity = ingredient_map[name].get(base_unit)
+            if base_unit_quantity is None:
+                ingredient_map[name][base_unit] = quantity
+            else:
+                ingredient_map[name][base_unit] = base_unit_quantity + quantity
+
+    output: dict[str, list[Quantity]] = defaultdict(list)
+    for ingre_name, unit_to_quantity in ingredient_map.items():
+        name = plural_name.get(ingre_name, ingre_name)
+        output[name] += unit_to_quantity.values()
+    return output
+
+
+def _synthetic_ingredients(
+    *, names: Sequence[str], size: int, seed: int
+) -> list[Ingredient]:
+    """
+    A team's worth of scheduled recipes, where popular ingredients show up
+    over and over.
+    """
+    rng = random.Random(seed)
+    # roughly the number of distinct ingredients across a few weeks of recipes
+    vocabulary = rng.sample(names, k=min(len(names), 300))
+    return [
+        Ingredient(
+            quantity=rng.choice(_QUANTITIES),
+            name=rng.choice(vocabulary),
+        )
+        for _ in range(size)
+    ]
+
+
+def _time(
+    fn: Callable[[Sequence[Ingredient]], dict[str, list[Quantity]]],
+    ingredients: Sequence[Ingredient],
+    *,
+    rounds: int,
+) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(ingredients)
+    return (time.perf_counter() - start) / rounds
+
+
+def main(
+    size: list[int] = [5_000, 10_000, 25_000, 50_000],  # noqa: B006
+    rounds: int = 3,
+    seed: int = 0,
+    path: Path = Path("ingredients.csv"),
+) -> None:
+    """
+    Compare combine_ingredients against the per-ingredient fold over synthetic
+    shopping lists.
+    """
+    with path.open() as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+
+    for n in size:
+        ingredients = _synthetic_ingredients(names=names, size=n, seed=seed)
+        fold = _combine_ingredients_fold(ingredients)
+        batch = combine_ingredients(ingredients)
+        if fold != batch:
+            raise SystemExit(f"output mismatch for size={n}")
+
+        fold_sec = _time(_combine_ingredients_fold, ingredients, rounds=rounds)
+        batch_sec = _time(combine_ingredients, ingredients, rounds=rounds)
+        print(
+            f"size={n:>6} fold={fold_sec * 1000:8.1f}ms batch={batch_sec * 1000:8.1f}ms "
+            f"speedup={fold_sec / batch_sec:5.1f}x names={len(batch)}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,5 +1,7 @@
+import csv
 from collections.abc import Sequence
 from decimal import Decimal
+from pathlib import Path
 
 import pytest
 
@@ -8,6 +10,7 @@ from recipeyak.combine import (
     Quantity,
     combine_ingredients,
 )
+from recipeyak.combine_bench import _combine_ingredients_fold, _synthetic_ingredients
 from recipeyak.parsing import Unit
 
 
@@ -49,3 +52,15 @@ def test_combining_ingredients(
     ingredients: Sequence[Ingredient], expected: dict[str, list[Quantity]]
 ) -> None:
     assert combine_ingredients(ingredients) == expected
+
+
+def test_combining_ingredients_matches_fold() -> None:
+    """
+    Summing by group should give the exact same result as folding each
+    ingredient with `Quantity.__add__`, including the rounding.
+    """
+    with (Path() / "ingredients.csv").open() as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    ingredients = _synthetic_ingredients(names=names, size=2_000, seed=0)
+
+    assert combine_ingredients(ingredients) == _combine_ingredients_fold(ingredients)
@@ -5,8 +5,25 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "")
 STORAGE_BUCKET_NAME = os.getenv("STORAGE_BUCKET_NAME", "")
 STORAGE_HOSTNAME = os.getenv("STORAGE_HOSTNAME", "")
 ABLY_API_KEY = os.getenv("ABLY_API_KEY", "SOME:KEY")
+# "ably" or "fake", where `recipeyak.realtime` publishes messages
+REALTIME_TRANSPORT = os.getenv("REALTIME_TRANSPORT", "ably")
+# "thread" or "outbox", how `recipeyak.realtime` hands off messages, "outbox"
+# needs `recipeyak.jobs.realtime_outbox_drain` running
+REALTIME_ENGINE = os.getenv("REALTIME_ENGINE", "thread")
 ALGOLIA_APPLICATION_ID = os.getenv("ALGOLIA_APPLICATION_ID", "")
 ALGOLIA_ADMIN_API_KEY = os.getenv("ALGOLIA_ADMIN_API_KEY", "")
 ALGOLIA_SEARCH_ONLY_API_KEY = os.getenv("ALGOLIA_SEARCH_ONLY_API_KEY", "")
 
+# "python" or "sql", where to sum shopping list ingredients
+SHOPPINGLIST_ENGINE = os.getenv("SHOPPINGLIST_ENGINE", "python")
+# "python" or "sql", how to build the recipe detail response
+RECIPE_DETAIL_ENGINE = os.getenv("RECIPE_DETAIL_ENGINE", "sql")
+
+# merge recipe versions saved within this many seconds of each other into one,
+# written by `recipeyak.jobs.recipe_version_sync`, 0 saves them in the request
+RECIPE_VERSION_COALESCE_SECONDS = int(os.getenv("RECIPE_VERSION_COALESCE_SECONDS", "0"))
+
+# bearer token Prometheus uses to scrape /metrics, disabled when empty
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 IMAGE_TRANSFORM_FORMAT = os.getenv("IMAGE_TRANSFORM_FORMAT", "twicpics")
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator, Sequence
 from datetime import date
 from unittest.mock import patch
+from uuid import uuid4
 
 import pytest
+from django.db import connection
+from django.http import HttpResponse
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 
 from recipeyak.models import (
     Ingredient,
@@ -200,10 +204,47 @@ def scheduled_recipe(recipe: Recipe, team: Team) -> ScheduledRecipe:
     return ScheduledRecipe.objects.create(recipe=recipe, team=team, on=date(1976, 7, 6))
 
 
+@pytest.fixture
+def assert_queries_dont_grow(user: User) -> Callable[..., None]:
+    """
+    Check `send` makes as many queries after `recipes` gain notes &
+    ingredients, i.e., the endpoint doesn't load them one by one, or at all.
+    """
+
+    def grow(recipe: Recipe) -> None:
+        Note.objects.bulk_create(
+            Note(text="note", created_by=user, recipe=recipe) for _ in range(5)
+        )
+        Ingredient.objects.bulk_create(
+            Ingredient(
+                quantity="1", name="egg", recipe=recipe, position=f"z{uuid4().hex}"
+            )
+            for _ in range(5)
+        )
+
+    def count_queries(send: Callable[[], HttpResponse]) -> int:
+        # the first request fills caches & versions the new rows, so we
+        # compare steady states
+        assert send().status_code == 200
+        with CaptureQueriesContext(connection) as queries:
+            assert send().status_code == 200
+        return len(queries)
+
+    def check(send: Callable[[], HttpResponse], *, recipes: Sequence[Recipe]) -> None:
+        before = count_queries(send)
+        for recipe in recipes:
+            grow(recipe)
+        after = count_queries(send)
+        assert before == after, f"queries grew from {before} to {after}"
+
+    return check
+
+
 @pytest.fixture(scope="session", autouse=True)
 def patch_publish_calendar_event() -> Iterator[None]:
     with (
         patch("recipeyak.realtime.publish_calendar_event", return_value=None),
+        patch("recipeyak.realtime.publish_calendar_events", return_value=None),
         patch("recipeyak.realtime.publish_calendar_event_deleted", return_value=None),
     ):
         yield
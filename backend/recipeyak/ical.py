@@ -9,8 +9,7 @@ trying to be more efficient than icalendar
 
 from __future__ import annotations
 
-import textwrap
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Literal
@@ -29,30 +28,64 @@ def _ical_escape(text: str) -> str:
     )
 
 
+# octets per line, not counting the line break
+_MAX_LINE_OCTETS = 75
+_FOLD = b"\r\n "
+
+
 def _ical_fold(input_line: str) -> str:
     """
+    Split the line into lines of at most 75 octets, continuation lines start
+    with a space, without splitting a UTF-8 character.
+
     https://datatracker.ietf.org/doc/html/rfc5545#section-3.1
     """
-    max_length = 75
-    if len(input_line) < max_length:
-        return input_line
-
-    return "\r\n ".join(
-        textwrap.wrap(
-            input_line,
-            width=max_length,
-            expand_tabs=False,
-            replace_whitespace=False,
-            drop_whitespace=False,
-            break_on_hyphens=False,
+    if input_line.isascii():
+        # an octet per character, so we can slice the str directly
+        if len(input_line) <= _MAX_LINE_OCTETS:
+            return input_line
+        return "\r\n ".join(
+            [input_line[:_MAX_LINE_OCTETS]]
+            + [
+                input_line[start : start + _MAX_LINE_OCTETS - 1]
+                for start in range(
+                    _MAX_LINE_OCTETS, len(input_line), _MAX_LINE_OCTETS - 1
+                )
+            ]
         )
+    octets = input_line.encode()
+    if len(octets) <= _MAX_LINE_OCTETS:
+        return input_line
+    out = bytearray()
+    start = 0
+    # the first line doesn't have the leading space
+    limit = _MAX_LINE_OCTETS
+    while len(octets) - start > limit:
+        end = start + limit
+        # back up to the start of the character, continuation bytes are
+        # 0b10xxxxxx
+        while octets[end] & 0xC0 == 0x80:
+            end -= 1
+        out += octets[start:end]
+        out += _FOLD
+        start = end
+        limit = _MAX_LINE_OCTETS - 1
+    out += octets[start:]
+    return out.decode()
+
+
+def _ical_date(value: date) -> str:
+    # much faster than strftime("%Y%m%d")
+    return value.isoformat().replace("-", "")
+
+
+def _ical_datetime(value: datetime) -> str:
+    return (
+        f"{value.year:04}{value.month:02}{value.day:02}"
+        f"T{value.hour:02}{value.minute:02}{value.second:02}Z"
     )
 
 
-_ICAL_DATETIME_FORMAT = "%Y%m%dT%H%M%SZ"
-_ICAL_DATE_FORMAT = "%Y%m%d"
-
-
 @dataclass(frozen=True, slots=True, kw_only=True)
 class Event:
     """
@@ -70,8 +103,10 @@ class Event:
     modified: datetime
 
 
-def _event_to_ics(event: Event) -> str:
-    """
+def render_event(event: Event) -> str:
+    r"""
+    Render a VEVENT for `calendar`.
+
     example:
 
     BEGIN:VEVENT
@@ -87,24 +122,39 @@ def _event_to_ics(event: Event) -> str:
     LAST-MODIFIED:20231215T045822Z
     END:VEVENT
     """
-    out = "BEGIN:VEVENT\r\n"
-    out += _ical_fold(f"UID:{_ical_escape(event.id)}") + "\r\n"
-    out += f"DTSTART;VALUE=DATE:{event.start.strftime(_ICAL_DATE_FORMAT)}\r\n"
-    out += f"DTEND;VALUE=DATE:{event.end.strftime(_ICAL_DATE_FORMAT)}\r\n"
-    out += _ical_fold(f"SUMMARY:{_ical_escape(event.summary)}") + "\r\n"
-    out += _ical_fold(f"DESCRIPTION:{_ical_escape(event.description)}") + "\r\n"
-    out += _ical_fold(f"URL:{_ical_escape(event.url)}") + "\r\n"
-    out += f"TRANSP:{event.transparent}\r\n"
-    out += f"CREATED:{event.created.strftime(_ICAL_DATETIME_FORMAT)}\r\n"
-    modified = event.modified.strftime(_ICAL_DATETIME_FORMAT)
-    out += f"DTSTAMP:{modified}\r\n"
-    out += f"LAST-MODIFIED:{modified}\r\n"
-    out += "END:VEVENT\r\n"
-    return out
-
-
-def calendar(*, id: str, name: str, description: str, events: Sequence[Event]) -> str:
+    modified = _ical_datetime(event.modified)
+    return "\r\n".join(
+        [
+            "BEGIN:VEVENT",
+            _ical_fold(f"UID:{_ical_escape(event.id)}"),
+            f"DTSTART;VALUE=DATE:{_ical_date(event.start)}",
+            f"DTEND;VALUE=DATE:{_ical_date(event.end)}",
+            _ical_fold(f"SUMMARY:{_ical_escape(event.summary)}"),
+            _ical_fold(f"DESCRIPTION:{_ical_escape(event.description)}"),
+            _ical_fold(f"URL:{_ical_escape(event.url)}"),
+            f"TRANSP:{event.transparent}",
+            f"CREATED:{_ical_datetime(event.created)}",
+            f"DTSTAMP:{modified}",
+            f"LAST-MODIFIED:{modified}",
+            "END:VEVENT\r\n",
+        ]
+    )
+
+
+# events per chunk when streaming, so we don't write tiny chunks to the socket
+_EVENTS_PER_CHUNK = 100
+
+
+def calendar(
+    *, id: str, name: str, description: str, events: Iterable[str]
+) -> Iterator[str]:
     """
+    Yield the calendar in chunks, consuming `events` as we go, so it can be
+    streamed.
+
+    `events` are rendered with `render_event`, so callers can reuse them
+    between calendars.
+
     example output:
 
     BEGIN:VCALENDAR
@@ -128,12 +178,17 @@ def calendar(*, id: str, name: str, description: str, events: Sequence[Event]) -
     END:VEVENT
     END:VCALENDAR
     """
-    out = "BEGIN:VCALENDAR\r\n"
-    out += _ical_fold(f"PRODID:{_ical_escape(id)}") + "\r\n"
-    out += "CALSCALE:GREGORIAN\r\nVERSION:2.0\r\n"
-    out += _ical_fold(f"X-WR-CALNAME:{_ical_escape(name)}") + "\r\n"
-    out += _ical_fold(f"X-WR-CALDESC:{_ical_escape(description)}") + "\r\n"
+    chunk = [
+        "BEGIN:VCALENDAR\r\n",
+        _ical_fold(f"PRODID:{_ical_escape(id)}") + "\r\n",
+        "CALSCALE:GREGORIAN\r\nVERSION:2.0\r\n",
+        _ical_fold(f"X-WR-CALNAME:{_ical_escape(name)}") + "\r\n",
+        _ical_fold(f"X-WR-CALDESC:{_ical_escape(description)}") + "\r\n",
+    ]
     for event in events:
-        out += _event_to_ics(event)
-    out += "END:VCALENDAR\r\n"
-    return out
+        chunk.append(event)
+        if len(chunk) >= _EVENTS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    chunk.append("END:VCALENDAR\r\n")
+    yield "".join(chunk)
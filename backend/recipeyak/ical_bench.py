@@ -0,0 +1,121 @@
+# ruff: noqa: T201
+"""
+Benchmark rendering calendars, comparing our line folding against the
+`textwrap` based folding we used before.
+
+    python -m recipeyak.ical_bench --events 5000
+"""
+
+from __future__ import annotations
+
+import textwrap
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+import typer
+
+from recipeyak import ical
+from recipeyak.ical import Event, calendar, render_event
+
+
+def _textwrap_fold(input_line: str) -> str:
+    max_length = 75
+    if len(input_line) < max_length:
+        return input_line
+
+    return "\r\n ".join(
+        textwrap.wrap(
+            input_line,
+            width=max_length,
+            expand_tabs=False,
+            replace_whitespace=False,
+            drop_whitespace=False,
+            break_on_hyphens=False,
+        )
+    )
+
+
+def _events(count: int) -> list[Event]:
+    created = datetime(2024, 1, 1, 12)  # noqa: DTZ001
+    return [
+        Event(
+            id=f"core_scheduledrecipe:{i}",
+            start=date(2024, 1, 1) + timedelta(days=i % 600),
+            end=date(2024, 1, 2) + timedelta(days=i % 600),
+            summary=f"Crème brûlée with roasted rhubarb & pistachios, take {i}",
+            description="Takes about 6 hours, 15 mins",
+            url=f"https://recipeyak.com/recipes/{i}-creme-brulee-with-roasted-rhubarb-and-pistachios",
+            transparent="TRANSPARENT",
+            created=created,
+            modified=created,
+        )
+        for i in range(count)
+    ]
+
+
+def _render(events: list[Event]) -> str:
+    return "".join(
+        calendar(
+            id="-//Recipe Yak//Schedule//EN",
+            name="Scheduled Recipes",
+            description="Recipe Yak Schedule for Team Bench",
+            events=(render_event(event) for event in events),
+        )
+    )
+
+
+def _time(fn: Callable[[], str], *, rounds: int) -> tuple[float, str]:
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds, result
+
+
+def main(
+    events: list[int] = [500, 5_000],  # noqa: B006
+    rounds: int = 5,
+) -> None:
+    """
+    Render calendars with each folding implementation.
+    """
+    for n in events:
+        event_list = _events(n)
+
+        def render(event_list: list[Event] = event_list) -> str:
+            return _render(event_list)
+
+        with mock.patch.object(ical, "_ical_fold", _textwrap_fold):
+            textwrap_sec, _ = _time(render, rounds=rounds)
+        octets_sec, body = _time(render, rounds=rounds)
+        size = len(body.encode())
+
+        # the lines we fold, by themselves
+        lines = [
+            f"{name}:{ical._ical_escape(value)}"
+            for event in event_list
+            for name, value in [("SUMMARY", event.summary), ("URL", event.url)]
+        ]
+
+        def fold(
+            fold: Callable[[str], str] = ical._ical_fold, lines: list[str] = lines
+        ) -> str:
+            return "".join(fold(line) for line in lines)
+
+        fold_textwrap_sec, _ = _time(lambda: fold(fold=_textwrap_fold), rounds=rounds)
+        fold_octets_sec, _ = _time(fold, rounds=rounds)
+        print(
+            f"events={n:>5} textwrap={textwrap_sec * 1000:7.1f}ms "
+            f"octets={octets_sec * 1000:7.1f}ms "
+            f"speedup={textwrap_sec / octets_sec:4.1f}x "
+            f"throughput={size / octets_sec / 1_000_000:6.1f}MB/s\n"
+            f"  folding only: textwrap={fold_textwrap_sec * 1000:7.1f}ms "
+            f"octets={fold_octets_sec * 1000:7.1f}ms "
+            f"speedup={fold_textwrap_sec / fold_octets_sec:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,141 @@
+"""
+Cache each team's rendered calendar feed, so the calendar apps polling it
+don't each rebuild it.
+
+Entries are keyed by team and tagged with the team's `schedule_modified`,
+which triggers move forward for anything that changes the feed. When it
+moves we rebuild from the previous entry, only rendering the events whose
+rows changed.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+from recipeyak.api.base.metrics import MetricTable, render_prometheus
+
+
+@dataclass(frozen=True, slots=True)
+class CachedCalendar:
+    version: datetime
+    body: bytes
+    events: dict[int, tuple[tuple[object, ...], str]]
+    """
+    VEVENTs by scheduled recipe id, along with the row they were rendered
+    from.
+    """
+
+
+@dataclass(slots=True)
+class CalendarFeedStats:
+    polls: int = 0
+    not_modified: int = 0
+    rebuilds: int = 0
+    events_rendered: int = 0
+    events_reused: int = 0
+    cached_teams: int = 0
+
+
+_METRICS: MetricTable = [
+    (
+        "recipeyak_calendar_feed_polls_total",
+        "counter",
+        "Requests for a team's calendar feed.",
+        "polls",
+    ),
+    (
+        "recipeyak_calendar_feed_not_modified_total",
+        "counter",
+        "Polls answered with a 304.",
+        "not_modified",
+    ),
+    (
+        "recipeyak_calendar_feed_rebuilds_total",
+        "counter",
+        "Polls that had to rebuild the team's feed.",
+        "rebuilds",
+    ),
+    (
+        "recipeyak_calendar_feed_events_rendered_total",
+        "counter",
+        "Events rendered while rebuilding feeds.",
+        "events_rendered",
+    ),
+    (
+        "recipeyak_calendar_feed_events_reused_total",
+        "counter",
+        "Events reused from the previous feed while rebuilding feeds.",
+        "events_reused",
+    ),
+    (
+        "recipeyak_calendar_feed_cached_teams",
+        "gauge",
+        "Teams with a cached feed.",
+        "cached_teams",
+    ),
+]
+
+
+class CalendarCache:
+    """
+    A bounded LRU of calendar feeds with poll & rebuild counters.
+    """
+
+    def __init__(self, *, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries = OrderedDict[int, CachedCalendar]()
+        self._stats = CalendarFeedStats()
+        self._lock = threading.Lock()
+
+    def get(self, team_id: int) -> CachedCalendar | None:
+        """
+        The team's cached feed, callers check its version is current.
+        """
+        with self._lock:
+            entry = self._entries.get(team_id)
+            if entry is not None:
+                self._entries.move_to_end(team_id)
+            return entry
+
+    def set(self, team_id: int, value: CachedCalendar) -> None:
+        with self._lock:
+            entry = self._entries.get(team_id)
+            # a concurrent request may have already cached a newer version
+            if entry is None or entry.version <= value.version:
+                self._entries[team_id] = value
+            self._entries.move_to_end(team_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def record(
+        self,
+        *,
+        not_modified: bool = False,
+        events_rendered: int | None = None,
+        events_reused: int = 0,
+    ) -> None:
+        """
+        Record a poll, `events_rendered` is None when we didn't rebuild.
+        """
+        with self._lock:
+            self._stats.polls += 1
+            self._stats.not_modified += not_modified
+            if events_rendered is not None:
+                self._stats.rebuilds += 1
+                self._stats.events_rendered += events_rendered
+                self._stats.events_reused += events_reused
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = CalendarFeedStats()
+
+    def stats(self) -> CalendarFeedStats:
+        with self._lock:
+            return replace(self._stats, cached_teams=len(self._entries))
+
+    def prometheus(self) -> str:
+        return render_prometheus(_METRICS, [({}, self.stats())])
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from recipeyak.ical import _ical_fold
+
+# 1, 2, 3 & 4 octet characters
+_ALPHABET = "abc XYZ,;:\\-é€😀"
+
+
+def _random_lines(seed: int, count: int) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(_ALPHABET) for _ in range(rng.randrange(300)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ical_fold_properties(seed: int) -> None:
+    """
+    https://datatracker.ietf.org/doc/html/rfc5545#section-3.1
+    """
+    for line in _random_lines(seed, 200):
+        folded = _ical_fold(line)
+        # unfolding gets us back the original
+        assert folded.replace("\r\n ", "") == line
+        parts = folded.encode().split(b"\r\n")
+        for i, part in enumerate(parts):
+            assert len(part) <= 75
+            # we don't split characters
+            part.decode()
+            if i > 0:
+                assert part.startswith(b" ")
+            if i < len(parts) - 1:
+                # lines are as long as they can be
+                next_char = parts[i + 1][1:].decode()[0]
+                assert len(part) + len(next_char.encode()) > 75
+
+
+def test_ical_fold() -> None:
+    assert _ical_fold("SUMMARY:soup") == "SUMMARY:soup"
+    assert _ical_fold("a" * 75) == "a" * 75
+    assert _ical_fold("a" * 150) == "a" * 75 + "\r\n " + "a" * 74 + "\r\n " + "a"
+    # the euro sign is 3 octets, the last one doesn't fit on the first line
+    assert _ical_fold("a" * 73 + "€b") == "a" * 73 + "\r\n €b"
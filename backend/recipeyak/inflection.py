@@ -0,0 +1,134 @@
+"""
+Fast singularize & pluralize for ingredient names.
+
+`recipeyak.inflect` walks a long list of regex rules for every word, but we
+keep asking it about the same small vocabulary. So we precompute the
+vocabulary we know about, the words in the department mapping and the
+ingredients corpus, at import time and memoize everything else.
+"""
+
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+from recipeyak import inflect
+from recipeyak.departments import DEPARTMENT_MAPPING
+
+_CORPUS = Path(__file__).resolve().parent.parent / "ingredients.csv"
+
+
+def _normalize(text: str) -> str:
+    return (
+        text.lower()
+        .replace("-", " ")
+        .replace(",", "")
+        .replace(")", "")
+        .replace("(", "")
+        .replace("’", "'")  # noqa: RUF001
+    )
+
+
+def _vocabulary() -> Iterator[str]:
+    """
+    Every name, and every word of every name, that we expect to inflect.
+    """
+    names = [x for ingredients in DEPARTMENT_MAPPING.values() for x in ingredients]
+    # the corpus lives alongside the package, but it's only an optimization
+    if _CORPUS.exists():
+        with _CORPUS.open() as f:
+            names += [row["name"] for row in csv.DictReader(f)]
+    for name in names:
+        normalized = _normalize(name)
+        yield normalized
+        yield from normalized.split()
+
+
+_SINGULAR = MappingProxyType(
+    {word: inflect.singularize(word) for word in sorted(set(_vocabulary()))}
+)
+_PLURAL = MappingProxyType(
+    {
+        word: inflect.pluralize(word)
+        for word in sorted(
+            {
+                _SINGULAR[word]
+                for ingredients in DEPARTMENT_MAPPING.values()
+                for ingredient in ingredients
+                for word in _normalize(ingredient).split()
+            }
+        )
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class InflectionInfo:
+    table_hits: int
+    memo_hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.table_hits + self.memo_hits + self.misses
+        return (self.table_hits + self.memo_hits) / total if total else 0.0
+
+
+_table_hits = {"singularize": 0, "pluralize": 0}
+
+
+@lru_cache(maxsize=8192)
+def _singularize_memo(word: str) -> str:
+    return inflect.singularize(word)
+
+
+@lru_cache(maxsize=8192)
+def _pluralize_memo(word: str) -> str:
+    return inflect.pluralize(word)
+
+
+def singularize(word: str) -> str:
+    """
+    Same as `inflect.singularize` for nouns.
+    """
+    singular = _SINGULAR.get(word)
+    if singular is not None:
+        _table_hits["singularize"] += 1
+        return singular
+    return _singularize_memo(word)
+
+
+def pluralize(word: str) -> str:
+    """
+    Same as `inflect.pluralize` for nouns.
+    """
+    plural = _PLURAL.get(word)
+    if plural is not None:
+        _table_hits["pluralize"] += 1
+        return plural
+    return _pluralize_memo(word)
+
+
+def inflection_info() -> dict[str, InflectionInfo]:
+    """
+    How often we avoided running the rules, so we can size the vocabulary &
+    memo.
+    """
+    singular = _singularize_memo.cache_info()
+    plural = _pluralize_memo.cache_info()
+    return {
+        "singularize": InflectionInfo(
+            table_hits=_table_hits["singularize"],
+            memo_hits=singular.hits,
+            misses=singular.misses,
+        ),
+        "pluralize": InflectionInfo(
+            table_hits=_table_hits["pluralize"],
+            memo_hits=plural.hits,
+            misses=plural.misses,
+        ),
+    }
@@ -0,0 +1,59 @@
+# ruff: noqa: T201
+"""
+Benchmark for singularizing ingredient names.
+
+    python -m recipeyak.inflection_bench --rounds 20
+"""
+
+import csv
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import typer
+
+from recipeyak import inflect, inflection
+from recipeyak.combine import normalize_ingredient_name
+
+
+def _per_sec(fn: Callable[[str], str], items: Sequence[str], *, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            fn(item)
+    return (len(items) * rounds) / (time.perf_counter() - start)
+
+
+def main(path: Path = Path("ingredients.csv"), rounds: int = 20) -> None:
+    """
+    Compare the lookup tables against walking the rules, for the names
+    combine_ingredients singularizes & the words category looks up.
+    """
+    with path.open() as f:
+        names = [
+            normalize_ingredient_name(name=row["name"]) for row in csv.DictReader(f)
+        ]
+    words = [word for name in names for word in name.split()]
+    # names that aren't in the corpus, like most of what people type
+    unseen = [
+        f"{name} and {word}" for name, word in zip(names, reversed(words), strict=False)
+    ]
+    print(f"corpus: path={path} names={len(names)} rounds={rounds}")
+
+    for label, items in [("names", names), ("words", words), ("unseen", unseen)]:
+        for item in items:
+            if inflection.singularize(item) != inflect.singularize(item):
+                raise SystemExit(f"singularize mismatch for {item!r}")
+        rules = _per_sec(inflect.singularize, items, rounds=rounds)
+        table = _per_sec(inflection.singularize, items, rounds=rounds)
+        print(
+            f"{label:>6}: rules={rules:>12,.0f}/sec table={table:>12,.0f}/sec "
+            f"speedup={table / rules:5.1f}x"
+        )
+
+    for name, info in inflection.inflection_info().items():
+        print(f"{name}: {info} hit_rate={info.hit_rate:.1%}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
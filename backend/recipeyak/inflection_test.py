@@ -0,0 +1,38 @@
+import csv
+from pathlib import Path
+
+from recipeyak import inflect, inflection
+from recipeyak.combine import normalize_ingredient_name
+from recipeyak.departments import DEPARTMENT_MAPPING
+
+
+def test_inflection_matches_rules() -> None:
+    """
+    The lookup tables & memo should give the same answers as the rules.
+    """
+    with (Path() / "ingredients.csv").open() as f:
+        names = [
+            normalize_ingredient_name(name=row["name"]) for row in csv.DictReader(f)
+        ]
+    names += [x for ingredients in DEPARTMENT_MAPPING.values() for x in ingredients]
+    words = [word for name in names for word in name.split()]
+    unseen = ["fetas", "Tomatoes", "mothers-in-law", "dogs'", "glasses of wine"]
+
+    for word in names + words + unseen:
+        assert inflection.singularize(word) == inflect.singularize(word), word
+        # twice for the memo
+        assert inflection.singularize(word) == inflect.singularize(word), word
+        assert inflection.pluralize(word) == inflect.pluralize(word), word
+
+
+def test_inflection_info() -> None:
+    before = inflection.inflection_info()["singularize"]
+
+    inflection.singularize("tomatoes")
+    inflection.singularize("a word that isn't in the vocabulary")
+    inflection.singularize("a word that isn't in the vocabulary")
+
+    after = inflection.inflection_info()["singularize"]
+    assert after.table_hits - before.table_hits == 1
+    assert after.misses - before.misses <= 1
+    assert (after.memo_hits + after.misses) - (before.memo_hits + before.misses) == 2
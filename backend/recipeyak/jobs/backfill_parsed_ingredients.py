@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Any
+from uuid import uuid4
+
+import asyncpg
+import sentry_sdk
+import structlog
+import typer
+from dotenv import load_dotenv
+from pydantic import PostgresDsn
+from pydantic_settings import BaseSettings
+from structlog.stdlib import BoundLogger
+
+from recipeyak.parsed_ingredient import parse_storable_ingredient_fields
+
+logger = structlog.stdlib.get_logger()
+
+load_dotenv()
+
+
+class Config(BaseSettings):
+    DATABASE_URL: PostgresDsn
+    SENTRY_DSN: str
+
+
+def parsed_row(
+    *, log: BoundLogger, ingredient_id: int, quantity: str, name: str
+) -> tuple[object, ...]:
+    """
+    Arguments for the update query in `backfill_batch`.
+
+    Ingredients we can't parse are left null, shopping lists parse them on
+    read.
+    """
+    parsed = parse_storable_ingredient_fields(quantity=quantity, name=name)
+    if parsed is None:
+        log.warning("could not parse ingredient", ingredient_id=ingredient_id)
+        return (ingredient_id, quantity, name, *[None] * 10)
+    return (
+        ingredient_id,
+        quantity,
+        name,
+        parsed.name,
+        parsed.singular_name,
+        parsed.unit.value,
+        Decimal(parsed.quantity.numerator),
+        Decimal(parsed.quantity.denominator),
+        parsed.unknown_unit,
+        parsed.base_unit.value,
+        Decimal(parsed.base_quantity.numerator),
+        Decimal(parsed.base_quantity.denominator),
+        parsed.category,
+    )
+
+
+async def backfill_batch(
+    pg: asyncpg.Connection[Any],
+    *,
+    log: BoundLogger,
+    after_id: int,
+    batch_size: int,
+    reparse: bool,
+    dry_run: bool,
+) -> int | None:
+    """
+    Parse the next batch of ingredients after `after_id`.
+
+    Returns the last id we looked at, or None when there's nothing left.
+    """
+    rows = await pg.fetch(
+        """
+    select id, quantity, name
+    from core_ingredient
+    where id > $1
+      and ($2 or parsed_name is null)
+    order by id
+    limit $3;
+    """,
+        after_id,
+        reparse,
+        batch_size,
+    )
+    if not rows:
+        return None
+
+    updates = [
+        parsed_row(log=log, ingredient_id=ingredient_id, quantity=quantity, name=name)
+        for (ingredient_id, quantity, name) in rows
+    ]
+    last_id: int = rows[-1]["id"]
+    log.info("parsed batch", row_count=len(rows), last_id=last_id)
+
+    if dry_run:
+        log.info("would update")
+        return last_id
+
+    # Skip ingredients that were edited since we fetched them, the edit will
+    # have parsed them already.
+    await pg.executemany(
+        """
+    update core_ingredient
+    set parsed_name = $4,
+        parsed_singular_name = $5,
+        parsed_unit = $6,
+        parsed_quantity_numerator = $7,
+        parsed_quantity_denominator = $8,
+        parsed_unknown_unit = $9,
+        parsed_base_unit = $10,
+        parsed_base_quantity_numerator = $11,
+        parsed_base_quantity_denominator = $12,
+        parsed_category = $13
+    where id = $1 and quantity = $2 and name = $3
+    """,
+        updates,
+    )
+    return last_id
+
+
+async def job(
+    *,
+    log: BoundLogger,
+    dry_run: bool,
+    database_url: str,
+    after_id: int,
+    batch_size: int,
+    reparse: bool,
+) -> None:
+    log = log.bind(dry_run=dry_run, reparse=reparse, batch_size=batch_size)
+    log.info("starting up", after_id=after_id)
+    pg = await asyncpg.connect(dsn=database_url)
+    last_id: int | None = after_id
+    while last_id is not None:
+        # log the position so we can pick up where we left off with --after-id
+        log.info("fetching ingredients", after_id=last_id)
+        last_id = await backfill_batch(
+            pg,
+            log=log,
+            after_id=last_id,
+            batch_size=batch_size,
+            reparse=reparse,
+            dry_run=dry_run,
+        )
+    log.info("no rows to update, exiting")
+
+
+def main(
+    dry_run: bool = False,
+    after_id: int = 0,
+    batch_size: int = 1_000,
+    # reparse every ingredient, e.g., after changing the parser
+    reparse: bool = False,
+) -> None:
+    config = Config()
+    # associate the execution of one instance of the job across log lines
+    # equivalent to the request_id used in the http server
+    log = logger.bind(run_id=uuid4().hex)
+    log.info("initiate")
+    sentry_sdk.init(
+        send_default_pii=True,
+        traces_sample_rate=1.0,
+        profiles_sample_rate=1.0,
+    )
+    with sentry_sdk.monitor(monitor_slug="backfill-parsed-ingredients"):
+        start = time.monotonic()
+        asyncio.run(
+            job(
+                log=log,
+                dry_run=dry_run,
+                database_url=str(config.DATABASE_URL),
+                after_id=after_id,
+                batch_size=batch_size,
+                reparse=reparse,
+            )
+        )
+        log.info("done!", total_time_sec=time.monotonic() - start)
+    log.info("exiting")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,55 @@
+import asyncio
+
+import asyncpg
+import pytest
+import structlog
+from django.db import connection
+
+from recipeyak.jobs.backfill_parsed_ingredients import backfill_batch
+from recipeyak.models import Ingredient, Recipe
+
+
+async def _backfill(*, after_id: int) -> int | None:
+    settings = connection.settings_dict
+    pg = await asyncpg.connect(
+        host=settings["HOST"],
+        port=settings["PORT"] or None,
+        user=settings["USER"],
+        password=settings["PASSWORD"],
+        database=settings["NAME"],
+    )
+    try:
+        return await backfill_batch(
+            pg,
+            log=structlog.stdlib.get_logger(),
+            after_id=after_id,
+            batch_size=100,
+            reparse=False,
+            dry_run=False,
+        )
+    finally:
+        await pg.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_skips_unparsable_ingredients(recipe: Recipe) -> None:
+    """
+    One bad quantity shouldn't stop the rest of the batch.
+    """
+    Ingredient.objects.filter(recipe=recipe).delete()
+    unparsable = Ingredient.objects.bulk_create(
+        Ingredient(recipe=recipe, quantity=quantity, name="salt", position=position)
+        for position, quantity in [("a", "1/0 cups"), ("b", "1" * 120)]
+    )
+    flour = Ingredient.objects.create(
+        recipe=recipe, quantity="2 cups", name="flour", position="c"
+    )
+
+    assert asyncio.run(_backfill(after_id=0)) == flour.id
+
+    flour.refresh_from_db()
+    assert flour.parsed_name == "flour"
+    assert flour.parsed_quantity_numerator == 2
+    for ingredient in unparsable:
+        ingredient.refresh_from_db()
+        assert ingredient.parsed_name is None
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+import asyncpg
+import sentry_sdk
+import structlog
+import typer
+from dotenv import load_dotenv
+from pydantic import PostgresDsn
+from pydantic_settings import BaseSettings
+from structlog.stdlib import BoundLogger
+
+logger = structlog.stdlib.get_logger()
+
+load_dotenv()
+
+
+class Config(BaseSettings):
+    DATABASE_URL: PostgresDsn
+    SENTRY_DSN: str
+
+
+# columns that make two rows the same, see `recipeyak.versioning`
+_TABLES = {
+    "ingredient_historical": (
+        "team_id",
+        "ingredient_id",
+        "quantity",
+        "name",
+        "description",
+        "position",
+        "optional",
+    ),
+    "section_historical": ("team_id", "section_id", "title", "position"),
+    "step_historical": ("team_id", "step_id", "text", "position"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class HistoricalRow:
+    id: int
+    recipe_historical_id: int
+    key: tuple[object, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CompactedRows:
+    version_row_ids: dict[int, list[int]]
+    """
+    row ids for each version
+    """
+    duplicate_row_ids: set[int]
+    """
+    rows no version uses anymore
+    """
+
+
+def compact_rows(
+    versions: Sequence[tuple[int, list[int] | None]],
+    rows: Sequence[HistoricalRow],
+) -> CompactedRows:
+    """
+    Share rows between consecutive versions of a recipe, the same way
+    `save_recipe_version` does when writing them.
+
+    `versions` are `(id, row ids)` oldest first, where the row ids are None for
+    versions saved before we shared rows.
+    """
+    by_id = {row.id: row for row in rows}
+    by_version = dict[int, list[int]]()
+    for row in sorted(rows, key=lambda r: r.id):
+        by_version.setdefault(row.recipe_historical_id, []).append(row.id)
+
+    # rows replaced by an identical row from an earlier version, later
+    # versions may still point at them
+    replaced = dict[int, int]()
+    previous_by_key = dict[tuple[object, ...], int]()
+    version_row_ids = dict[int, list[int]]()
+    for version_id, row_ids in versions:
+        if row_ids is None:
+            row_ids = by_version.get(version_id, [])
+        current_by_key = dict[tuple[object, ...], int]()
+        for row_id in row_ids:
+            row_id = replaced.get(row_id, row_id)
+            key = by_id[row_id].key
+            kept = current_by_key.get(key, previous_by_key.get(key, row_id))
+            if kept != row_id:
+                replaced[row_id] = kept
+            current_by_key[key] = kept
+        version_row_ids[version_id] = list(current_by_key.values())
+        previous_by_key = current_by_key
+    return CompactedRows(
+        version_row_ids=version_row_ids, duplicate_row_ids=set(replaced)
+    )
+
+
+async def compact_recipe(
+    pg: asyncpg.Connection[Any], *, log: BoundLogger, recipe_id: int, dry_run: bool
+) -> None:
+    async with pg.transaction():
+        # `save_recipe_version` locks the recipe too, otherwise it could share
+        # rows we're about to delete as duplicates
+        await pg.execute(
+            "select from core_recipe where id = $1 for no key update", recipe_id
+        )
+        versions = await pg.fetch(
+            """
+        select id, ingredient_historical_ids, section_historical_ids, step_historical_ids
+        from recipe_historical
+        where recipe_id = $1
+        order by created, id
+        for update;
+        """,
+            recipe_id,
+        )
+        version_ids = [version["id"] for version in versions]
+        for table, key_columns in _TABLES.items():
+            # shared rows are always introduced by a version of the same recipe
+            rows = await pg.fetch(
+                f"""
+            select id, recipe_historical_id, {", ".join(key_columns)}
+            from {table}
+            where recipe_historical_id = any($1::int[]);
+            """,
+                version_ids,
+            )
+            compacted = compact_rows(
+                [(version["id"], version[f"{table}_ids"]) for version in versions],
+                [
+                    HistoricalRow(
+                        id=row["id"],
+                        recipe_historical_id=row["recipe_historical_id"],
+                        key=tuple(row[column] for column in key_columns),
+                    )
+                    for row in rows
+                ],
+            )
+            log.info(
+                "compacted",
+                recipe_id=recipe_id,
+                table=table,
+                row_count=len(rows),
+                duplicate_count=len(compacted.duplicate_row_ids),
+            )
+            if dry_run:
+                continue
+            await pg.executemany(
+                f"""
+            update recipe_historical
+            set {table}_ids = $2
+            where id = $1
+            """,
+                list(compacted.version_row_ids.items()),
+            )
+            await pg.execute(
+                f"delete from {table} where id = any($1::int[])",
+                list(compacted.duplicate_row_ids),
+            )
+
+
+async def job(
+    *,
+    log: BoundLogger,
+    dry_run: bool,
+    database_url: str,
+    after_id: int,
+    batch_size: int,
+) -> None:
+    log = log.bind(dry_run=dry_run, batch_size=batch_size)
+    log.info("starting up", after_id=after_id)
+    pg = await asyncpg.connect(dsn=database_url)
+    last_id = after_id
+    while True:
+        # log the position so we can pick up where we left off with --after-id
+        log.info("fetching recipes", after_id=last_id)
+        recipe_ids: list[int] = [
+            row["recipe_id"]
+            for row in await pg.fetch(
+                """
+            select distinct recipe_id
+            from recipe_historical
+            where recipe_id > $1
+              and ingredient_historical_ids is null
+            order by recipe_id
+            limit $2;
+            """,
+                last_id,
+                batch_size,
+            )
+        ]
+        if not recipe_ids:
+            break
+        for recipe_id in recipe_ids:
+            await compact_recipe(pg, log=log, recipe_id=recipe_id, dry_run=dry_run)
+        last_id = recipe_ids[-1]
+    log.info("no recipes to compact, exiting")
+
+
+def main(
+    dry_run: bool = False,
+    after_id: int = 0,
+    batch_size: int = 100,
+) -> None:
+    config = Config()
+    log = logger.bind(run_id=uuid4().hex)
+    log.info("initiate")
+    sentry_sdk.init(
+        send_default_pii=True,
+        traces_sample_rate=1.0,
+        profiles_sample_rate=1.0,
+    )
+    with sentry_sdk.monitor(monitor_slug="compact-recipe-history"):
+        start = time.monotonic()
+        asyncio.run(
+            job(
+                log=log,
+                dry_run=dry_run,
+                database_url=str(config.DATABASE_URL),
+                after_id=after_id,
+                batch_size=batch_size,
+            )
+        )
+        log.info("done!", total_time_sec=time.monotonic() - start)
+    log.info("exiting")
+
+
+if __name__ == "__main__":
+    typer.run(main)
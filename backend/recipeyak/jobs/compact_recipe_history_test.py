@@ -0,0 +1,85 @@
+import asyncio
+
+import asyncpg
+import pytest
+import structlog
+from django.db import connection, transaction
+
+from recipeyak.fixtures import create_recipe, create_team, create_user
+from recipeyak.jobs.compact_recipe_history import (
+    CompactedRows,
+    HistoricalRow,
+    compact_recipe,
+    compact_rows,
+)
+from recipeyak.versioning import save_recipe_version
+
+
+def test_compact_rows_legacy_versions() -> None:
+    rows = [
+        # version 1
+        HistoricalRow(id=1, recipe_historical_id=1, key=("egg", "a")),
+        HistoricalRow(id=2, recipe_historical_id=1, key=("salt", "b")),
+        # version 2, salt changed
+        HistoricalRow(id=3, recipe_historical_id=2, key=("egg", "a")),
+        HistoricalRow(id=4, recipe_historical_id=2, key=("pepper", "b")),
+        # version 3, back to salt
+        HistoricalRow(id=5, recipe_historical_id=3, key=("egg", "a")),
+        HistoricalRow(id=6, recipe_historical_id=3, key=("salt", "b")),
+    ]
+    assert compact_rows([(1, None), (2, None), (3, None)], rows) == CompactedRows(
+        version_row_ids={1: [1, 2], 2: [1, 4], 3: [1, 6]},
+        duplicate_row_ids={3, 5},
+    )
+
+
+def test_compact_rows_after_shared_versions() -> None:
+    """
+    Versions saved after sharing rows can point at legacy rows we dedupe.
+    """
+    rows = [
+        HistoricalRow(id=1, recipe_historical_id=1, key=("egg", "a")),
+        HistoricalRow(id=2, recipe_historical_id=2, key=("egg", "a")),
+        HistoricalRow(id=3, recipe_historical_id=3, key=("salt", "b")),
+    ]
+    assert compact_rows(
+        [(1, None), (2, None), (3, [2, 3]), (4, [2, 3])], rows
+    ) == CompactedRows(
+        version_row_ids={1: [1], 2: [1], 3: [1, 3], 4: [1, 3]},
+        duplicate_row_ids={2},
+    )
+
+
+async def _compact_without_waiting(recipe_id: int) -> None:
+    settings = connection.settings_dict
+    pg = await asyncpg.connect(
+        host=settings["HOST"],
+        port=settings["PORT"] or None,
+        user=settings["USER"],
+        password=settings["PASSWORD"],
+        database=settings["NAME"],
+    )
+    try:
+        await pg.execute("set lock_timeout = '100ms'")
+        await compact_recipe(
+            pg, log=structlog.stdlib.get_logger(), recipe_id=recipe_id, dry_run=False
+        )
+    finally:
+        await pg.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_compact_recipe_waits_for_saving_versions() -> None:
+    """
+    Compacting & saving a version lock the recipe, so a new version can't
+    share rows we're deleting as duplicates.
+    """
+    user = create_user()
+    recipe = create_recipe(team=create_team(user=user), user=user)
+
+    with transaction.atomic():
+        save_recipe_version(recipe_id=recipe.id, actor=user)
+        with pytest.raises(asyncpg.exceptions.LockNotAvailableError):
+            asyncio.run(_compact_without_waiting(recipe.id))
+
+    asyncio.run(_compact_without_waiting(recipe.id))
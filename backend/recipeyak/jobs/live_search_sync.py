@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import random
 import time
+from collections import deque
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Sequence,
+)
+from dataclasses import dataclass
 from typing import Any
 from uuid import uuid4
 
@@ -12,6 +23,7 @@ import sentry_sdk
 import structlog
 import typer
 from algoliasearch.search_client import SearchClient
+from algoliasearch.search_index_async import SearchIndexAsync
 from dotenv import load_dotenv
 from pydantic import PostgresDsn
 from pydantic_settings import BaseSettings
@@ -29,188 +41,511 @@ class Config(BaseSettings):
     ALGOLIA_ADMIN_API_KEY: str
 
 
+# search index attributes, computed for `core_recipe`
+_ATTRIBUTES = {
+    "id": "id",
+    "name": "name",
+    "author": "author",
+    "source": "source",
+    "time": "time",
+    "servings": "servings",
+    "archived": "archived_at is distinct from null",
+    "archived_at": "archived_at",
+    "tags": "tags",
+    "team_id": "team_id",
+    "primary_image": """(
+        select json_object(
+            'url': 'https://images-cdn.recipeyak.com/' || "key" ,
+            'background_url': "background_url",
+            'created_by_id': "created_by_id"
+        )
+        from core_upload
+        where core_upload.id = core_recipe.primary_image_id
+    )""",
+    "archived_by_id": """(
+        select
+            created_by_id
+        from (
+            select distinct on (recipe_id)
+                recipe_id,
+                action,
+                created_by_id
+            from
+                timeline_event
+            where
+                action in ('archived', 'unarchived')
+            order by
+                recipe_id,
+                created desc
+        ) sub
+        where
+            action = 'archived'
+            and created_by_id is not null
+            and recipe_id = core_recipe.id
+    )""",
+    "favorite_by_user_id": """(
+        select json_agg(distinct user_id)
+        from recipe_favorite
+        where recipe_id = core_recipe.id
+    )""",
+    "created_by_id": """(
+        select
+            created_by_id
+        from
+            timeline_event
+        where recipe_id = core_recipe.id
+            and action = 'created'
+        limit 1
+    )""",
+    "scheduled_by_id": """(
+        select json_agg(distinct created_by_id)
+        from core_scheduledrecipe
+        where recipe_id = core_recipe.id
+            and created_by_id is not null
+    )""",
+    "scheduled_count": """(
+        SELECT
+            count(*)
+        FROM
+            core_scheduledrecipe
+        WHERE
+            core_scheduledrecipe.recipe_id = core_recipe.id
+            and core_scheduledrecipe.on > (now() - '1.5 years'::interval)
+            and core_scheduledrecipe.on < now()
+    )""",
+    "scheduled_count_all_time": """(
+        SELECT
+            count(*)
+        FROM
+            core_scheduledrecipe
+        WHERE
+            core_scheduledrecipe.recipe_id = core_recipe.id
+    )""",
+    "ingredients": """(
+        SELECT
+            json_agg(ingredient)
+        FROM (
+            SELECT
+                json_object(
+                    'id': id,
+                    'description': "description",
+                    'quantity_name': "quantity" || ' ' || "name",
+                    'quantity_name_description': "quantity" || ' ' || "name" || ', ' || "description",
+                    'recipe_id': "recipe_id",
+                    'quantity': "quantity",
+                    'name': "name",
+                    'optional': "optional"
+                ) AS ingredient
+            FROM
+                core_ingredient
+            WHERE
+                recipe_id = core_recipe.id
+            ORDER BY
+                position ASC
+        ) sub
+    )""",
+}
+
+
+# attributes that change with the time instead of a row, so we refresh them
+# whenever we index the recipe
+_TIME_DEPENDENT_ATTRIBUTES = frozenset(["scheduled_count"])
+
+
+def _documents_sql(attributes: Iterable[str]) -> str:
+    """
+    Only compute the attributes we need, some of them are expensive.
+
+    Callers add their own conditions to the where clause.
+    """
+    fields = "".join(f",\n'{name}': {_ATTRIBUTES[name]}" for name in attributes)
+    return f"""
+SELECT
+    id,
+    json_object('objectID': id{fields}) recipe
+FROM
+    core_recipe
+WHERE
+    team_id IS NOT NULL
+"""
+
+
+def collapse_queue(
+    rows: Sequence[tuple[int, Sequence[str] | None]],
+) -> dict[int, frozenset[str] | None]:
+    """
+    Merge the queued `(recipe_id, fields)` for each recipe, where None means
+    every attribute changed.
+    """
+    changes = dict[int, frozenset[str] | None]()
+    for recipe_id, fields in rows:
+        previous = changes.get(recipe_id, frozenset())
+        if previous is None or fields is None:
+            changes[recipe_id] = None
+        else:
+            changes[recipe_id] = previous | frozenset(fields)
+    return changes
+
+
+def attribute_hashes(document: dict[str, Any]) -> dict[str, str]:
+    return {
+        name: hashlib.sha1(
+            json.dumps(value, sort_keys=True).encode(), usedforsecurity=False
+        ).hexdigest()
+        for name, value in document.items()
+        if name != "objectID"
+    }
+
+
+async def _save_hashes(
+    connection: asyncpg.Connection[Any], hashes: dict[int, dict[str, str]]
+) -> None:
+    await connection.executemany(
+        """
+insert into recipe_index_hash (created, modified, recipe_id, attribute_hashes)
+values (now(), now(), $1, $2)
+on conflict (recipe_id) do update
+set modified = now(), attribute_hashes = excluded.attribute_hashes
+""",
+        [(recipe_id, json.dumps(x)) for recipe_id, x in hashes.items()],
+    )
+
+
 async def process_queue(
     connection: asyncpg.Connection[Any],
     *,
-    config: Config,
-    backfill_all: bool,
+    index: SearchIndexAsync,
     log: BoundLogger,
-) -> None:
-    async with SearchClient.create(
-        app_id=config.ALGOLIA_APPLICATION_ID, api_key=config.ALGOLIA_ADMIN_API_KEY
-    ) as client:
-        index = client.init_index("recipes")
-        async with connection.transaction():
-            recipes_to_index = await connection.fetch(
-                """
-select id, recipe_id, deleted
+    batch_size: int,
+) -> int:
+    """
+    Index the `batch_size` recipes that have been queued the longest,
+    returning how many we processed.
+    """
+    async with connection.transaction():
+        # every entry for the recipes, so they're collapsed together
+        queued = await connection.fetch(
+            """
+select id, recipe_id, fields, extract(epoch from now() - created) lag_sec
 from recipe_index_queue
-"""
-            )
-            res = await connection.fetch(
+where recipe_id in (
+    select recipe_id
+    from recipe_index_queue
+    group by recipe_id
+    order by min(id)
+    limit $1
+)
+for update skip locked
+""",
+            batch_size,
+        )
+        if not queued:
+            return 0
+        changes = collapse_queue([(x["recipe_id"], x["fields"]) for x in queued])
+        previous_hashes: dict[int, dict[str, str]] = {
+            row["recipe_id"]: json.loads(row["attribute_hashes"])
+            for row in await connection.fetch(
                 """
-        SELECT
-            json_object(
-                'objectID': id,
-                'id': id,
-                'name': name,
-                'author': author,
-                'source': source,
-                'time': time,
-                'servings': servings,
-                'archived': archived_at is distinct from null,
-                'archived_at': archived_at,
-                'tags': tags,
-                'team_id': team_id,
-                'primary_image': (
-                    select json_object(
-                        'url': 'https://images-cdn.recipeyak.com/' || "key" ,
-                        'background_url': "background_url",
-                        'created_by_id': "created_by_id"
-                    )
-                    from core_upload
-                    where core_upload.id = core_recipe.primary_image_id
-                ),
-                'archived_by_id': (
-                    select
-                        created_by_id
-                    from (
-                        select distinct on (recipe_id)
-                            recipe_id,
-                            action,
-                            created_by_id
-                        from
-                            timeline_event
-                        where
-                            action in ('archived', 'unarchived')
-                        order by
-                            recipe_id,
-                            created desc
-                    ) sub
-                    where
-                        action = 'archived'
-                        and created_by_id is not null
-                        and recipe_id = core_recipe.id
-                ),
-                'favorite_by_user_id': (
-                    select json_agg(distinct user_id)
-                    from recipe_favorite
-                    where recipe_id = core_recipe.id
-                ),
-                'created_by_id': (
-                    select
-                        created_by_id
-                    from
-                        timeline_event
-                    where recipe_id = core_recipe.id
-                        and action = 'created'
-                    limit 1
-                ),
-                'scheduled_by_id': (
-                    select json_agg(distinct created_by_id)
-                    from core_scheduledrecipe
-                    where recipe_id = core_recipe.id
-                        and created_by_id is not null
-                ),
-                'scheduled_count': (
-                    SELECT
-                        count(*)
-                    FROM
-                        core_scheduledrecipe
-                    WHERE
-                        core_scheduledrecipe.recipe_id = core_recipe.id
-                        and core_scheduledrecipe.on > (now() - '1.5 years'::interval)
-                        and core_scheduledrecipe.on < now()
-                ),
-                'scheduled_count_all_time': (
-                    SELECT
-                        count(*)
-                    FROM
-                        core_scheduledrecipe
-                    WHERE
-                        core_scheduledrecipe.recipe_id = core_recipe.id
-                ),
-                'ingredients': (
-                    SELECT
-                        json_agg(ingredient)
-                    FROM (
-                        SELECT
-                            json_object(
-                                'id': id,
-                                'description': "description",
-                                'quantity_name': "quantity" || ' ' || "name",
-                                'quantity_name_description': "quantity" || ' ' || "name" || ', ' || "description",
-                                'recipe_id': "recipe_id",
-                                'quantity': "quantity",
-                                'name': "name",
-                                'optional': "optional"
-                            ) AS ingredient
-                        FROM
-                            core_ingredient
-                        WHERE
-                            recipe_id = core_recipe.id
-                        ORDER BY
-                            position ASC
-                    ) sub
-                )
-            ) recipe
-        FROM
-            core_recipe
-        WHERE
-            team_id IS NOT NULL
-            and (core_recipe.id = ANY($1) or $2);
-        """,
-                [x["recipe_id"] for x in recipes_to_index],
-                backfill_all,
+select recipe_id, attribute_hashes
+from recipe_index_hash
+where recipe_id = ANY($1)
+""",
+                list(changes),
             )
-            updated_recipes = [json.loads(row["recipe"]) for row in res]
+        }
+
+        # we don't know what the index has for recipes we haven't hashed,
+        # so they get every attribute
+        by_fields = dict[frozenset[str] | None, list[int]]()
+        for recipe_id, fields in changes.items():
+            if recipe_id not in previous_hashes:
+                fields = None
+            elif fields is not None:
+                fields |= _TIME_DEPENDENT_ATTRIBUTES
+            by_fields.setdefault(fields, []).append(recipe_id)
+
+        documents = dict[int, tuple[bool, dict[str, Any]]]()
+        for fields, recipe_ids in by_fields.items():
+            for row in await connection.fetch(
+                _documents_sql(sorted(fields) if fields is not None else _ATTRIBUTES)
+                + "and core_recipe.id = ANY($1)",
+                recipe_ids,
+            ):
+                documents[row["id"]] = (fields is None, json.loads(row["recipe"]))
+
+        updated_recipes = list[dict[str, Any]]()
+        partial_updates = list[dict[str, Any]]()
+        hashes = dict[int, dict[str, str]]()
+        for recipe_id, (full, document) in documents.items():
+            previous = previous_hashes.get(recipe_id, {})
+            current = attribute_hashes(document)
+            changed = {
+                name for name, value in current.items() if previous.get(name) != value
+            }
+            if not changed:
+                continue
+            if full:
+                updated_recipes.append(document)
+                hashes[recipe_id] = current
+            else:
+                partial_updates.append(
+                    {"objectID": document["objectID"]}
+                    | {name: document[name] for name in changed}
+                )
+                hashes[recipe_id] = previous | current
+        # deleted, or no longer on a team
+        deleted_recipe_ids = [x for x in changes if x not in documents]
+
+        if updated_recipes:
             await index.save_objects_async(updated_recipes)
+        if partial_updates:
+            await index.partial_update_objects_async(partial_updates)
+        if deleted_recipe_ids:
+            await index.delete_objects_async(str(x) for x in deleted_recipe_ids)
+
+        await _save_hashes(connection, hashes)
+        await connection.execute(
+            "delete from recipe_index_hash where recipe_id = ANY($1)",
+            deleted_recipe_ids,
+        )
+        await connection.execute(
+            "delete from recipe_index_queue where id = ANY($1)",
+            [x["id"] for x in queued],
+        )
+        log.info(
+            "indexed",
+            deleted=len(deleted_recipe_ids),
+            upserted=len(updated_recipes),
+            partially_updated=len(partial_updates),
+            unchanged=len(documents) - len(hashes),
+            # how long the oldest edit waited to be indexed
+            lag_sec=round(max(float(x["lag_sec"]) for x in queued), 3),
+            queue_depth=await connection.fetchval(
+                "select count(*) from recipe_index_queue"
+            ),
+        )
+        return len(changes)
+
+
+@dataclass(frozen=True, slots=True)
+class Batch:
+    last_id: int
+    documents: list[dict[str, Any]]
+
+
+async def upload_batches(
+    batches: AsyncIterator[Batch],
+    *,
+    upload: Callable[[Batch], Coroutine[Any, Any, None]],
+    done: Callable[[Batch], Awaitable[None]],
+    concurrency: int,
+) -> int:
+    """
+    Upload up to `concurrency` batches at a time, returning how many documents
+    we uploaded.
+
+    `done` is called for each batch in order, once it and every batch before
+    it are uploaded, so a checkpoint written there never skips a document.
+    """
+    pending = deque[tuple[Batch, asyncio.Task[None]]]()
+    uploaded = 0
+
+    async def finish_oldest() -> int:
+        batch, task = pending.popleft()
+        await task
+        await done(batch)
+        return len(batch.documents)
+
+    try:
+        async for batch in batches:
+            pending.append((batch, asyncio.create_task(upload(batch))))
+            if len(pending) >= concurrency:
+                uploaded += await finish_oldest()
+        while pending:
+            uploaded += await finish_oldest()
+    finally:
+        for _, task in pending:
+            task.cancel()
+    return uploaded
+
+
+_BACKFILL_CHECKPOINT = "live_search_sync_backfill"
+
+
+async def backfill(
+    pg: asyncpg.Connection[Any],
+    *,
+    index: SearchIndexAsync,
+    log: BoundLogger,
+    batch_size: int,
+    concurrency: int,
+) -> None:
+    """
+    Send every recipe to the index, e.g. to fill a new index.
+
+    We page through the recipes by id, so memory use and transactions stay
+    the size of a batch, and checkpoint the last id we uploaded. Running the
+    backfill again after a crash picks up from the checkpoint, once it
+    finishes the next backfill starts from the beginning.
+    """
+    after_id: int = (
+        await pg.fetchval(
+            "select last_id from job_checkpoint where name = $1",
+            _BACKFILL_CHECKPOINT,
+        )
+        or 0
+    )
+    log = log.bind(batch_size=batch_size, concurrency=concurrency)
+    log.info("starting backfill", after_id=after_id)
+    start = time.monotonic()
+    uploaded = 0
+
+    async def batches() -> AsyncIterator[Batch]:
+        last_id = after_id
+        while True:
+            rows = await pg.fetch(
+                _documents_sql(_ATTRIBUTES)
+                + "and core_recipe.id > $1 ORDER BY core_recipe.id LIMIT $2",
+                last_id,
+                batch_size,
+            )
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            yield Batch(
+                last_id=last_id,
+                documents=[json.loads(row["recipe"]) for row in rows],
+            )
 
-            deleted_recipe_ids = [
-                x["recipe_id"] for x in recipes_to_index if x["deleted"]
-            ]
-            await index.delete_objects_async(deleted_recipe_ids)
+    async def upload(batch: Batch) -> None:
+        await index.save_objects_async(batch.documents)
 
-            ids_to_delete = [x["id"] for x in recipes_to_index]
-            recipes_to_index = await connection.fetch(
+    async def done(batch: Batch) -> None:
+        nonlocal uploaded
+        uploaded += len(batch.documents)
+        async with pg.transaction():
+            await _save_hashes(
+                pg,
+                {
+                    document["objectID"]: attribute_hashes(document)
+                    for document in batch.documents
+                },
+            )
+            await pg.execute(
                 """
-delete from recipe_index_queue where id = ANY($1)
+insert into job_checkpoint (created, modified, name, last_id)
+values (now(), now(), $1, $2)
+on conflict (name) do update
+set modified = now(), last_id = excluded.last_id
 """,
-                ids_to_delete,
-            )
-            log.info(
-                "indexed",
-                deleted=len(deleted_recipe_ids),
-                upserted=len(updated_recipes),
+                _BACKFILL_CHECKPOINT,
+                batch.last_id,
             )
+        log.info(
+            "uploaded batch",
+            last_id=batch.last_id,
+            uploaded=uploaded,
+            docs_per_sec=round(uploaded / (time.monotonic() - start), 1),
+        )
+
+    await upload_batches(batches(), upload=upload, done=done, concurrency=concurrency)
+    await pg.execute("delete from job_checkpoint where name = $1", _BACKFILL_CHECKPOINT)
+    elapsed = time.monotonic() - start
+    log.info(
+        "finished backfill",
+        uploaded=uploaded,
+        total_time_sec=elapsed,
+        docs_per_sec=round(uploaded / elapsed, 1) if elapsed else None,
+    )
 
 
-async def job(*, log: BoundLogger, config: Config, backfill_all: bool) -> None:
+async def job(
+    *,
+    log: BoundLogger,
+    config: Config,
+    backfill_all: bool,
+    batch_size: int,
+    concurrency: int,
+    queue_batch_size: int,
+    debounce_seconds: float,
+    sweep_seconds: float,
+) -> None:
     dsn = str(config.DATABASE_URL)
     pg = await asyncpg.connect(dsn=dsn)
+    async with SearchClient.create(
+        app_id=config.ALGOLIA_APPLICATION_ID, api_key=config.ALGOLIA_ADMIN_API_KEY
+    ) as client:
+        index = client.init_index("recipes")
+        if backfill_all:
+            await backfill(
+                pg,
+                index=index,
+                log=log,
+                batch_size=batch_size,
+                concurrency=concurrency,
+            )
+            return
+        await listen(
+            pg,
+            index=index,
+            log=log,
+            batch_size=queue_batch_size,
+            debounce_seconds=debounce_seconds,
+            sweep_seconds=sweep_seconds,
+        )
 
-    if backfill_all:
-        await process_queue(pg, config=config, backfill_all=backfill_all, log=log)
-        return
 
-    async def callback(
+async def listen(
+    pg: asyncpg.Connection[Any],
+    *,
+    index: SearchIndexAsync,
+    log: BoundLogger,
+    batch_size: int,
+    debounce_seconds: float,
+    sweep_seconds: float,
+) -> None:
+    enqueued = asyncio.Event()
+
+    def callback(
         conn: asyncpg.Connection[Any],
         pid: int,
         channel: str,
         payload: object,
     ) -> None:
-        await process_queue(conn, config=config, backfill_all=backfill_all, log=log)
+        enqueued.set()
 
     await pg.add_listener("recipe_enqueued_for_indexing", callback)  # type: ignore[arg-type]
-    await pg.execute("notify recipe_enqueued_for_indexing")
+    log.info(
+        "starting up",
+        batch_size=batch_size,
+        debounce_seconds=debounce_seconds,
+        sweep_seconds=sweep_seconds,
+    )
 
     while True:
-        await asyncio.sleep(0.5)
-        if random.random() < 0.005:
-            log.info("tick")
+        enqueued.clear()
+        while await process_queue(pg, index=index, log=log, batch_size=batch_size):
+            pass
+        # also sweep the queue now and then, in case we missed a notification
+        try:
+            await asyncio.wait_for(enqueued.wait(), timeout=sweep_seconds)
+        except TimeoutError:
+            if random.random() < 0.05:
+                log.info("tick")
+            continue
+        # a burst of edits sends a notification per statement, wait for the
+        # rest of them so we index the burst together
+        await asyncio.sleep(debounce_seconds)
 
 
-def main(backfill_all: bool = False) -> None:
+def main(
+    backfill_all: bool = False,
+    batch_size: int = 1_000,
+    concurrency: int = 4,
+    queue_batch_size: int = 500,
+    debounce_seconds: float = 0.5,
+    sweep_seconds: float = 30,
+) -> None:
     log = logger.bind(run_id=uuid4().hex)
     log.info("initiate")
     sentry_sdk.init(
@@ -219,7 +554,18 @@ def main(backfill_all: bool = False) -> None:
     )
     config = Config()
     start = time.monotonic()
-    asyncio.run(job(log=log, config=config, backfill_all=backfill_all))
+    asyncio.run(
+        job(
+            log=log,
+            config=config,
+            backfill_all=backfill_all,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            queue_batch_size=queue_batch_size,
+            debounce_seconds=debounce_seconds,
+            sweep_seconds=sweep_seconds,
+        )
+    )
     log.info("done!", total_time_sec=time.monotonic() - start)
     log.info("exiting")
 
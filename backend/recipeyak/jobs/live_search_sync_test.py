@@ -0,0 +1,149 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from datetime import timedelta
+from typing import Any, cast
+
+import asyncpg
+import pytest
+import structlog
+from algoliasearch.search_index_async import SearchIndexAsync
+from django.db import connection
+from django.utils import timezone
+
+from recipeyak.jobs.live_search_sync import (
+    Batch,
+    attribute_hashes,
+    collapse_queue,
+    process_queue,
+    upload_batches,
+)
+from recipeyak.models import Recipe, RecipeIndexQueue, ScheduledRecipe, Team, User
+
+
+def test_collapse_queue() -> None:
+    assert collapse_queue(
+        [
+            (1, ["name"]),
+            (2, ["ingredients"]),
+            (1, ["favorite_by_user_id"]),
+            (2, None),
+            (2, ["tags"]),
+            (3, []),
+        ]
+    ) == {
+        1: frozenset(["name", "favorite_by_user_id"]),
+        # every attribute
+        2: None,
+        3: frozenset(),
+    }
+
+
+def test_attribute_hashes() -> None:
+    hashes = attribute_hashes(
+        {"objectID": 1, "name": "soup", "favorite_by_user_id": [1, 2]}
+    )
+    assert set(hashes) == {"name", "favorite_by_user_id"}
+    assert hashes == attribute_hashes(
+        {"objectID": 1, "favorite_by_user_id": [1, 2], "name": "soup"}
+    )
+    assert (
+        attribute_hashes({"name": "soup", "favorite_by_user_id": [1]})[
+            "favorite_by_user_id"
+        ]
+        != hashes["favorite_by_user_id"]
+    )
+
+
+def test_upload_batches() -> None:
+    in_flight = 0
+    max_in_flight = 0
+    checkpoints = list[int]()
+
+    async def batches() -> AsyncIterator[Batch]:
+        for last_id in range(1, 8):
+            yield Batch(last_id=last_id, documents=[{"objectID": last_id}])
+
+    async def upload(batch: Batch) -> None:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # earlier batches finish last
+        await asyncio.sleep(0.01 / batch.last_id)
+        in_flight -= 1
+
+    async def done(batch: Batch) -> None:
+        checkpoints.append(batch.last_id)
+
+    uploaded = asyncio.run(
+        upload_batches(batches(), upload=upload, done=done, concurrency=3)
+    )
+
+    assert uploaded == 7
+    assert max_in_flight == 3
+    assert checkpoints == [1, 2, 3, 4, 5, 6, 7]
+
+
+class _FakeIndex:
+    def __init__(self) -> None:
+        self.saved = list[dict[str, Any]]()
+        self.partial_updates = list[dict[str, Any]]()
+
+    async def save_objects_async(self, objects: list[dict[str, Any]]) -> None:
+        self.saved.extend(objects)
+
+    async def partial_update_objects_async(self, objects: list[dict[str, Any]]) -> None:
+        self.partial_updates.extend(objects)
+
+    async def delete_objects_async(self, object_ids: Iterable[str]) -> None:
+        pass
+
+
+async def _process_queue(index: _FakeIndex) -> int:
+    settings = connection.settings_dict
+    pg = await asyncpg.connect(
+        host=settings["HOST"],
+        port=settings["PORT"] or None,
+        user=settings["USER"],
+        password=settings["PASSWORD"],
+        database=settings["NAME"],
+    )
+    try:
+        return await process_queue(
+            pg,
+            index=cast(SearchIndexAsync, index),
+            log=structlog.stdlib.get_logger(),
+            batch_size=100,
+        )
+    finally:
+        await pg.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_process_queue_refreshes_scheduled_count(
+    recipe: Recipe, user: User, team: Team
+) -> None:
+    """
+    `scheduled_count` only counts past dates, so it changes without any row
+    changing & gets refreshed whenever the recipe is indexed.
+    """
+    recipe.team = team
+    recipe.save()
+    scheduled = recipe.schedule(
+        on=timezone.now().date() + timedelta(days=7), user=user, team=team
+    )
+    index = _FakeIndex()
+    asyncio.run(_process_queue(index))
+    assert [x["scheduled_count"] for x in index.saved] == [0]
+
+    # a week later, nothing is queued for the date passing
+    ScheduledRecipe.objects.filter(id=scheduled.id).update(
+        on=timezone.now().date() - timedelta(days=1)
+    )
+    RecipeIndexQueue.objects.all().delete()
+
+    recipe.name = "Fancy soup"
+    recipe.save()
+    asyncio.run(_process_queue(index))
+    assert index.partial_updates == [
+        {"objectID": recipe.id, "name": "Fancy soup", "scheduled_count": 1}
+    ]
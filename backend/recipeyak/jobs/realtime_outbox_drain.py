@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+import asyncpg
+import sentry_sdk
+import structlog
+import typer
+from dotenv import load_dotenv
+from pydantic import PostgresDsn
+from pydantic_settings import BaseSettings
+from structlog.stdlib import BoundLogger
+
+from recipeyak.realtime_transport import AblyTransport, Message, Transport
+
+logger = structlog.stdlib.get_logger()
+
+load_dotenv()
+
+
+class Config(BaseSettings):
+    DATABASE_URL: PostgresDsn
+    SENTRY_DSN: str
+    ABLY_API_KEY: str
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxRow:
+    id: int
+    message: Message
+
+
+def _dedupe_key(message: Message) -> tuple[str, str, str]:
+    if (
+        message.name == "recipe_modified"
+        and isinstance(message.data, dict)
+        and message.data.get("patch") is None
+    ):
+        # clients refetch the recipe for these, once is enough, the skipped
+        # sequence numbers only make them refetch sooner
+        return (message.channel, message.name, "refetch")
+    return (message.channel, message.name, json.dumps(message.data))
+
+
+def dedupe_messages(rows: Sequence[OutboxRow]) -> list[Message]:
+    """
+    Drop messages repeated later in the batch, like a burst of
+    `recipe_modified` events without patches for the same recipe.
+
+    We keep the last copy so clients still end up with the latest state when
+    other messages on the channel come in between.
+    """
+    last_seen = dict[tuple[str, str, str], int]()
+    for index, row in enumerate(rows):
+        last_seen[_dedupe_key(row.message)] = index
+    return [rows[index].message for index in sorted(last_seen.values())]
+
+
+# a message that's failed this many times is dropped, clients will have
+# refetched by then anyway
+_MAX_ATTEMPTS = 10
+# the longest we wait between retries of a failing channel
+_MAX_BACKOFF_SECONDS = 300
+
+
+async def drain_outbox(
+    pg: asyncpg.Connection[Any],
+    *,
+    transport: Transport,
+    log: BoundLogger,
+    batch_size: int,
+) -> int:
+    """
+    Publish a batch of messages from the outbox, returning how many rows we
+    processed.
+
+    Rows for a channel we failed to publish to stay in the outbox with an
+    exponential backoff, along with their channel's later rows, so they're
+    retried in order without holding up the other channels.
+    """
+    async with pg.transaction():
+        rows = [
+            OutboxRow(
+                id=row["id"],
+                message=Message(
+                    channel=row["channel"],
+                    name=row["name"],
+                    data=json.loads(row["data"]),
+                ),
+            )
+            for row in await pg.fetch(
+                """
+select id, channel, name, data
+from realtime_outbox
+where channel not in (
+  select channel
+  from realtime_outbox
+  where next_attempt_at > now()
+)
+order by id
+limit $1
+for update skip locked;
+""",
+                batch_size,
+            )
+        ]
+        if not rows:
+            return 0
+        by_channel = dict[str, list[OutboxRow]]()
+        for row in rows:
+            by_channel.setdefault(row.message.channel, []).append(row)
+        results = await asyncio.gather(
+            *(
+                transport.publish(channel, dedupe_messages(channel_rows))
+                for channel, channel_rows in by_channel.items()
+            ),
+            return_exceptions=True,
+        )
+        published_ids = list[int]()
+        failed_ids = list[int]()
+        for result, (channel, channel_rows) in zip(
+            results, by_channel.items(), strict=True
+        ):
+            if isinstance(result, BaseException):
+                log.error("failed to publish", exc_info=result, channel=channel)
+                failed_ids.extend(row.id for row in channel_rows)
+                continue
+            published_ids.extend(row.id for row in channel_rows)
+        await pg.execute(
+            "delete from realtime_outbox where id = any($1::int[])", published_ids
+        )
+        await pg.execute(
+            """
+update realtime_outbox
+set
+  attempts = attempts + 1,
+  next_attempt_at = now() + least(2 ^ attempts, $2) * '1 second'::interval
+where id = any($1::int[])
+""",
+            failed_ids,
+            _MAX_BACKOFF_SECONDS,
+        )
+        dropped = await pg.fetchval(
+            """
+with dropped as (
+  delete from realtime_outbox
+  where id = any($1::int[]) and attempts >= $2
+  returning id
+)
+select count(*) from dropped
+""",
+            failed_ids,
+            _MAX_ATTEMPTS,
+        )
+        if dropped:
+            log.error("dropped messages after retrying", count=dropped)
+        log.info(
+            "published",
+            row_count=len(rows),
+            published_count=len(published_ids),
+            failed_count=len(failed_ids),
+            channel_count=len(by_channel),
+        )
+        return len(published_ids)
+
+
+async def job(*, log: BoundLogger, config: Config, batch_size: int) -> None:
+    pg = await asyncpg.connect(dsn=str(config.DATABASE_URL))
+    transport = AblyTransport(config.ABLY_API_KEY)
+    enqueued = asyncio.Event()
+
+    def callback(
+        conn: asyncpg.Connection[Any],
+        pid: int,
+        channel: str,
+        payload: object,
+    ) -> None:
+        enqueued.set()
+
+    await pg.add_listener("realtime_outbox_enqueued", callback)  # type: ignore[arg-type]
+    log.info("starting up", batch_size=batch_size)
+
+    while True:
+        enqueued.clear()
+        while await drain_outbox(
+            pg, transport=transport, log=log, batch_size=batch_size
+        ):
+            pass
+        # also wake up now and then to retry failed messages
+        try:
+            await asyncio.wait_for(enqueued.wait(), timeout=5)
+        except TimeoutError:
+            if random.random() < 0.05:
+                log.info("tick")
+
+
+def main(batch_size: int = 500) -> None:
+    log = logger.bind(run_id=uuid4().hex)
+    log.info("initiate")
+    sentry_sdk.init(
+        send_default_pii=True,
+        traces_sample_rate=1.0,
+    )
+    config = Config()
+    start = time.monotonic()
+    asyncio.run(job(log=log, config=config, batch_size=batch_size))
+    log.info("done!", total_time_sec=time.monotonic() - start)
+    log.info("exiting")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,121 @@
+import asyncio
+from datetime import timedelta
+
+import asyncpg
+import pytest
+import structlog
+from django.db import connection
+from django.utils import timezone
+
+from recipeyak.jobs.realtime_outbox_drain import (
+    OutboxRow,
+    dedupe_messages,
+    drain_outbox,
+)
+from recipeyak.models import RealtimeOutbox
+from recipeyak.realtime_transport import FakeTransport, Message
+
+
+def test_dedupe_messages() -> None:
+    modified = Message(
+        channel="team:1:recipe:1", name="recipe_modified", data={"id": 1}
+    )
+    calendar_a = Message(channel="team:1:scheduled_recipe", name="updated", data="a")
+    calendar_b = Message(channel="team:1:scheduled_recipe", name="updated", data="b")
+    rows = [
+        OutboxRow(id=1, message=modified),
+        OutboxRow(id=2, message=calendar_a),
+        OutboxRow(
+            id=3,
+            message=Message(
+                channel="team:1:recipe:1",
+                name="recipe_modified",
+                data={"id": 1, "seq": 2, "patch": None},
+            ),
+        ),
+        OutboxRow(id=4, message=calendar_b),
+        OutboxRow(id=5, message=calendar_a),
+        OutboxRow(id=6, message=modified),
+    ]
+
+    # the last copy wins, so a goes out after b
+    assert dedupe_messages(rows) == [calendar_b, calendar_a, modified]
+
+
+def test_dedupe_messages_keeps_patches() -> None:
+    messages = [
+        Message(
+            channel="team:1:recipe:1",
+            name="recipe_modified",
+            data={
+                "id": 1,
+                "seq": seq,
+                "patch": {"kind": "step", "op": "delete", "id": 1},
+            },
+        )
+        for seq in [1, 2]
+    ]
+    rows = [OutboxRow(id=i, message=message) for i, message in enumerate(messages)]
+
+    assert dedupe_messages(rows) == messages
+
+
+class _FailingTransport(FakeTransport):
+    async def publish(self, channel: str, messages: list[Message]) -> None:
+        if channel == "broken":
+            raise ValueError("ably is down")
+        await super().publish(channel, messages)
+
+
+async def _drain(transport: FakeTransport, *, batch_size: int) -> int:
+    settings = connection.settings_dict
+    pg = await asyncpg.connect(
+        host=settings["HOST"],
+        port=settings["PORT"] or None,
+        user=settings["USER"],
+        password=settings["PASSWORD"],
+        database=settings["NAME"],
+    )
+    try:
+        return await drain_outbox(
+            pg,
+            transport=transport,
+            log=structlog.stdlib.get_logger(),
+            batch_size=batch_size,
+        )
+    finally:
+        await pg.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_drain_outbox_backs_off_failing_channels() -> None:
+    """
+    A channel that keeps failing waits out a backoff, instead of filling every
+    batch & holding up the other channels.
+    """
+    broken = RealtimeOutbox.objects.bulk_create(
+        RealtimeOutbox(channel="broken", name="x", data=i) for i in range(3)
+    )
+    RealtimeOutbox.objects.create(channel="team:1:recipe:1", name="x", data=3)
+    transport = _FailingTransport()
+    started_at = timezone.now()
+
+    assert asyncio.run(_drain(transport, batch_size=2)) == 0
+    # the broken channel's third row waits with the others to keep the order
+    assert asyncio.run(_drain(transport, batch_size=2)) == 1
+    assert [channel for channel, _ in transport.published] == ["team:1:recipe:1"]
+    assert list(
+        RealtimeOutbox.objects.order_by("id").values_list("id", "attempts")
+    ) == [(broken[0].id, 1), (broken[1].id, 1), (broken[2].id, 0)]
+    retry_at = RealtimeOutbox.objects.get(id=broken[0].id).next_attempt_at
+    assert retry_at is not None
+    # the first retry waits a second
+    assert retry_at >= started_at + timedelta(seconds=1)
+
+    # once the backoff is up we retry, until we give up
+    RealtimeOutbox.objects.update(attempts=9, next_attempt_at=timezone.now())
+    assert asyncio.run(_drain(transport, batch_size=2)) == 0
+    # the first two failed a tenth time & were dropped
+    assert list(RealtimeOutbox.objects.values_list("id", "attempts")) == [
+        (broken[2].id, 9)
+    ]
@@ -0,0 +1,56 @@
+"""
+Save the recipe versions queued by `enqueue_recipe_version` once their edits
+settle.
+
+Unlike the other jobs this one sets up Django, since the snapshot is built
+with the same models the API uses.
+
+    RECIPE_VERSION_COALESCE_SECONDS=60 python -m recipeyak.jobs.recipe_version_sync
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+import django
+import structlog
+import typer
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "recipeyak.django.settings")
+django.setup()
+from django.db import close_old_connections  # noqa: E402
+
+from recipeyak import config  # noqa: E402
+from recipeyak.versioning import save_queued_recipe_versions  # noqa: E402
+
+logger = structlog.stdlib.get_logger()
+
+
+def main(poll_seconds: float = 5.0, batch_size: int = 100) -> None:
+    log = logger.bind(run_id=uuid4().hex)
+    log.info("initiate")
+    window = timedelta(seconds=config.RECIPE_VERSION_COALESCE_SECONDS)
+    log.info("starting up", window_sec=window.total_seconds())
+    try:
+        while True:
+            # django only does this per request, we don't want a dropped
+            # connection to take down the job
+            close_old_connections()
+            start = time.monotonic()
+            while saved := save_queued_recipe_versions(window=window, limit=batch_size):
+                log.info(
+                    "saved versions",
+                    count=saved,
+                    total_time_sec=time.monotonic() - start,
+                )
+            time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        pass
+    log.info("exiting")
+
+
+if __name__ == "__main__":
+    typer.run(main)
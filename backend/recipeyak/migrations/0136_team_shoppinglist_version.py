@@ -0,0 +1,17 @@
+# Generated by Django 3.2.9 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0135_auto_20240420_2144"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="team",
+            name="shoppinglist_version",
+            field=models.IntegerField(default=0),
+        ),
+    ]
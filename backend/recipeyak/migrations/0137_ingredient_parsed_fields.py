@@ -0,0 +1,62 @@
+# Generated by Django 3.2.25 on 2026-10-18 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0136_team_shoppinglist_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_base_quantity_denominator",
+            field=models.DecimalField(decimal_places=0, max_digits=100, null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_base_quantity_numerator",
+            field=models.DecimalField(decimal_places=0, max_digits=100, null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_base_unit",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_category",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_name",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_quantity_denominator",
+            field=models.DecimalField(decimal_places=0, max_digits=100, null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_quantity_numerator",
+            field=models.DecimalField(decimal_places=0, max_digits=100, null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_singular_name",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_unit",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_unknown_unit",
+            field=models.TextField(null=True),
+        ),
+    ]
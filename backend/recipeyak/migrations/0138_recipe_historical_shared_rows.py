@@ -0,0 +1,34 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:33
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0137_ingredient_parsed_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipehistorical",
+            name="ingredient_historical_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(), null=True, size=None
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipehistorical",
+            name="section_historical_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(), null=True, size=None
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipehistorical",
+            name="step_historical_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(), null=True, size=None
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0138_recipe_historical_shared_rows"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeVersionQueue",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("recipe_id", models.IntegerField()),
+                ("actor_id", models.IntegerField(null=True)),
+            ],
+            options={
+                "db_table": "recipe_version_queue",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="recipeversionqueue",
+            index=models.Index(
+                fields=["recipe_id", "created"], name="recipe_vers_recipe__3a43f7_idx"
+            ),
+        ),
+    ]
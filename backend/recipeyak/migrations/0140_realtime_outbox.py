@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0139_recipe_version_queue"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RealtimeOutbox",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("channel", models.TextField()),
+                ("name", models.TextField()),
+                ("data", models.JSONField()),
+            ],
+            options={
+                "db_table": "realtime_outbox",
+            },
+        ),
+        migrations.RunSQL(
+            """
+CREATE OR REPLACE FUNCTION notify_realtime_outbox()
+RETURNS TRIGGER AS $$
+BEGIN
+    notify realtime_outbox_enqueued;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notify_realtime_outbox_trigger
+AFTER INSERT ON realtime_outbox
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_realtime_outbox();
+""",
+            """
+DROP TRIGGER notify_realtime_outbox_trigger on realtime_outbox;
+DROP function notify_realtime_outbox;
+""",
+        ),
+    ]
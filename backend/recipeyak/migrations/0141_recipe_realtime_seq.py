@@ -0,0 +1,20 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0140_realtime_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="realtime_seq",
+            field=models.IntegerField(
+                default=0,
+                help_text="Sequence number of the last realtime message about the recipe.",
+            ),
+        ),
+    ]
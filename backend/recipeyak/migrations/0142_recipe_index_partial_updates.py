@@ -0,0 +1,163 @@
+# Generated by Django 3.2.25 on 2026-10-18 05:01
+
+import django.contrib.postgres.fields
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0141_recipe_realtime_seq"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeIndexHash",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("recipe_id", models.IntegerField(primary_key=True, serialize=False)),
+                ("attribute_hashes", models.JSONField()),
+            ],
+            options={
+                "db_table": "recipe_index_hash",
+            },
+        ),
+        migrations.AddField(
+            model_name="recipeindexqueue",
+            name="fields",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.TextField(),
+                help_text="Search index attributes that changed, null for all of them.",
+                null=True,
+                size=None,
+            ),
+        ),
+        migrations.RunSQL(
+            """
+CREATE OR REPLACE FUNCTION update_core_recipe_indexing()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed text[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted, fields)
+        VALUES (now(), now(), NEW.id, false, null);
+    ELSEIF TG_OP = 'UPDATE' THEN
+        -- null reindexes everything
+        changed := null;
+        IF NEW.team_id IS NOT DISTINCT FROM OLD.team_id THEN
+            changed := array_remove(array[
+                case when NEW.name is distinct from OLD.name then 'name' end,
+                case when NEW.author is distinct from OLD.author then 'author' end,
+                case when NEW.source is distinct from OLD.source then 'source' end,
+                case when NEW.time is distinct from OLD.time then 'time' end,
+                case when NEW.servings is distinct from OLD.servings then 'servings' end,
+                case when NEW.archived_at is distinct from OLD.archived_at then 'archived' end,
+                case when NEW.archived_at is distinct from OLD.archived_at then 'archived_at' end,
+                case when NEW.tags is distinct from OLD.tags then 'tags' end,
+                case when NEW.primary_image_id is distinct from OLD.primary_image_id then 'primary_image' end
+            ], null);
+            -- nothing we index changed, e.g. only `realtime_seq`
+            IF cardinality(changed) = 0 THEN
+                RETURN NEW;
+            END IF;
+        END IF;
+        INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted, fields)
+        VALUES (now(), now(), NEW.id, false, changed);
+    ELSEIF TG_OP = 'DELETE' THEN
+        INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted, fields)
+        VALUES (now(), now(), OLD.id, true, null);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- for tables with a `recipe_id`, the trigger's arguments are the search
+-- index attributes that depend on the table
+CREATE OR REPLACE FUNCTION enqueue_recipe_indexing()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed_recipe_id integer;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_recipe_id := OLD.recipe_id;
+    ELSE
+        changed_recipe_id := NEW.recipe_id;
+    END IF;
+    IF changed_recipe_id IS NOT NULL THEN
+        INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted, fields)
+        VALUES (now(), now(), changed_recipe_id, false, TG_ARGV);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- deleting an ingredient used to mark the whole recipe as deleted
+DROP TRIGGER ingredient_modified_trigger on core_ingredient;
+DROP function update_core_ingredient_indexing;
+
+CREATE TRIGGER ingredient_modified_trigger
+AFTER INSERT OR UPDATE OR DELETE ON core_ingredient
+FOR EACH ROW
+EXECUTE FUNCTION enqueue_recipe_indexing('ingredients');
+
+CREATE TRIGGER recipe_favorite_modified_trigger
+AFTER INSERT OR DELETE ON recipe_favorite
+FOR EACH ROW
+EXECUTE FUNCTION enqueue_recipe_indexing('favorite_by_user_id');
+
+CREATE TRIGGER scheduled_recipe_modified_trigger
+AFTER INSERT OR UPDATE OR DELETE ON core_scheduledrecipe
+FOR EACH ROW
+EXECUTE FUNCTION enqueue_recipe_indexing(
+    'scheduled_by_id', 'scheduled_count', 'scheduled_count_all_time'
+);
+
+CREATE TRIGGER timeline_event_modified_trigger
+AFTER INSERT OR DELETE ON timeline_event
+FOR EACH ROW
+EXECUTE FUNCTION enqueue_recipe_indexing('archived_by_id', 'created_by_id');
+""",
+            """
+DROP TRIGGER timeline_event_modified_trigger on timeline_event;
+DROP TRIGGER scheduled_recipe_modified_trigger on core_scheduledrecipe;
+DROP TRIGGER recipe_favorite_modified_trigger on recipe_favorite;
+DROP TRIGGER ingredient_modified_trigger on core_ingredient;
+DROP function enqueue_recipe_indexing;
+
+CREATE OR REPLACE FUNCTION update_core_ingredient_indexing()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+        INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted)
+        VALUES (now(), now(), NEW.recipe_id, false);
+    ELSEIF TG_OP = 'DELETE' THEN
+        INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted)
+        VALUES (now(), now(), OLD.recipe_id, true);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER ingredient_modified_trigger
+AFTER INSERT OR UPDATE OR DELETE ON core_ingredient
+FOR EACH ROW
+EXECUTE FUNCTION update_core_ingredient_indexing();
+
+CREATE OR REPLACE FUNCTION update_core_recipe_indexing()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+        INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted)
+        VALUES (now(), now(), NEW.id, false);
+    ELSEIF TG_OP = 'DELETE' THEN
+        INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted)
+        VALUES (now(), now(), OLD.id, true);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+""",
+        ),
+    ]
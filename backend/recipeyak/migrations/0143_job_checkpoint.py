@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-18 05:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0142_recipe_index_partial_updates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobCheckpoint",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("name", models.TextField(primary_key=True, serialize=False)),
+                ("last_id", models.IntegerField()),
+            ],
+            options={
+                "db_table": "job_checkpoint",
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 3.2.25 on 2026-10-18 05:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0143_job_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="team",
+            name="schedule_modified",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunSQL(
+            """
+-- the calendar feed's ETag & Last-Modified, see `ical_retrieve_view`, so
+-- it has to move forward for every change, even within a transaction
+CREATE FUNCTION touch_team_schedule_modified(team_ids integer[])
+RETURNS void AS $$
+    UPDATE core_team
+    SET schedule_modified = greatest(
+        schedule_modified + '1 microsecond'::interval, clock_timestamp()
+    )
+    WHERE id = ANY(team_ids);
+$$ LANGUAGE sql;
+
+CREATE FUNCTION scheduled_recipe_schedule_modified()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM touch_team_schedule_modified(ARRAY[NEW.team_id]);
+    ELSEIF TG_OP = 'UPDATE' THEN
+        PERFORM touch_team_schedule_modified(ARRAY[OLD.team_id, NEW.team_id]);
+    ELSE
+        PERFORM touch_team_schedule_modified(ARRAY[OLD.team_id]);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER scheduled_recipe_schedule_modified_trigger
+AFTER INSERT OR UPDATE OR DELETE ON core_scheduledrecipe
+FOR EACH ROW
+EXECUTE FUNCTION scheduled_recipe_schedule_modified();
+
+-- events show the recipe's name & time
+CREATE FUNCTION recipe_schedule_modified()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM touch_team_schedule_modified(ARRAY(
+        SELECT DISTINCT team_id
+        FROM core_scheduledrecipe
+        WHERE recipe_id = NEW.id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER recipe_schedule_modified_trigger
+AFTER UPDATE OF name, time ON core_recipe
+FOR EACH ROW
+WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.time IS DISTINCT FROM NEW.time)
+EXECUTE FUNCTION recipe_schedule_modified();
+
+-- the calendar's description has the team's name
+CREATE FUNCTION team_schedule_modified()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.schedule_modified := greatest(
+        OLD.schedule_modified + '1 microsecond'::interval, clock_timestamp()
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER team_schedule_modified_trigger
+BEFORE UPDATE OF name ON core_team
+FOR EACH ROW
+WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION team_schedule_modified();
+""",
+            """
+DROP TRIGGER team_schedule_modified_trigger ON core_team;
+DROP FUNCTION team_schedule_modified;
+DROP TRIGGER recipe_schedule_modified_trigger ON core_recipe;
+DROP FUNCTION recipe_schedule_modified;
+DROP TRIGGER scheduled_recipe_schedule_modified_trigger ON core_scheduledrecipe;
+DROP FUNCTION scheduled_recipe_schedule_modified;
+DROP FUNCTION touch_team_schedule_modified;
+""",
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0144_team_schedule_modified"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="scheduledrecipe",
+            index=models.Index(
+                fields=["team", "on", "id"], name="scheduled_recipe_team_on"
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-18 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0145_scheduled_recipe_team_on"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="realtimeoutbox",
+            name="attempts",
+            field=models.IntegerField(
+                default=0, help_text="Times we've failed to publish the message."
+            ),
+        ),
+        migrations.AddField(
+            model_name="realtimeoutbox",
+            name="next_attempt_at",
+            field=models.DateTimeField(
+                help_text="When to retry after failing, the channel's later messages wait too.",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="realtimeoutbox",
+            index=models.Index(
+                condition=models.Q(("next_attempt_at__isnull", False)),
+                fields=["next_attempt_at"],
+                name="realtime_outbox_retry",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0146_realtime_outbox_retry"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+-- `primary_image` is built from the upload row, so changing the upload
+-- needs to reindex every recipe using it
+CREATE OR REPLACE FUNCTION enqueue_upload_recipe_indexing()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO recipe_index_queue (created, modified, recipe_id, deleted, fields)
+    SELECT now(), now(), core_recipe.id, false, array['primary_image']
+    FROM core_recipe
+    WHERE core_recipe.primary_image_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER upload_modified_trigger
+AFTER UPDATE OF key, background_url, created_by_id ON core_upload
+FOR EACH ROW
+WHEN (
+    NEW.key IS DISTINCT FROM OLD.key
+    OR NEW.background_url IS DISTINCT FROM OLD.background_url
+    OR NEW.created_by_id IS DISTINCT FROM OLD.created_by_id
+)
+EXECUTE FUNCTION enqueue_upload_recipe_indexing();
+""",
+            """
+DROP TRIGGER upload_modified_trigger on core_upload;
+DROP function enqueue_upload_recipe_indexing;
+""",
+        ),
+    ]
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404
 
 from recipeyak.models.ingredient import Ingredient
 from recipeyak.models.ingredient_historical import IngredientHistorical  # noqa: F401
 from recipeyak.models.invite import Invite  # noqa: F401
+from recipeyak.models.job_checkpoint import JobCheckpoint  # noqa: F401
 from recipeyak.models.membership import Membership, get_random_ical_id  # noqa: F401
 from recipeyak.models.note import Note
 from recipeyak.models.note_historical import NoteHistorical as NoteHistorical
 from recipeyak.models.reaction import Reaction
+from recipeyak.models.realtime_outbox import RealtimeOutbox  # noqa: F401
 from recipeyak.models.recipe import Recipe
 from recipeyak.models.recipe_change import ChangeType, RecipeChange  # noqa: F401
 from recipeyak.models.recipe_cook_checklist_check import (
@@ -17,7 +21,9 @@ from recipeyak.models.recipe_cook_checklist_check import (
 )
 from recipeyak.models.recipe_favorite import RecipeFavorite  # noqa: F401
 from recipeyak.models.recipe_historical import RecipeHistorical  # noqa: F401
+from recipeyak.models.recipe_index_hash import RecipeIndexHash  # noqa: F401
 from recipeyak.models.recipe_index_queue import RecipeIndexQueue  # noqa: F401
+from recipeyak.models.recipe_version_queue import RecipeVersionQueue  # noqa: F401
 from recipeyak.models.recipe_view import RecipeView  # noqa: F401
 from recipeyak.models.schedule_event import ScheduleEvent  # noqa: F401
 from recipeyak.models.scheduled_recipe import ScheduledRecipe  # noqa: F401
@@ -57,8 +63,15 @@ def get_team_by_id(*, user_id: int, team_id: int) -> Team:
     )
 
 
-def filter_recipes(*, team: Team) -> QuerySet[Recipe]:
-    return Recipe.objects.filter(team=team).prefetch_related(
+RecipeProfile = Literal["minimal", "detail", "export"]
+
+# Relations to prefetch for each profile, so call sites only load what they
+# serialize.
+_RECIPE_PREFETCHES: dict[RecipeProfile, tuple[str, ...]] = {
+    # access checks & writes, also what `recipe__in` subqueries use
+    "minimal": (),
+    # everything `serialize_recipe` touches
+    "detail": (
         "step_set",
         "ingredient_set",
         "scheduledrecipe_set",
@@ -68,6 +81,7 @@ def filter_recipes(*, team: Team) -> QuerySet[Recipe]:
         "notes__uploads",
         "notes__reactions",
         "notes__reactions__created_by",
+        "notes__reactions__created_by__profile_upload",
         "timelineevent_set",
         "timelineevent_set__created_by",
         "timelineevent_set__created_by__profile_upload",
@@ -75,11 +89,24 @@ def filter_recipes(*, team: Team) -> QuerySet[Recipe]:
         "primary_image",
         "primary_image__created_by",
         "primary_image__recipe",
+    ),
+    # `serialize_export_recipe`
+    "export": ("step_set", "ingredient_set", "section_set"),
+}
+
+
+def filter_recipes(
+    *, team: Team, profile: RecipeProfile = "minimal"
+) -> QuerySet[Recipe]:
+    return Recipe.objects.filter(team=team).prefetch_related(
+        *_RECIPE_PREFETCHES[profile]
     )
 
 
-def filter_recipe_or_404(*, recipe_id: int, team: Team) -> Recipe:
-    return get_object_or_404(filter_recipes(team=team), pk=recipe_id)
+def filter_recipe_or_404(
+    *, recipe_id: int, team: Team, profile: RecipeProfile = "minimal"
+) -> Recipe:
+    return get_object_or_404(filter_recipes(team=team, profile=profile), pk=recipe_id)
 
 
 def filter_cook_checklist(*, team: Team) -> QuerySet[RecipeCookChecklistCheck]:
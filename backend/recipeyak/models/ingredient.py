@@ -1,8 +1,13 @@
+from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from django.db import models
 
 from recipeyak.models.base import CommonInfo
+from recipeyak.parsed_ingredient import (
+    ParsedIngredient,
+    parse_storable_ingredient_fields,
+)
 
 if TYPE_CHECKING:
     from recipeyak.models import Recipe  # noqa: F401
@@ -31,6 +36,27 @@ class Ingredient(CommonInfo):
     position = models.TextField(db_column="position")
     optional = models.BooleanField(default=False)
 
+    # Parsed from `quantity` & `name` on write so shopping lists don't have to
+    # reparse them. Null until parsed, see `jobs/backfill_parsed_ingredients.py`.
+    parsed_name = models.TextField(null=True)
+    parsed_singular_name = models.TextField(null=True)
+    parsed_unit = models.TextField(null=True)
+    parsed_quantity_numerator = models.DecimalField(
+        max_digits=100, decimal_places=0, null=True
+    )
+    parsed_quantity_denominator = models.DecimalField(
+        max_digits=100, decimal_places=0, null=True
+    )
+    parsed_unknown_unit = models.TextField(null=True)
+    parsed_base_unit = models.TextField(null=True)
+    parsed_base_quantity_numerator = models.DecimalField(
+        max_digits=100, decimal_places=0, null=True
+    )
+    parsed_base_quantity_denominator = models.DecimalField(
+        max_digits=100, decimal_places=0, null=True
+    )
+    parsed_category = models.TextField(null=True)
+
     class Meta:
         ordering = ["position"]  # noqa: RUF012
         db_table = "core_ingredient"
@@ -41,6 +67,39 @@ class Ingredient(CommonInfo):
             )
         ]
 
+    def update_parsed_fields(self) -> ParsedIngredient | None:
+        parsed = parse_storable_ingredient_fields(
+            quantity=self.quantity, name=self.name
+        )
+        if parsed is None:
+            self.clear_parsed_fields()
+            return None
+        self.parsed_name = parsed.name
+        self.parsed_singular_name = parsed.singular_name
+        self.parsed_unit = parsed.unit.value
+        self.parsed_quantity_numerator = Decimal(parsed.quantity.numerator)
+        self.parsed_quantity_denominator = Decimal(parsed.quantity.denominator)
+        self.parsed_unknown_unit = parsed.unknown_unit
+        self.parsed_base_unit = parsed.base_unit.value
+        self.parsed_base_quantity_numerator = Decimal(parsed.base_quantity.numerator)
+        self.parsed_base_quantity_denominator = Decimal(
+            parsed.base_quantity.denominator
+        )
+        self.parsed_category = parsed.category
+        return parsed
+
+    def clear_parsed_fields(self) -> None:
+        self.parsed_name = None
+        self.parsed_singular_name = None
+        self.parsed_unit = None
+        self.parsed_quantity_numerator = None
+        self.parsed_quantity_denominator = None
+        self.parsed_unknown_unit = None
+        self.parsed_base_unit = None
+        self.parsed_base_quantity_numerator = None
+        self.parsed_base_quantity_denominator = None
+        self.parsed_category = None
+
     def __repr__(self) -> str:
         optional = "[optional]" if self.optional else ""
         return f"<quantity={self.quantity} {self.name} description={self.description} recipe={self.recipe} {optional}>"
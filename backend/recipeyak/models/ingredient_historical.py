@@ -13,6 +13,7 @@ if TYPE_CHECKING:
 class IngredientHistorical(CommonInfo):
     id: int
     team = models.ForeignKey["Team"]("Team", on_delete=models.CASCADE, null=True)
+    team_id: int | None
     recipe_historical = models.ForeignKey["RecipeHistorical"](
         "RecipeHistorical", on_delete=models.CASCADE
     )
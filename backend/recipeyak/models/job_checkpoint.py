@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+
+class JobCheckpoint(CommonInfo):
+    """
+    How far a long running job got, so it can pick up where it left off
+    after a crash or a deploy.
+    """
+
+    name = models.TextField(primary_key=True)
+    last_id = models.IntegerField()
+
+    objects = Manager["JobCheckpoint"]()
+
+    class Meta:
+        db_table = "job_checkpoint"
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+
+class RealtimeOutbox(CommonInfo):
+    """
+    Realtime messages written in the same transaction as the change they
+    describe, published by `recipeyak.jobs.realtime_outbox_drain`.
+    """
+
+    id = models.AutoField(primary_key=True)
+    channel = models.TextField()
+    name = models.TextField()
+    data = models.JSONField[Any]()
+    attempts = models.IntegerField(
+        default=0, help_text="Times we've failed to publish the message."
+    )
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        help_text="When to retry after failing, the channel's later messages wait too.",
+    )
+
+    objects = Manager["RealtimeOutbox"]()
+
+    class Meta:
+        db_table = "realtime_outbox"
+        indexes = (
+            models.Index(
+                fields=["next_attempt_at"],
+                name="realtime_outbox_retry",
+                condition=models.Q(next_attempt_at__isnull=False),
+            ),
+        )
@@ -50,6 +50,10 @@ class Recipe(CommonInfo):
         "Upload", related_name="+", on_delete=models.SET_NULL, null=True
     )
     primary_image_id: int
+    realtime_seq = models.IntegerField(
+        default=0,
+        help_text="Sequence number of the last realtime message about the recipe.",
+    )
     objects = Manager["Recipe"]()
 
     class Meta:
@@ -39,11 +39,21 @@ class RecipeHistorical(CommonInfo):
     primary_image = models.ForeignKey["Upload"](
         "Upload", related_name="+", on_delete=models.PROTECT, null=True
     )
+    # The rows that make up this version. Rows that didn't change are shared
+    # with the previous version, so `recipe_historical` on a row is the
+    # version that introduced it, see `save_recipe_version`.
+    #
+    # Null for versions saved before we shared rows, their rows are the ones
+    # pointing at them, until `compact_recipe_history` fills these in.
+    ingredient_historical_ids = ArrayField(models.IntegerField(), null=True)
+    section_historical_ids = ArrayField(models.IntegerField(), null=True)
+    step_historical_ids = ArrayField(models.IntegerField(), null=True)
     objects = Manager["RecipeHistorical"]()
 
     class Meta:
         db_table = "recipe_historical"
 
+    # rows introduced by this version
     ingredient_historical_set: RelatedManager[IngredientHistorical]
     section_historical_set: RelatedManager[SectionHistorical]
     step_historical_set: RelatedManager[StepHistorical]
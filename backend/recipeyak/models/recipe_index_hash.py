@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+
+class RecipeIndexHash(CommonInfo):
+    """
+    Hashes of the attributes we last sent to the search index for a recipe,
+    written by `recipeyak.jobs.live_search_sync`.
+    """
+
+    recipe_id = models.IntegerField(primary_key=True)
+    attribute_hashes = models.JSONField[dict[str, Any]]()
+
+    objects = Manager["RecipeIndexHash"]()
+
+    class Meta:
+        db_table = "recipe_index_hash"
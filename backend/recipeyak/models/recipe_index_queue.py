@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.db.models.manager import Manager
 
@@ -10,6 +11,11 @@ class RecipeIndexQueue(CommonInfo):
     id = models.AutoField(primary_key=True)
     recipe_id = models.IntegerField()
     deleted = models.BooleanField(default=False)
+    fields = ArrayField(
+        base_field=models.TextField(),
+        null=True,
+        help_text="Search index attributes that changed, null for all of them.",
+    )
 
     objects = Manager["RecipeIndexQueue"]()
 
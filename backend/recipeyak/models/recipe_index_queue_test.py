@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from recipeyak.models import Recipe, RecipeFavorite, RecipeIndexQueue, Upload, User
+
+pytestmark = pytest.mark.django_db
+
+
+def _queued(recipe_id: int) -> list[tuple[bool, list[str] | None]]:
+    """
+    The triggers write to the queue, see `recipeyak.jobs.live_search_sync`.
+    """
+    queued = list(
+        RecipeIndexQueue.objects.filter(recipe_id=recipe_id)
+        .order_by("id")
+        .values_list("deleted", "fields")
+    )
+    RecipeIndexQueue.objects.filter(recipe_id=recipe_id).delete()
+    return queued
+
+
+def test_queue_records_changed_fields(recipe: Recipe, user: User) -> None:
+    _queued(recipe.id)
+
+    recipe.name = "Fancy soup"
+    recipe.save()
+    assert _queued(recipe.id) == [(False, ["name"])]
+
+    Recipe.objects.filter(id=recipe.id).update(realtime_seq=10)
+    assert _queued(recipe.id) == []
+
+    RecipeFavorite.objects.create(recipe=recipe, user=user)
+    assert _queued(recipe.id) == [(False, ["favorite_by_user_id"])]
+
+    recipe.ingredient_set.all()[:1].get().delete()
+    assert _queued(recipe.id) == [(False, ["ingredients"])]
+
+    recipe_id = recipe.id
+    recipe.delete()
+    assert (True, None) in _queued(recipe_id)
+
+
+def test_queue_records_primary_image_upload_changes(recipe: Recipe, user: User) -> None:
+    _queued(recipe.id)
+    upload = Upload.objects.create(
+        created_by=user,
+        bucket="recipeyak",
+        key="image.jpg",
+        content_type="image/jpeg",
+        recipe=recipe,
+    )
+    recipe.primary_image = upload
+    recipe.save()
+    assert _queued(recipe.id) == [(False, ["primary_image"])]
+
+    # e.g. `backfill_image_placeholders` filling in the placeholder
+    upload.background_url = "data:image/jpeg;base64,abc"
+    upload.save()
+    assert _queued(recipe.id) == [(False, ["primary_image"])]
+
+    upload.completed = True
+    upload.save()
+    assert _queued(recipe.id) == []
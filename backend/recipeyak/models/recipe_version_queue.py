@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+
+class RecipeVersionQueue(CommonInfo):
+    """
+    Recipe edits waiting to be saved as a version, see
+    `recipeyak.versioning.enqueue_recipe_version`.
+    """
+
+    id = models.AutoField(primary_key=True)
+    recipe_id = models.IntegerField()
+    actor_id = models.IntegerField(null=True)
+
+    objects = Manager["RecipeVersionQueue"]()
+
+    class Meta:
+        db_table = "recipe_version_queue"
+        indexes = (models.Index(fields=["recipe_id", "created"]),)
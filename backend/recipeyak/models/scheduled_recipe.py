@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date
 from typing import TYPE_CHECKING
 
-from django.db import models
+from django.db import models, transaction
 
 from recipeyak.models.base import CommonInfo
 
@@ -24,9 +24,12 @@ class ScheduledRecipeManager(models.Manager["ScheduledRecipe"]):
         """
         add to existing scheduled recipe count for dupes
         """
-        return ScheduledRecipe.objects.create(
-            recipe=recipe, on=on, team=team, created_by=user
-        )
+        with transaction.atomic():
+            scheduled_recipe = ScheduledRecipe.objects.create(
+                recipe=recipe, on=on, team=team, created_by=user
+            )
+            team.invalidate_shoppinglists()
+        return scheduled_recipe
 
 
 class ScheduledRecipe(CommonInfo):
@@ -48,3 +51,7 @@ class ScheduledRecipe(CommonInfo):
     class Meta:
         db_table = "core_scheduledrecipe"
         ordering = ["-on"]  # noqa: RUF012
+        # the id breaks ties for pagination, see `calendar_days_list_view`
+        indexes = (
+            models.Index(fields=["team", "on", "id"], name="scheduled_recipe_team_on"),
+        )
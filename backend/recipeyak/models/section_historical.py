@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 class SectionHistorical(CommonInfo):
     id: int
     team = models.ForeignKey["Team"]("Team", on_delete=models.CASCADE, null=True)
+    team_id: int | None
     recipe_historical = models.ForeignKey["RecipeHistorical"](
         "RecipeHistorical", on_delete=models.CASCADE
     )
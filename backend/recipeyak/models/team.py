@@ -3,8 +3,9 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Literal
 
 from django.db import models, transaction
-from django.db.models import QuerySet
+from django.db.models import F, QuerySet
 from django.db.models.manager import Manager
+from django.utils import timezone
 
 from recipeyak.models.base import CommonInfo
 from recipeyak.models.invite import Invite
@@ -21,6 +22,11 @@ if TYPE_CHECKING:
 class Team(CommonInfo):
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=255)
+    # bumped whenever a write could change one of the team's shopping lists
+    shoppinglist_version = models.IntegerField(default=0)
+    # bumped by triggers whenever the team's calendar feed could change, see
+    # `ical_retrieve_view`
+    schedule_modified = models.DateTimeField(default=timezone.now)
 
     objects = Manager["Team"]()
 
@@ -67,6 +73,17 @@ class Team(CommonInfo):
             email=user.email, team=self, level=level, creator=creator
         )
 
+    def invalidate_shoppinglists(self) -> None:
+        """
+        Mark the team's cached shopping lists as stale.
+
+        Call this in the same transaction as the write, or after it, otherwise
+        a concurrent request could cache the old data under the new version.
+        """
+        Team.objects.filter(id=self.id).update(
+            shoppinglist_version=F("shoppinglist_version") + 1
+        )
+
     def admins(self) -> QuerySet[Membership]:
         return Membership.objects.filter(team=self).filter(
             is_active=True, level=Membership.ADMIN
@@ -0,0 +1,99 @@
+"""
+The parts of an ingredient that shopping lists care about, parsed once when
+the ingredient is written and stored alongside it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+from fractions import Fraction
+
+from recipeyak.category import category
+from recipeyak.combine import combine_quantities, normalize_ingredient_name
+from recipeyak.inflection import singularize
+from recipeyak.parsing import BaseUnit, Quantity, Unit, parse_quantity
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ParsedIngredient:
+    name: str
+    """
+    normalized name, e.g., `Green-Onions` -> `green onions`
+    """
+    singular_name: str
+    unit: Unit
+    quantity: Fraction
+    """
+    quantity in `unit`, exactly as the parser computed it
+    """
+    unknown_unit: str | None
+    base_unit: BaseUnit
+    base_quantity: Fraction
+    """
+    quantity in grams for mass & milliliters for volume, otherwise the same
+    as `quantity`
+    """
+    category: str
+
+    def to_quantity(self) -> Quantity:
+        return Quantity(
+            quantity=Decimal(self.quantity.numerator)
+            / Decimal(self.quantity.denominator),
+            unit=self.unit,
+            unknown_unit=self.unknown_unit,
+        )
+
+
+def parse_ingredient_fields(*, quantity: str, name: str) -> ParsedIngredient:
+    parsed_quantity = parse_quantity(quantity)
+    normalized_name = normalize_ingredient_name(name=name)
+    return ParsedIngredient(
+        name=normalized_name,
+        singular_name=singularize(normalized_name),
+        unit=parsed_quantity.unit,
+        quantity=Fraction(parsed_quantity.quantity),
+        unknown_unit=parsed_quantity.unknown_unit,
+        base_unit=parsed_quantity.unit.base_unit(),
+        base_quantity=Fraction(parsed_quantity.to_base_unit().quantity),
+        category=category(normalized_name),
+    )
+
+
+# digits in the numerator & denominator columns, see `Ingredient`
+_MAX_DIGITS = 100
+
+
+def parse_storable_ingredient_fields(
+    *, quantity: str, name: str
+) -> ParsedIngredient | None:
+    """
+    `parse_ingredient_fields`, or None when we can't store the result, e.g.,
+    `1/0 cups` or a quantity with more digits than the columns hold.
+
+    Those ingredients are left unparsed & shopping lists parse them on read.
+    """
+    try:
+        parsed = parse_ingredient_fields(quantity=quantity, name=name)
+    except ArithmeticError:
+        return None
+    fractions = (parsed.quantity, parsed.base_quantity)
+    if any(
+        len(str(abs(part))) > _MAX_DIGITS
+        for fraction in fractions
+        for part in (fraction.numerator, fraction.denominator)
+    ):
+        return None
+    return parsed
+
+
+def combine_parsed_ingredients(
+    ingredients: Iterable[ParsedIngredient],
+) -> dict[str, list[Quantity]]:
+    """
+    Same as `combine_ingredients`, without parsing anything.
+    """
+    return combine_quantities(
+        (ingr.name, ingr.singular_name, ingr.to_quantity()) for ingr in ingredients
+    )
@@ -0,0 +1,56 @@
+import csv
+from fractions import Fraction
+from pathlib import Path
+
+from recipeyak.combine import combine_ingredients
+from recipeyak.combine_bench import _synthetic_ingredients
+from recipeyak.parsed_ingredient import (
+    combine_parsed_ingredients,
+    parse_ingredient_fields,
+    parse_storable_ingredient_fields,
+)
+from recipeyak.parsing import BaseUnit, Unit
+
+
+def test_parse_ingredient_fields() -> None:
+    parsed = parse_ingredient_fields(quantity="1 1/2 cups", name="Green-Onions")
+    assert parsed.name == "green onions"
+    assert parsed.singular_name == "green onion"
+    assert parsed.unit == Unit.CUP
+    assert parsed.quantity == Fraction(3, 2)
+    assert parsed.unknown_unit is None
+    assert parsed.base_unit == BaseUnit.VOLUME
+    assert round(parsed.base_quantity) == 355
+    assert parsed.category == "produce"
+
+    parsed = parse_ingredient_fields(quantity="2 bags", name="spinach")
+    assert parsed.unit == Unit.UNKNOWN
+    assert parsed.unknown_unit == "bags"
+    assert parsed.base_quantity == parsed.quantity == 2
+
+
+def test_parse_storable_ingredient_fields() -> None:
+    assert parse_storable_ingredient_fields(quantity="1 cup", name="flour") == (
+        parse_ingredient_fields(quantity="1 cup", name="flour")
+    )
+    assert parse_storable_ingredient_fields(quantity="1/0 cups", name="flour") is None
+    assert parse_storable_ingredient_fields(quantity="1" * 120, name="flour") is None
+    assert (
+        parse_storable_ingredient_fields(quantity="1/" + "7" * 110, name="flour")
+        is None
+    )
+
+
+def test_combine_parsed_ingredients_matches_combine_ingredients() -> None:
+    """
+    Combining the stored fields should be exactly the same as reparsing the
+    text.
+    """
+    with (Path() / "ingredients.csv").open() as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    ingredients = _synthetic_ingredients(names=names, size=2_000, seed=0)
+
+    parsed = [
+        parse_ingredient_fields(quantity=i.quantity, name=i.name) for i in ingredients
+    ]
+    assert combine_parsed_ingredients(parsed) == combine_ingredients(ingredients)
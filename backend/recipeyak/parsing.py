@@ -3,17 +3,17 @@ from __future__ import annotations
 import decimal
 import enum
 import itertools
+import re
+from collections import defaultdict
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
-from functools import cache
+from functools import cache, lru_cache
 
 from recipeyak.string import starts_with
 
 _MALFORMED_UNITS = {"large", "medium", "small", "fresh"}
 
-_quantity_chars = set(" /.0123456789")
-
 _UNICODE_FRACTION_MAPPING = {
     "½": "1/2",
     "⅓": "1/3",
@@ -35,22 +35,32 @@ _UNICODE_FRACTION_MAPPING = {
     "⅒": "1/10",
 }
 
+_UNICODE_FRACTION_RE = re.compile("[" + "".join(_UNICODE_FRACTION_MAPPING) + "]")
+
+# A leading run of quantity characters, followed by the unit, which ends at the
+# next quantity character, e.g., `1 1/2cups 2 tbs` -> (`1 1/2`, `cups`)
+_QUANTITY_UNIT_RE = re.compile(r"([ /.0-9]*)([^ /.0-9]*)")
+
 
 def _unicode_fractions_to_ascii(s: str) -> str:
     """
     convert occurances of unicode fractions like `½` to their ascii
     equivalent `1/2`
     """
+    if _UNICODE_FRACTION_RE.search(s) is None:
+        return s
 
-    output = ""
-    for char in s:
-        expanded = _UNICODE_FRACTION_MAPPING.get(char, char)
+    def expand(match: re.Match[str]) -> str:
+        start = match.start()
+        expanded = _UNICODE_FRACTION_MAPPING[match.group()]
         # ensure 1¾ becomes 1 3/4, not 13/4
-        if output and output[-1].isdigit() and expanded != char:
-            output += " "
-        output += expanded
+        if start > 0 and (
+            s[start - 1].isdigit() or s[start - 1] in _UNICODE_FRACTION_MAPPING
+        ):
+            return " " + expanded
+        return expanded
 
-    return output
+    return _UNICODE_FRACTION_RE.sub(expand, s)
 
 
 def _max_quantity(quantity: str) -> str:
@@ -116,6 +126,7 @@ class Unit(str, Enum):
         return False
 
 
+@lru_cache(maxsize=1024)
 def _get_unit(val: str) -> Unit:
     val_cased = val.strip()
     val = val_cased.lower()
@@ -168,7 +179,7 @@ def _is_unit(val: str) -> bool:
     return _get_unit(val) != Unit.UNKNOWN
 
 
-@dataclass
+@dataclass(frozen=True)
 class Quantity:
     quantity: Decimal
     unit: Unit
@@ -220,22 +231,13 @@ class Quantity:
 
 
 def _parse_quantity(val: str) -> Quantity:
-    value = iter(_unicode_fractions_to_ascii(_max_quantity(val).strip()))
-
-    quantity = ""
-    unit_str = ""
-    for c in value:
-        if c in _quantity_chars:
-            quantity += c
-        else:
-            unit_str += c
-            break
+    value = _unicode_fractions_to_ascii(_max_quantity(val).strip())
 
-    for c in value:
-        if c in _quantity_chars:
-            break
-        # handle case of two units and quantities next to each other
-        unit_str += c
+    # handle case of two units and quantities next to each other by only taking
+    # the first pair
+    match = _QUANTITY_UNIT_RE.match(value)
+    assert match is not None, "pattern matches the empty string"
+    quantity, unit_str = match.groups()
 
     # strip out misplaced words, e.g., `1 large` `lemon` instead of `1` `large lemon`
     if unit_str in _MALFORMED_UNITS:
@@ -305,9 +307,14 @@ _VOLUME: dict[Unit, Decimal] = {
 }
 
 
+@lru_cache(maxsize=4096)
 def parse_quantity(val: str) -> Quantity:
     """
     handle "3 Tablespoon + 1 teaspoon" format
+
+    Shopping lists reparse the same handful of quantities over and over, so we
+    keep the most recent results around. `Quantity` is immutable so sharing the
+    cached instances is safe.
     """
     quantities = val.split("+")
     a = _parse_quantity(quantities[0])
@@ -376,6 +383,30 @@ def larger_to_smaller_unit_prefixes() -> list[str]:
     return sorted(unit_prefixes(), key=lambda x: -len(x))
 
 
+@cache
+def _unit_prefixes_by_first_char() -> dict[str, tuple[str, ...]]:
+    """
+    Unit prefixes, larger to smaller, keyed by their casefolded first character.
+
+    Prefixes are ascii, so any string matching one must start with a character
+    that casefolds to the prefix's first character.
+    """
+    out = defaultdict[str, list[str]](list)
+    for prefix in larger_to_smaller_unit_prefixes():
+        out[prefix[0].casefold()].append(prefix)
+    return {char: tuple(prefixes) for char, prefixes in out.items()}
+
+
+def _match_unit_prefix(value: str, idx: int) -> str | None:
+    """
+    Find the largest unit prefix in `value` starting at `idx`, case insensitive.
+    """
+    for prefix in _unit_prefixes_by_first_char().get(value[idx].casefold(), ()):
+        if starts_with(value[idx : idx + len(prefix)], prefix):
+            return prefix
+    return None
+
+
 def _parse_quantity_name(text: str) -> tuple[str, str]:
     """
     examples:
@@ -418,20 +449,16 @@ def _parse_quantity_name(text: str) -> tuple[str, str]:
             idx += 1
             continue
         else:
-            if starts_with(value[idx:], unit_prefixes()) and in_quantity:
+            unit = _match_unit_prefix(value, idx) if in_quantity else None
+            if unit is not None:
                 in_quantity = False
-                eat_count = 0
-                for unit in larger_to_smaller_unit_prefixes():
-                    if starts_with(value[idx:], unit):
-                        eat_count = len(unit)
-                        # Handle cases like:
-                        # 1 cup plus 2 Tablespoons/148 grams all-purpose flour
-                        if unit.endswith("/"):
-                            eat_count -= 1
-                        break
-                for _ in range(eat_count):
-                    quantity += value[idx]
-                    idx += 1
+                eat_count = len(unit)
+                # Handle cases like:
+                # 1 cup plus 2 Tablespoons/148 grams all-purpose flour
+                if unit.endswith("/"):
+                    eat_count -= 1
+                quantity += value[idx : idx + eat_count]
+                idx += eat_count
 
                 # parse the parens that can occur after quantities, like:
                 #   12 ounces (about 4 to 6 thighs)
@@ -0,0 +1,60 @@
+# ruff: noqa: T201
+"""
+Microbenchmark for ingredient parsing.
+
+    python -m recipeyak.parsing_bench --rounds 20
+"""
+
+import csv
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import typer
+
+from recipeyak.parsing import parse_ingredient, parse_quantity
+
+
+def _load_corpus(path: Path) -> list[str]:
+    with path.open() as f:
+        return [row["name"] for row in csv.DictReader(f)]
+
+
+def _parses_per_sec(
+    fn: Callable[[str], Any], items: Sequence[str], *, rounds: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            fn(item)
+    elapsed = time.perf_counter() - start
+    return (len(items) * rounds) / elapsed
+
+
+def main(path: Path = Path("ingredients.csv"), rounds: int = 20) -> None:
+    """
+    Report parses/sec for parse_ingredient & parse_quantity over the ingredient
+    corpus.
+    """
+    corpus = _load_corpus(path)
+    quantities = [parse_ingredient(text).quantity for text in corpus]
+    print(f"corpus: path={path} rows={len(corpus)} rounds={rounds}")
+
+    rate = _parses_per_sec(parse_ingredient, corpus, rounds=rounds)
+    print(f"parse_ingredient: {rate:,.0f} parses/sec")
+
+    # every call misses the cache, like the first shopping list of the day
+    rate = _parses_per_sec(
+        parse_quantity.__wrapped__, quantities + corpus, rounds=rounds
+    )
+    print(f"parse_quantity (uncached): {rate:,.0f} parses/sec")
+
+    parse_quantity.cache_clear()
+    rate = _parses_per_sec(parse_quantity, quantities + corpus, rounds=rounds)
+    print(f"parse_quantity (cached): {rate:,.0f} parses/sec")
+    print(f"parse_quantity cache: {parse_quantity.cache_info()}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import csv
 from decimal import Decimal
+from pathlib import Path
 
 import pytest
+from syrupy.assertion import SnapshotAssertion
 
 from recipeyak.combine import Quantity
 from recipeyak.parsing import (
@@ -480,3 +483,25 @@ def test_parse_name_description(ingredient: str, expected: tuple[str, str]) -> N
 )
 def test_parse_ingredient(ingredient: str, expected: _IngredientResult) -> None:
     assert parse_ingredient(ingredient) == expected
+
+
+def test_parse_ingredients_csv(snapshot: SnapshotAssertion) -> None:
+    """
+    Guard against the parser changing its output for our corpus of ingredients.
+    """
+    out = []
+    with (Path() / "ingredients.csv").open() as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            text = row["name"]
+            ingredient = parse_ingredient(text)
+            for q in (ingredient.quantity, text):
+                quantity = parse_quantity(q)
+                out.append(
+                    f"{text!r} {q!r} -> {quantity.quantity} {quantity.unit.value} {quantity.unknown_unit!r}"
+                )
+            out.append(
+                f"{text!r} -> {ingredient.quantity!r} {ingredient.name!r} {ingredient.description!r} {ingredient.optional}"
+            )
+
+    assert out == snapshot()
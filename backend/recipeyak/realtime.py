@@ -1,77 +1,397 @@
+"""
+Push updates to the frontend via Ably.
+
+Messages are handed to a background thread once the surrounding transaction
+commits, so requests don't wait on Ably. The thread keeps one client open and
+publishes the messages queued for a channel in a single request.
+
+With the "outbox" engine, messages are instead written to the
+`realtime_outbox` table in the surrounding transaction, so they survive the
+process dying after commit, and `recipeyak.jobs.realtime_outbox_drain`
+publishes them.
+"""
+
+from __future__ import annotations
+
 import asyncio
+import atexit
+import os
+import queue
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Literal
 
-from ably import AblyRest
+import pydantic
+import structlog
+from django.db import connection, transaction
 
+from recipeyak import config
 from recipeyak.api.base.json import json_dumps
+from recipeyak.api.base.metrics import MetricTable, render_prometheus
 from recipeyak.api.calendar_serialization import ScheduleRecipeSerializer
-from recipeyak.config import ABLY_API_KEY
+from recipeyak.api.serializers.recipe import (
+    IngredientSerializer,
+    NoteSerializer,
+    SectionSerializer,
+    StepSerializer,
+)
+from recipeyak.models import RealtimeOutbox
+from recipeyak.realtime_transport import (
+    MAX_MESSAGE_BYTES,
+    AblyTransport,
+    FakeTransport,
+    Message,
+    Transport,
+)
 
+logger = structlog.stdlib.get_logger()
 
-async def _publish_calendar_event_async(
-    scheduled_recipe: ScheduleRecipeSerializer, team_id: int
-) -> None:
-    async with AblyRest(ABLY_API_KEY) as ably:
-        channel = ably.channels[f"team:{team_id}:scheduled_recipe"]
-        await channel.publish(
-            "scheduled_recipe_updated", json_dumps(scheduled_recipe).decode()
+
+@dataclass(slots=True)
+class PublisherStats:
+    enqueued: int = 0
+    published: int = 0
+    failed: int = 0
+    dropped: int = 0
+    """
+    messages we couldn't queue because the publisher fell behind
+    """
+    requests: int = 0
+    queue_size: int = 0
+    max_queue_size: int = 0
+
+
+_METRICS: MetricTable = [
+    (
+        "recipeyak_realtime_messages_enqueued_total",
+        "counter",
+        "Messages queued for publishing.",
+        "enqueued",
+    ),
+    (
+        "recipeyak_realtime_messages_published_total",
+        "counter",
+        "Messages published.",
+        "published",
+    ),
+    (
+        "recipeyak_realtime_messages_failed_total",
+        "counter",
+        "Messages the transport failed to publish.",
+        "failed",
+    ),
+    (
+        "recipeyak_realtime_messages_dropped_total",
+        "counter",
+        "Messages dropped because the queue was full.",
+        "dropped",
+    ),
+    (
+        "recipeyak_realtime_requests_total",
+        "counter",
+        "Publish requests made to the transport.",
+        "requests",
+    ),
+    (
+        "recipeyak_realtime_queue_size",
+        "gauge",
+        "Messages waiting to be published.",
+        "queue_size",
+    ),
+    (
+        "recipeyak_realtime_queue_size_max",
+        "gauge",
+        "Most messages waiting to be published since startup.",
+        "max_queue_size",
+    ),
+]
+
+
+class Publisher:
+    """
+    Publishes messages from a background thread with its own event loop.
+
+    When the queue is full we drop messages instead of blocking the request,
+    a missed update only means a client shows stale data until it refetches.
+    """
+
+    def __init__(
+        self,
+        transport: Callable[[], Transport],
+        *,
+        max_queue_size: int = 10_000,
+        max_batch_size: int = 50,
+    ) -> None:
+        self._transport = transport
+        self._max_queue_size = max_queue_size
+        self._max_batch_size = max_batch_size
+        self._queue = queue.Queue[Message](maxsize=max_queue_size)
+        self._stats = PublisherStats()
+        self._lock = threading.Lock()
+        self._full = False
+        self._pid: int | None = None
+        self._thread: threading.Thread | None = None
+
+    def submit(self, message: Message) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._lock:
+                self._stats.dropped += 1
+                full, self._full = self._full, True
+            # once per backlog, not per message
+            if not full:
+                logger.warning("realtime queue full, dropping messages")
+            return
+        with self._lock:
+            self._full = False
+            self._stats.enqueued += 1
+            self._stats.max_queue_size = max(
+                self._stats.max_queue_size, self._queue.qsize()
+            )
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait for the queued messages to be published, returning False if we
+        timed out.
+        """
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(
+                lambda: self._queue.unfinished_tasks == 0, timeout
+            )
+
+    def stats(self) -> PublisherStats:
+        with self._lock:
+            return replace(self._stats, queue_size=self._queue.qsize())
+
+    def prometheus(self) -> str:
+        return render_prometheus(_METRICS, [({}, self.stats())])
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if (
+                self._pid == os.getpid()
+                and self._thread is not None
+                and self._thread.is_alive()
+            ):
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                # gunicorn forked us after we started, the thread didn't
+                # come along but the queued messages did
+                self._queue = queue.Queue[Message](maxsize=self._max_queue_size)
+            # otherwise the thread died, a new one picks up the queued messages
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="realtime-publisher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            transport = self._transport()
+        except Exception:
+            # the next submit starts another thread to try again
+            logger.exception("failed to create realtime transport")
+            return
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                batch = self._next_batch()
+                try:
+                    loop.run_until_complete(self._publish(transport, batch))
+                except Exception:
+                    logger.exception("failed to publish batch", count=len(batch))
+                    with self._lock:
+                        self._stats.failed += len(batch)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            loop.run_until_complete(transport.close())
+            loop.close()
+
+    def _next_batch(self) -> list[Message]:
+        batch = [self._queue.get()]
+        while len(batch) < self._max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    async def _publish(self, transport: Transport, batch: list[Message]) -> None:
+        by_channel = dict[str, list[Message]]()
+        for message in batch:
+            by_channel.setdefault(message.channel, []).append(message)
+        results = await asyncio.gather(
+            *(
+                transport.publish(channel, messages)
+                for channel, messages in by_channel.items()
+            ),
+            return_exceptions=True,
         )
+        with self._lock:
+            for result, messages in zip(results, by_channel.values(), strict=True):
+                self._stats.requests += 1
+                if isinstance(result, BaseException):
+                    logger.error(
+                        "failed to publish", exc_info=result, count=len(messages)
+                    )
+                    self._stats.failed += len(messages)
+                else:
+                    self._stats.published += len(messages)
 
 
-def publish_calendar_event(
-    scheduled_recipe: ScheduleRecipeSerializer, team_id: int
-) -> None:
-    asyncio.run(_publish_calendar_event_async(scheduled_recipe, team_id))
+def _transport() -> Transport:
+    if config.REALTIME_TRANSPORT == "fake":
+        return FakeTransport()
+    return AblyTransport(config.ABLY_API_KEY)
 
 
-async def _publish_calendar_event_delete_async(recipe_id: int, team_id: int) -> None:
-    async with AblyRest(ABLY_API_KEY) as ably:
-        channel = ably.channels[f"team:{team_id}:scheduled_recipe"]
-        await channel.publish(
-            "scheduled_recipe_delete",
-            json_dumps({"recipeId": recipe_id}).decode(),
+publisher = Publisher(_transport)
+# give the queued messages a chance to go out when gunicorn restarts a worker
+atexit.register(publisher.flush, timeout=5)
+
+
+def _publish(*, channel: str, name: str, data: object) -> None:
+    _publish_all([Message(channel=channel, name=name, data=data)])
+
+
+def _publish_all(messages: list[Message]) -> None:
+    """
+    Publish from inside the transaction making the change, so the messages
+    commit or roll back with it.
+    """
+    if config.REALTIME_ENGINE == "outbox":
+        if not transaction.get_connection().in_atomic_block:
+            # autocommitting the rows separately from the change means a crash
+            # between the two loses the messages
+            raise RuntimeError("publish from inside the change's transaction")
+        RealtimeOutbox.objects.bulk_create(
+            RealtimeOutbox(channel=m.channel, name=m.name, data=m.data)
+            for m in messages
         )
+        return
 
+    def submit() -> None:
+        for message in messages:
+            publisher.submit(message)
 
-def publish_calendar_event_deleted(*, recipe_id: int, team_id: int) -> None:
-    asyncio.run(_publish_calendar_event_delete_async(recipe_id, team_id))
+    transaction.on_commit(submit)
 
 
-async def _publish_cook_checklist_async(
-    recipe_id: int, team_id: int, ingredient_id: int, checked: bool
+def publish_calendar_event(
+    scheduled_recipe: ScheduleRecipeSerializer, team_id: int
 ) -> None:
-    async with AblyRest(ABLY_API_KEY) as ably:
-        channel = ably.channels[f"team:{team_id}:cook_checklist:{recipe_id}"]
-        await channel.publish(
-            "checkmark_updated",
-            json_dumps({"ingredientId": ingredient_id, "checked": checked}).decode(),
-        )
+    _publish(
+        channel=f"team:{team_id}:scheduled_recipe",
+        name="scheduled_recipe_updated",
+        data=json_dumps(scheduled_recipe).decode(),
+    )
+
+
+def publish_calendar_events(
+    scheduled_recipes: list[ScheduleRecipeSerializer], team_id: int
+) -> None:
+    """
+    Publish many scheduled recipes in as few messages as fit under Ably's
+    message size limit, instead of one message each.
+    """
+    # leave room for the message name
+    max_bytes = MAX_MESSAGE_BYTES - 1024
+    chunks = list[list[bytes]]()
+    size = 0
+    for scheduled_recipe in scheduled_recipes:
+        data = json_dumps(scheduled_recipe)
+        # the brackets & commas of the array
+        if not chunks or size + len(data) + 1 > max_bytes:
+            chunks.append([])
+            size = 1
+        chunks[-1].append(data)
+        size += len(data) + 1
+    _publish_all(
+        [
+            Message(
+                channel=f"team:{team_id}:scheduled_recipe",
+                name="scheduled_recipes_updated",
+                data=(b"[" + b",".join(chunk) + b"]").decode(),
+            )
+            for chunk in chunks
+        ]
+    )
+
+
+def publish_calendar_event_deleted(*, recipe_id: int, team_id: int) -> None:
+    _publish(
+        channel=f"team:{team_id}:scheduled_recipe",
+        name="scheduled_recipe_delete",
+        data=json_dumps({"recipeId": recipe_id}).decode(),
+    )
 
 
 def publish_cook_checklist(
     *, recipe_id: int, team_id: int, ingredient_id: int, checked: bool
 ) -> None:
-    asyncio.run(
-        _publish_cook_checklist_async(recipe_id, team_id, ingredient_id, checked)
+    _publish(
+        channel=f"team:{team_id}:cook_checklist:{recipe_id}",
+        name="checkmark_updated",
+        data=json_dumps({"ingredientId": ingredient_id, "checked": checked}).decode(),
     )
 
 
-async def _publish_recipe_async(recipe_id: int, team_id: int) -> None:
-    async with AblyRest(ABLY_API_KEY) as ably:
-        channel = ably.channels[f"team:{team_id}:recipe:{recipe_id}"]
-        await channel.publish("recipe_modified", {"id": recipe_id})
+class RecipePatch(pydantic.BaseModel):
+    """
+    A change to one part of a recipe, for clients to apply to the recipe
+    they've already fetched.
+    """
+
+    kind: Literal["ingredient", "step", "section", "note"]
+    op: Literal["upsert", "delete"]
+    id: int | str
+    value: (
+        IngredientSerializer
+        | StepSerializer
+        | SectionSerializer
+        | NoteSerializer
+        | None
+    ) = None
 
 
-def publish_recipe(*, recipe_id: int, team_id: int | None) -> None:
+def _next_realtime_seq(recipe_id: int) -> int | None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+update core_recipe
+set realtime_seq = realtime_seq + 1
+where id = %(recipe_id)s
+returning realtime_seq
+""",
+            {"recipe_id": recipe_id},
+        )
+        row = cursor.fetchone()
+    return row[0] if row is not None else None
+
+
+def publish_recipe(
+    *, recipe_id: int, team_id: int | None, patch: RecipePatch | None = None
+) -> None:
     """
-    Trigger the frontend to refetch the recipe.
+    Tell the clients viewing the recipe that it changed.
 
-    This isn't transactional and it'd be more "scalable" to publish a small object to all the clients. Ably LiveSync is probably the right way to do this.
-    https://ably.com/docs/products/livesync
+    Messages are numbered with the recipe's `realtime_seq`. Clients apply the
+    patch when the message is the next one after the recipe they fetched, and
+    otherwise refetch, like when they missed a message or there's no patch.
     """
     if team_id:
-        asyncio.run(
-            _publish_recipe_async(
-                recipe_id,
-                team_id,
-            )
+        _publish(
+            channel=f"team:{team_id}:recipe:{recipe_id}",
+            name="recipe_modified",
+            data={
+                "id": recipe_id,
+                # None when the recipe was deleted
+                "seq": _next_realtime_seq(recipe_id),
+                "patch": patch.model_dump(mode="json") if patch is not None else None,
+            },
         )
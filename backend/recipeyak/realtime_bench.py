@@ -0,0 +1,63 @@
+# ruff: noqa: T201
+"""
+Load test the realtime publisher against the fake transport, no Ably needed.
+
+    python -m recipeyak.realtime_bench --messages 100000 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import django
+import typer
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "recipeyak.django.settings")
+django.setup()
+from recipeyak.realtime import Publisher  # noqa: E402
+from recipeyak.realtime_transport import FakeTransport, Message  # noqa: E402
+
+
+def main(
+    messages: int = 100_000,
+    channels: int = 100,
+    latency: float = 0.05,
+    max_queue_size: int = 10_000,
+    max_batch_size: int = 50,
+) -> None:
+    """
+    Submit messages as fast as requests could & see how many make it out.
+    """
+    transport = FakeTransport(latency=latency)
+    publisher = Publisher(
+        lambda: transport,
+        max_queue_size=max_queue_size,
+        max_batch_size=max_batch_size,
+    )
+    start = time.perf_counter()
+    for i in range(messages):
+        publisher.submit(
+            Message(
+                channel=f"team:1:recipe:{i % channels}",
+                name="recipe_modified",
+                data={"id": i % channels},
+            )
+        )
+    submit_sec = time.perf_counter() - start
+    publisher.flush()
+    total_sec = time.perf_counter() - start
+    stats = publisher.stats()
+    print(
+        f"messages={messages} channels={channels} latency={latency * 1000:.0f}ms\n"
+        f"  submit={submit_sec / messages * 1e6:6.2f}us/message "
+        f"total={total_sec:6.2f}s\n"
+        f"  published={stats.published} dropped={stats.dropped} "
+        f"requests={stats.requests} "
+        f"messages/request={stats.published / max(stats.requests, 1):5.1f} "
+        f"max_queue_size={stats.max_queue_size}"
+    )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+
+import pytest
+from django.test.client import Client
+
+from recipeyak import config, realtime
+from recipeyak.api.base.exceptions import APIError
+from recipeyak.api.serializers.recipe import serialize_step
+from recipeyak.models import RealtimeOutbox, Recipe, Step, User
+from recipeyak.realtime import Publisher, RecipePatch
+
+# imported before conftest patches out publish_recipe for the other tests
+from recipeyak.realtime import publish_recipe as unpatched_publish_recipe
+from recipeyak.realtime_transport import (
+    FakeTransport,
+    Message,
+    message_size,
+    size_bounded_batches,
+)
+
+
+def test_publisher_batches_messages_per_channel() -> None:
+    transport = FakeTransport()
+    publisher = Publisher(lambda: transport)
+    messages = [
+        Message(channel=f"team:1:recipe:{i % 2}", name="recipe_modified", data=i)
+        for i in range(6)
+    ]
+    for message in messages:
+        publisher.submit(message)
+
+    assert publisher.flush(timeout=5)
+    by_channel = dict[str, list[object]]()
+    for channel, batch in transport.published:
+        # each request only contains messages for its channel
+        assert {m.channel for m in batch} == {channel}
+        by_channel.setdefault(channel, []).extend(m.data for m in batch)
+    assert by_channel == {"team:1:recipe:0": [0, 2, 4], "team:1:recipe:1": [1, 3, 5]}
+    stats = publisher.stats()
+    assert (stats.enqueued, stats.published, stats.dropped) == (6, 6, 0)
+    assert stats.requests == len(transport.published) <= 6
+
+
+def test_size_bounded_batches() -> None:
+    messages = [
+        Message(channel="team:1:scheduled_recipe", name="x", data="a" * size)
+        for size in [10, 20, 30, 100, 5]
+    ]
+    batches = size_bounded_batches(messages, max_bytes=40)
+
+    assert [[len(str(m.data)) for m in batch] for batch in batches] == [
+        [10, 20],
+        [30],
+        # too big by itself, Ably will reject it but the others still go out
+        [100],
+        [5],
+    ]
+    assert message_size(Message(channel="c", name="ab", data="é")) == 4
+
+
+class _BlockedTransport(FakeTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.unblocked = threading.Event()
+
+    async def publish(self, channel: str, messages: list[Message]) -> None:
+        await asyncio.to_thread(self.unblocked.wait)
+        await super().publish(channel, messages)
+
+
+def test_publisher_drops_messages_when_full() -> None:
+    transport = _BlockedTransport()
+    publisher = Publisher(lambda: transport, max_queue_size=2, max_batch_size=1)
+    message = Message(channel="team:1:scheduled_recipe", name="x", data="{}")
+    publisher.submit(message)
+    # wait for the first message to be taken off the queue
+    while publisher.stats().queue_size:
+        time.sleep(0.001)
+    for _ in range(3):
+        publisher.submit(message)
+
+    assert publisher.stats().dropped == 1
+    transport.unblocked.set()
+    assert publisher.flush(timeout=5)
+    stats = publisher.stats()
+    assert (stats.published, stats.dropped, stats.max_queue_size) == (3, 1, 2)
+
+
+class _FailingTransport(FakeTransport):
+    async def publish(self, channel: str, messages: list[Message]) -> None:
+        if channel == "broken":
+            raise ValueError("ably is down")
+        await super().publish(channel, messages)
+
+
+def test_publisher_failures() -> None:
+    transport = _FailingTransport()
+    publisher = Publisher(lambda: transport)
+    publisher.submit(Message(channel="broken", name="x", data="{}"))
+    publisher.submit(Message(channel="ok", name="x", data="{}"))
+
+    assert publisher.flush(timeout=5)
+    stats = publisher.stats()
+    assert (stats.published, stats.failed) == (1, 1)
+
+
+def test_publisher_restarts_after_crashing() -> None:
+    """
+    A thread that died, like when creating the transport failed, is replaced
+    on the next submit instead of leaving messages queued forever.
+    """
+    transport = FakeTransport()
+    calls = 0
+
+    def create_transport() -> FakeTransport:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("ably is down")
+        return transport
+
+    publisher = Publisher(create_transport)
+    publisher.submit(Message(channel="team:1:recipe:1", name="x", data=1))
+    assert publisher._thread is not None
+    publisher._thread.join(timeout=5)
+    assert not publisher._thread.is_alive()
+
+    publisher.submit(Message(channel="team:1:recipe:1", name="x", data=2))
+    assert publisher.flush(timeout=5)
+    assert [m.data for _, batch in transport.published for m in batch] == [1, 2]
+    assert calls == 2
+
+
+@pytest.mark.django_db()
+def test_publish_waits_for_commit(
+    monkeypatch: pytest.MonkeyPatch,
+    django_capture_on_commit_callbacks: Callable[
+        [], AbstractContextManager[list[Callable[[], None]]]
+    ],
+) -> None:
+    submitted = list[Message]()
+    monkeypatch.setattr(realtime.publisher, "submit", submitted.append)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        # the publish_* functions are patched out in tests
+        realtime._publish(channel="team:2:recipe:1", name="recipe_modified", data={})
+    assert submitted == []
+
+    for callback in callbacks:
+        callback()
+    assert submitted == [
+        Message(channel="team:2:recipe:1", name="recipe_modified", data={})
+    ]
+
+
+@pytest.mark.django_db()
+def test_publish_to_outbox(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "REALTIME_ENGINE", "outbox")
+    submitted = list[Message]()
+    monkeypatch.setattr(realtime.publisher, "submit", submitted.append)
+
+    realtime._publish(channel="team:2:recipe:1", name="recipe_modified", data={"id": 1})
+
+    assert submitted == []
+    assert list(RealtimeOutbox.objects.values_list("channel", "name", "data")) == [
+        ("team:2:recipe:1", "recipe_modified", {"id": 1})
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_publish_to_outbox_requires_transaction(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(config, "REALTIME_ENGINE", "outbox")
+
+    with pytest.raises(RuntimeError):
+        realtime._publish(channel="team:2:recipe:1", name="recipe_modified", data={})
+    assert not RealtimeOutbox.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_outbox_commits_with_view_changes(
+    monkeypatch: pytest.MonkeyPatch, client: Client, user: User, recipe: Recipe
+) -> None:
+    """
+    The outbox row is written in the view's transaction, so it's there
+    exactly when the change is.
+    """
+    # imported here so the module keeps conftest's patched publish_recipe
+    from recipeyak.api import step_create_view
+
+    monkeypatch.setattr(config, "REALTIME_ENGINE", "outbox")
+    monkeypatch.setattr(step_create_view, "publish_recipe", unpatched_publish_recipe)
+    client.force_login(user)
+    step_count = Step.objects.count()
+
+    res = client.post(
+        f"/api/v1/recipes/{recipe.id}/steps/",
+        {"text": "stir", "position": "z"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    assert Step.objects.count() == step_count + 1
+    assert RealtimeOutbox.objects.get().data["patch"]["id"] == res.json()["id"]
+
+    def publish_then_fail(**kwargs: object) -> None:
+        unpatched_publish_recipe(**kwargs)  # type: ignore[arg-type]
+        raise APIError(code="failed", message="failed after publishing")
+
+    monkeypatch.setattr(step_create_view, "publish_recipe", publish_then_fail)
+    res = client.post(
+        f"/api/v1/recipes/{recipe.id}/steps/",
+        {"text": "fold", "position": "zz"},
+        content_type="application/json",
+    )
+    assert res.status_code == 400
+    assert Step.objects.count() == step_count + 1
+    assert RealtimeOutbox.objects.count() == 1
+
+
+@pytest.mark.django_db()
+def test_publish_recipe_patch(monkeypatch: pytest.MonkeyPatch, recipe: Recipe) -> None:
+    monkeypatch.setattr(config, "REALTIME_ENGINE", "outbox")
+    step = serialize_step(recipe.step_set.all()[:1].get())
+
+    for _ in range(2):
+        unpatched_publish_recipe(
+            recipe_id=recipe.id,
+            team_id=recipe.team_id,
+            patch=RecipePatch(kind="step", op="upsert", id=step.id, value=step),
+        )
+
+    messages = list(
+        RealtimeOutbox.objects.order_by("id").values_list("data", flat=True)
+    )
+    assert [m["seq"] for m in messages] == [1, 2]
+    assert messages[0]["patch"] == {
+        "kind": "step",
+        "op": "upsert",
+        "id": step.id,
+        "value": {"id": step.id, "text": step.text, "position": step.position},
+    }
+    recipe.refresh_from_db()
+    assert recipe.realtime_seq == 2
@@ -0,0 +1,86 @@
+"""
+Where realtime messages go, kept free of Django so the jobs can use it too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Protocol
+
+from ably import AblyRest
+from ably.types.message import Message as AblyMessage
+
+
+@dataclass(frozen=True, slots=True)
+class Message:
+    channel: str
+    name: str
+    data: object
+
+
+# Ably's default limit for a message, and for all the messages in a publish
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+def message_size(message: Message) -> int:
+    data = message.data if isinstance(message.data, str) else json.dumps(message.data)
+    return len(message.name.encode()) + len(data.encode())
+
+
+def size_bounded_batches(
+    messages: list[Message], *, max_bytes: int = MAX_MESSAGE_BYTES
+) -> list[list[Message]]:
+    """
+    Split the messages into batches Ably will accept in one publish, keeping
+    their order.
+    """
+    batches = list[list[Message]]()
+    size = 0
+    for message in messages:
+        message_bytes = message_size(message)
+        if not batches or size + message_bytes > max_bytes:
+            batches.append([])
+            size = 0
+        batches[-1].append(message)
+        size += message_bytes
+    return batches
+
+
+class Transport(Protocol):
+    async def publish(self, channel: str, messages: list[Message]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class AblyTransport:
+    def __init__(self, api_key: str) -> None:
+        self._ably = AblyRest(api_key)
+
+    async def publish(self, channel: str, messages: list[Message]) -> None:
+        for batch in size_bounded_batches(messages):
+            await self._ably.channels[channel].publish(
+                messages=[AblyMessage(name=m.name, data=m.data) for m in batch]
+            )
+
+    async def close(self) -> None:
+        await self._ably.close()
+
+
+class FakeTransport:
+    """
+    Keeps published messages in memory, for tests & load testing without Ably.
+    """
+
+    def __init__(self, *, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.published = list[tuple[str, list[Message]]]()
+
+    async def publish(self, channel: str, messages: list[Message]) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.published.append((channel, messages))
+
+    async def close(self) -> None:
+        pass
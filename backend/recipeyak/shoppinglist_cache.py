@@ -0,0 +1,95 @@
+"""
+Memoize shopping lists so reopening the same week doesn't recompute it.
+
+Entries are keyed by (team_id, start, end) and tagged with the team's
+`shoppinglist_version`. Anything that changes a scheduled recipe or an
+ingredient calls `Team.invalidate_shoppinglists` which bumps the version in
+the database, so every process sees the invalidation the next time it loads
+the team.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+_Key = tuple[int, date, date]
+
+
+@dataclass(frozen=True, slots=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+@dataclass(frozen=True, slots=True)
+class CacheLookup(Generic[T]):
+    value: T | None
+    """
+    The cached value if it's still current.
+    """
+    stale: T | None
+    """
+    The cached value for an older version of the team's data, useful for
+    checking if a recomputed value actually changed.
+    """
+
+
+class ShoppingListCache(Generic[T]):
+    """
+    A bounded LRU of shopping lists with hit/miss counters.
+    """
+
+    def __init__(self, *, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict[_Key, tuple[int, T]]()
+        self._lock = threading.Lock()
+
+    def get(
+        self, *, team_id: int, start: date, end: date, version: int
+    ) -> CacheLookup[T]:
+        key = (team_id, start, end)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return CacheLookup(value=entry[1], stale=None)
+            self.misses += 1
+            return CacheLookup(
+                value=None, stale=entry[1] if entry is not None else None
+            )
+
+    def set(
+        self, *, team_id: int, start: date, end: date, version: int, value: T
+    ) -> None:
+        key = (team_id, start, end)
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                maxsize=self.maxsize,
+                currsize=len(self._entries),
+            )
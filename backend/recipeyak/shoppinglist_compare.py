@@ -0,0 +1,119 @@
+# ruff: noqa: T201
+"""
+Run both shopping list engines against real teams and report latency &
+mismatches.
+
+    python -m recipeyak.shoppinglist_compare --start 2024-01-01 --end 2024-01-07
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+
+import django
+import typer
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "recipeyak.django.settings")
+django.setup()
+from recipeyak.api.shoppinglist_retrieve_view import (  # noqa: E402
+    ShoppinglistRetrieveParams,
+    ShoppinglistRetrieveResponse,
+    compute_shoppinglist_python,
+    compute_shoppinglist_sql,
+)
+from recipeyak.models import ScheduledRecipe  # noqa: E402
+
+_Engine = Callable[..., ShoppinglistRetrieveResponse]
+
+
+def _time(
+    engine: _Engine,
+    *,
+    params: ShoppinglistRetrieveParams,
+    team_id: int,
+    rounds: int,
+) -> tuple[float, ShoppinglistRetrieveResponse]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        res = engine(params=params, team_id=team_id)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), res
+
+
+def _mismatches(
+    python: ShoppinglistRetrieveResponse, sql: ShoppinglistRetrieveResponse
+) -> list[str]:
+    out = []
+    if python["recipes"] != sql["recipes"]:
+        out.append("recipes")
+    for name in python["ingredients"].keys() | sql["ingredients"].keys():
+        expected = python["ingredients"].get(name)
+        actual = sql["ingredients"].get(name)
+        if expected != actual:
+            out.append(f"{name!r}: python={expected} sql={actual}")
+    if list(python["ingredients"]) != list(sql["ingredients"]) and not out:
+        out.append("ingredient order")
+    return out
+
+
+def main(
+    team_id: list[int] = [],  # noqa: B006
+    start: str = "",
+    end: str = "",
+    rounds: int = 5,
+) -> None:
+    """
+    Compare the engines for each team with recipes scheduled in the date
+    range, defaulting to every team & the coming week.
+    """
+    start_date = date.fromisoformat(start) if start else timezone.now().date()
+    end_date = date.fromisoformat(end) if end else start_date + timedelta(days=6)
+    params = ShoppinglistRetrieveParams(start=start_date, end=end_date)
+    team_ids = team_id or sorted(
+        set(
+            ScheduledRecipe.objects.filter(
+                on__gte=start_date, on__lte=end_date, team_id__isnull=False
+            ).values_list("team_id", flat=True)
+        )
+    )
+    print(f"range: {start_date} to {end_date} teams={len(team_ids)} rounds={rounds}")
+
+    python_timings = []
+    sql_timings = []
+    mismatched_teams = 0
+    for id in team_ids:
+        python_sec, python = _time(
+            compute_shoppinglist_python, params=params, team_id=id, rounds=rounds
+        )
+        sql_sec, sql = _time(
+            compute_shoppinglist_sql, params=params, team_id=id, rounds=rounds
+        )
+        python_timings.append(python_sec)
+        sql_timings.append(sql_sec)
+        mismatches = _mismatches(python, sql)
+        if mismatches:
+            mismatched_teams += 1
+        print(
+            f"team={id:>6} ingredients={len(python['ingredients']):>4} "
+            f"python={python_sec * 1000:7.1f}ms sql={sql_sec * 1000:7.1f}ms "
+            f"mismatches={len(mismatches)}"
+        )
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+
+    if team_ids:
+        print(
+            f"median: python={statistics.median(python_timings) * 1000:.1f}ms "
+            f"sql={statistics.median(sql_timings) * 1000:.1f}ms "
+            f"mismatched_teams={mismatched_teams}/{len(team_ids)}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,76 +1,277 @@
-from datetime import UTC, datetime
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import TypeVar
 
+from django.db import connection, transaction
+
+from recipeyak import config
 from recipeyak.models.ingredient_historical import IngredientHistorical
 from recipeyak.models.note import Note
 from recipeyak.models.note_historical import NoteHistorical
 from recipeyak.models.recipe import Recipe
 from recipeyak.models.recipe_historical import RecipeHistorical
+from recipeyak.models.recipe_version_queue import RecipeVersionQueue
 from recipeyak.models.section_historical import SectionHistorical
 from recipeyak.models.step_historical import StepHistorical
 from recipeyak.models.upload import Upload
 from recipeyak.models.user import User
 
+_Historical = TypeVar(
+    "_Historical", IngredientHistorical, SectionHistorical, StepHistorical
+)
+
+
+def _previous_rows(
+    model: type[_Historical], *, version: RecipeHistorical | None, ids_field: str
+) -> list[_Historical]:
+    if version is None:
+        return []
+    ids: list[int] | None = getattr(version, ids_field)
+    if ids is None:
+        # saved before versions shared rows
+        return list(model.objects.filter(recipe_historical=version))
+    return list(model.objects.filter(id__in=ids))
+
+
+def _share_unchanged_rows(
+    model: type[_Historical],
+    *,
+    previous: list[_Historical],
+    current: list[_Historical],
+    key: Callable[[_Historical], tuple[object, ...]],
+) -> list[int]:
+    """
+    Ids of the rows for the new version, reusing the previous version's rows
+    that haven't changed, so editing one step doesn't copy every ingredient.
+    """
+    previous_ids = {key(row): row.id for row in previous}
+    changed = [row for row in current if key(row) not in previous_ids]
+    model.objects.bulk_create(changed)
+    return [previous_ids.get(key(row), row.id) for row in current]
+
+
+def _ingredient_key(row: IngredientHistorical) -> tuple[object, ...]:
+    return (
+        row.team_id,
+        row.ingredient_id,
+        row.quantity,
+        row.name,
+        row.description,
+        row.position,
+        row.optional,
+    )
+
+
+def _section_key(row: SectionHistorical) -> tuple[object, ...]:
+    return (row.team_id, row.section_id, row.title, row.position)
+
+
+def _step_key(row: StepHistorical) -> tuple[object, ...]:
+    return (row.team_id, row.step_id, row.text, row.position)
+
 
 def save_recipe_version(
     *, recipe_id: int, actor: User | None, created: datetime | None = None
 ) -> None:
     """
     Called after writing recipe changes to the database.
+
+    Locks the recipe, so we don't share rows that
+    `recipeyak.jobs.compact_recipe_history` is deleting as duplicates.
     """
-    recipe = Recipe.objects.get(id=recipe_id)
-    recipe_historical = RecipeHistorical.objects.create(
-        team_id=recipe.team_id,
-        recipe_id=recipe.id,
-        actor=actor,
-        name=recipe.name,
-        author=recipe.author,
-        source=recipe.source,
-        time=recipe.time,
-        servings=recipe.servings,
-        archived_at=recipe.archived_at,
-        tags=recipe.tags,
-        primary_image_id=recipe.primary_image_id,
-        created=created or datetime.now(UTC),
-    )
-    ingredients = []
-    for ingredient in recipe.ingredient_set.all():
-        ingredients.append(
-            IngredientHistorical(
-                ingredient_id=ingredient.id,
-                team_id=recipe.team_id,
-                recipe_historical=recipe_historical,
-                quantity=ingredient.quantity,
-                name=ingredient.name,
-                description=ingredient.description,
-                position=ingredient.position,
-                optional=ingredient.optional,
+    # no savepoint, callers are usually in a transaction already
+    with transaction.atomic(savepoint=False):
+        recipe = Recipe.objects.select_for_update(no_key=True).get(id=recipe_id)
+        previous = (
+            RecipeHistorical.objects.filter(recipe_id=recipe.id)
+            .order_by("-created", "-id")
+            .first()
+        )
+        recipe_historical = RecipeHistorical.objects.create(
+            team_id=recipe.team_id,
+            recipe_id=recipe.id,
+            actor=actor,
+            name=recipe.name,
+            author=recipe.author,
+            source=recipe.source,
+            time=recipe.time,
+            servings=recipe.servings,
+            archived_at=recipe.archived_at,
+            tags=recipe.tags,
+            primary_image_id=recipe.primary_image_id,
+            created=created or datetime.now(UTC),
+        )
+        ingredients = []
+        for ingredient in recipe.ingredient_set.all():
+            ingredients.append(
+                IngredientHistorical(
+                    ingredient_id=ingredient.id,
+                    team_id=recipe.team_id,
+                    recipe_historical=recipe_historical,
+                    quantity=ingredient.quantity,
+                    name=ingredient.name,
+                    description=ingredient.description,
+                    position=ingredient.position,
+                    optional=ingredient.optional,
+                )
             )
+        recipe_historical.ingredient_historical_ids = _share_unchanged_rows(
+            IngredientHistorical,
+            previous=_previous_rows(
+                IngredientHistorical,
+                version=previous,
+                ids_field="ingredient_historical_ids",
+            ),
+            current=ingredients,
+            key=_ingredient_key,
         )
-    IngredientHistorical.objects.bulk_create(ingredients)
-    sections = []
-    for section in recipe.section_set.all():
-        sections.append(
-            SectionHistorical(
-                section_id=section.id,
-                team_id=recipe.team_id,
-                recipe_historical=recipe_historical,
-                title=section.title,
-                position=section.position,
+        sections = []
+        for section in recipe.section_set.all():
+            sections.append(
+                SectionHistorical(
+                    section_id=section.id,
+                    team_id=recipe.team_id,
+                    recipe_historical=recipe_historical,
+                    title=section.title,
+                    position=section.position,
+                )
             )
+        recipe_historical.section_historical_ids = _share_unchanged_rows(
+            SectionHistorical,
+            previous=_previous_rows(
+                SectionHistorical, version=previous, ids_field="section_historical_ids"
+            ),
+            current=sections,
+            key=_section_key,
         )
-    SectionHistorical.objects.bulk_create(sections)
-    steps = []
-    for step in recipe.step_set.all():
-        steps.append(
-            StepHistorical(
-                step_id=step.id,
-                team_id=recipe.team_id,
-                recipe_historical=recipe_historical,
-                text=step.text,
-                position=step.position,
+        steps = []
+        for step in recipe.step_set.all():
+            steps.append(
+                StepHistorical(
+                    step_id=step.id,
+                    team_id=recipe.team_id,
+                    recipe_historical=recipe_historical,
+                    text=step.text,
+                    position=step.position,
+                )
             )
+        recipe_historical.step_historical_ids = _share_unchanged_rows(
+            StepHistorical,
+            previous=_previous_rows(
+                StepHistorical, version=previous, ids_field="step_historical_ids"
+            ),
+            current=steps,
+            key=_step_key,
+        )
+        recipe_historical.save(
+            update_fields=[
+                "ingredient_historical_ids",
+                "section_historical_ids",
+                "step_historical_ids",
+            ]
+        )
+
+
+def enqueue_recipe_version(*, recipe_id: int, actor: User | None) -> None:
+    """
+    Called after writing recipe changes to the database.
+
+    With `RECIPE_VERSION_COALESCE_SECONDS` set, the version is saved by
+    `recipeyak.jobs.recipe_version_sync` once the edits settle, so tweaking
+    five ingredients in a row saves one version instead of five. The queue
+    row is written in the request's transaction, so the job only sees it
+    after commit.
+    """
+    if config.RECIPE_VERSION_COALESCE_SECONDS <= 0:
+        save_recipe_version(recipe_id=recipe_id, actor=actor)
+        return
+    RecipeVersionQueue.objects.create(
+        recipe_id=recipe_id, actor_id=actor.id if actor is not None else None
+    )
+
+
+# a recipe that's edited nonstop still gets a version after this many windows
+_MAX_COALESCE_WINDOWS = 10
+
+
+def _save_queued_version(*, recipe_id: int, queued: list[RecipeVersionQueue]) -> bool:
+    """
+    Save the queued edits as one version, returning False when the recipe
+    was deleted in the meantime.
+    """
+    latest = queued[-1]
+    saved = False
+    if Recipe.objects.filter(id=recipe_id).exists():
+        save_recipe_version(
+            recipe_id=recipe_id,
+            actor=User.objects.filter(id=latest.actor_id).first(),
+            created=latest.created,
+        )
+        saved = True
+    RecipeVersionQueue.objects.filter(id__in=[entry.id for entry in queued]).delete()
+    return saved
+
+
+def flush_queued_recipe_version(*, recipe_id: int, actor: User | None) -> None:
+    """
+    Called before writing recipe changes to the database.
+
+    Saves the queued edits as a version when someone other than `actor` made
+    them, so edits from different people aren't merged into one version.
+    """
+    if config.RECIPE_VERSION_COALESCE_SECONDS <= 0:
+        return
+    # waits for the job when it's saving the recipe's version
+    queued = list(
+        RecipeVersionQueue.objects.filter(recipe_id=recipe_id)
+        .select_for_update()
+        .order_by("created", "id")
+    )
+    actor_id = actor.id if actor is not None else None
+    if queued and queued[-1].actor_id != actor_id:
+        _save_queued_version(recipe_id=recipe_id, queued=queued)
+
+
+def save_queued_recipe_versions(
+    *, window: timedelta, now: datetime | None = None, limit: int = 100
+) -> int:
+    """
+    Save one version for each recipe that hasn't been edited for `window`,
+    returning how many we saved.
+
+    The queued edits are all from one person, `flush_queued_recipe_version`
+    saves them when someone else starts editing.
+    """
+    now = now or datetime.now(UTC)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select recipe_id
+from recipe_version_queue
+group by recipe_id
+having max(created) <= %(settled)s or min(created) <= %(overdue)s
+order by min(created)
+limit %(limit)s
+""",
+            {
+                "settled": now - window,
+                "overdue": now - window * _MAX_COALESCE_WINDOWS,
+                "limit": limit,
+            },
         )
-    StepHistorical.objects.bulk_create(steps)
+        recipe_ids: list[int] = [row[0] for row in cursor.fetchall()]
+    saved = 0
+    for recipe_id in recipe_ids:
+        with transaction.atomic():
+            # another worker has the recipe when the rows are locked
+            queued = list(
+                RecipeVersionQueue.objects.filter(recipe_id=recipe_id)
+                .select_for_update(skip_locked=True)
+                .order_by("created", "id")
+            )
+            if queued and _save_queued_version(recipe_id=recipe_id, queued=queued):
+                saved += 1
+    return saved
 
 
 def save_note_version(note: Note, *, actor: User) -> None:
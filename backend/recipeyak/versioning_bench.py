@@ -0,0 +1,121 @@
+# ruff: noqa: T201
+"""
+Measure how much history `save_recipe_version` writes when editing one step
+at a time, compared to copying every row for every version.
+
+Creates the recipes in a transaction that's rolled back, so it's safe to
+point at a dev database.
+
+    python -m recipeyak.versioning_bench --ingredients 40 --edits 50
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from uuid import uuid4
+
+import django
+import typer
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "recipeyak.django.settings")
+django.setup()
+from django.db import connection, transaction  # noqa: E402
+
+from recipeyak.models import Ingredient, Recipe, Section, Step, Team, User  # noqa: E402
+from recipeyak.versioning import save_recipe_version  # noqa: E402
+
+# (rows, bytes) of the child rows stored for the recipe, and of the child
+# rows its versions contain, which is what copying every row would store
+_STORAGE_SQL = """
+select
+  count(*),
+  coalesce(sum(pg_column_size(row_data)), 0)
+from (
+  select {table}.id, {table} row_data
+  from {table}
+  join recipe_historical on recipe_historical.id = {table}.recipe_historical_id
+  where recipe_historical.recipe_id = %(recipe_id)s
+) stored
+union all
+select
+  count(*),
+  coalesce(sum(pg_column_size({table})), 0)
+from recipe_historical
+join {table} on {table}.id = any(recipe_historical.{table}_ids)
+where recipe_historical.recipe_id = %(recipe_id)s
+"""
+
+
+def _create_recipe(*, ingredients: int, steps: int) -> tuple[User, Recipe]:
+    user = User.objects.create_user(email=f"bench-{uuid4().hex}@example.com")
+    team = Team.objects.create(name="bench")
+    team.force_join(user)
+    recipe = Recipe.objects.create(name="bench", team=team)
+    Section.objects.create(recipe=recipe, title="sauce", position="0")
+    Ingredient.objects.bulk_create(
+        Ingredient(
+            quantity=f"{i} cups",
+            name=f"ingredient {i}",
+            description="finely chopped",
+            position=f"{i:04}",
+            recipe=recipe,
+        )
+        for i in range(ingredients)
+    )
+    Step.objects.bulk_create(
+        Step(text=f"step {i} " + "stir " * 20, position=f"{i:04}", recipe=recipe)
+        for i in range(steps)
+    )
+    return user, recipe
+
+
+def _storage(recipe: Recipe) -> tuple[int, int, int, int]:
+    stored_rows = stored_bytes = copied_rows = copied_bytes = 0
+    with connection.cursor() as cursor:
+        for table in ["ingredient_historical", "section_historical", "step_historical"]:
+            cursor.execute(_STORAGE_SQL.format(table=table), {"recipe_id": recipe.id})
+            (rows, size), (copy_rows, copy_size) = cursor.fetchall()
+            stored_rows += rows
+            stored_bytes += size
+            copied_rows += copy_rows
+            copied_bytes += copy_size
+    return stored_rows, stored_bytes, copied_rows, copied_bytes
+
+
+def main(
+    ingredients: list[int] = [10, 40],  # noqa: B006
+    steps: int = 12,
+    edits: int = 50,
+) -> None:
+    """
+    Edit one step at a time, saving a version after each edit.
+    """
+    for ingredient_count in ingredients:
+        with transaction.atomic():
+            user, recipe = _create_recipe(ingredients=ingredient_count, steps=steps)
+            save_recipe_version(recipe_id=recipe.id, actor=user)
+            recipe_steps = list(recipe.step_set.all())
+            start = time.perf_counter()
+            for i in range(edits):
+                step = recipe_steps[i % len(recipe_steps)]
+                step.text = f"edit {i} " + "stir " * 20
+                step.save()
+                save_recipe_version(recipe_id=recipe.id, actor=user)
+            save_sec = (time.perf_counter() - start) / edits
+            stored_rows, stored_bytes, copied_rows, copied_bytes = _storage(recipe)
+            transaction.set_rollback(True)
+        versions = edits + 1
+        print(
+            f"ingredients={ingredient_count:>3} steps={steps} versions={versions} "
+            f"save={save_sec * 1000:6.2f}ms\n"
+            f"  full copies:  rows={copied_rows:>6} bytes={copied_bytes:>8} "
+            f"rows/version={copied_rows / versions:6.1f}\n"
+            f"  shared rows:  rows={stored_rows:>6} bytes={stored_bytes:>8} "
+            f"rows/version={stored_rows / versions:6.1f} "
+            f"({copied_bytes / stored_bytes:.1f}x smaller)"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -8,6 +8,9 @@ class SearchIndexAsync(SearchIndex):
         self, search_index: Any, transporter: Any, config: Any, name: Any
     ) -> None: ...
     async def save_objects_async(self, objects: Iterable[dict[str, Any]]) -> None: ...
+    async def partial_update_objects_async(
+        self, objects: Iterable[dict[str, Any]]
+    ) -> None: ...
     async def delete_objects_async(self, object_ids: Iterable[str]) -> None: ...
     async def wait_task_async(
         self, task_id: int, request_options: Any | None = None
@@ -0,0 +1,54 @@
+// generated by recipeyak.api.base.codegen
+import { http } from "@/apiClient"
+
+/**
+ * The team's schedule grouped by day, a page of scheduled recipes at a
+ * time.
+ *
+ * Recipes & users are listed once per page instead of with every
+ * scheduled recipe. A day can span pages, so merge days with the same
+ * `on`.
+ */
+export function calendarDaysList(params: {
+  start: string
+  end: string
+  /** The `next_cursor` from the previous page. */
+  cursor?: string | null
+  limit?: number
+}) {
+  return http<{
+    days: Array<{
+      on: string
+      scheduled_recipes: Array<{
+        id: number
+        created: string
+        recipe_id: number
+        created_by_id: number | null
+      }>
+    }>
+    /** The recipes scheduled on this page, once each. */
+    recipes: Array<{
+      id: number
+      name: string
+      author: string | null
+      archivedAt: string | null
+      primaryImage: {
+        id: string
+        url: string
+        backgroundUrl: string | null
+      } | null
+    }>
+    /** The users who scheduled the recipes on this page. */
+    users: Array<{
+      id: number
+      name: string
+      avatar_url: string
+    }>
+    /** Pass as `cursor` to fetch the next page, which may continue the last day. */
+    next_cursor: string | null
+  }>({
+    url: "/api/v1/calendar/days/",
+    method: "get",
+    params,
+  })
+}
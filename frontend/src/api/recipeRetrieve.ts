@@ -1,7 +1,11 @@
 // generated by recipeyak.api.base.codegen
 import { http } from "@/apiClient"
 
-export function recipeRetrieve(params: { recipe_id: number }) {
+export function recipeRetrieve(params: {
+  recipe_id: number
+  /** Embed every previous version of the Recipe. */
+  include?: "versions" | null
+}) {
   return http<{
     /** Unique ID of the Recipe. */
     id: number
@@ -126,7 +130,7 @@ export function recipeRetrieve(params: { recipe_id: number }) {
       /** Name of User who created the Upload. */
       author: string | null
     } | null
-    /** The previous versions of the Recipe. */
+    /** The previous versions of the Recipe. Empty unless requested with `include=versions`, otherwise use the versions endpoint. */
     versions: Array<{
       id: number
       created_at: string
@@ -170,6 +174,8 @@ export function recipeRetrieve(params: { recipe_id: number }) {
         position: string
       }>
     }>
+    /** Sequence number of the last realtime message about the Recipe, to apply the following messages' patches to this response. */
+    realtime_seq: number
   }>({
     url: "/api/v1/recipes/{recipe_id}/",
     method: "get",
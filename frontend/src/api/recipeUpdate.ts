@@ -137,7 +137,7 @@ export function recipeUpdate(params: {
       /** Name of User who created the Upload. */
       author: string | null
     } | null
-    /** The previous versions of the Recipe. */
+    /** The previous versions of the Recipe. Empty unless requested with `include=versions`, otherwise use the versions endpoint. */
     versions: Array<{
       id: number
       created_at: string
@@ -181,6 +181,8 @@ export function recipeUpdate(params: {
         position: string
       }>
     }>
+    /** Sequence number of the last realtime message about the Recipe, to apply the following messages' patches to this response. */
+    realtime_seq: number
   }>({
     url: "/api/v1/recipes/{recipe_id}/",
     method: "patch",
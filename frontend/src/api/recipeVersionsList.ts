@@ -0,0 +1,33 @@
+// generated by recipeyak.api.base.codegen
+import { http } from "@/apiClient"
+
+/**
+ * Summaries of the Recipe's previous versions, newest first.
+ *
+ * Fetch a version's ingredients & steps with the version retrieve endpoint.
+ */
+export function recipeVersionsList(params: {
+  recipe_id: number
+  /** The `next_cursor` from the previous page. */
+  cursor?: string | null
+  limit?: number
+}) {
+  return http<{
+    versions: Array<{
+      id: number
+      created_at: string
+      actor: {
+        id: number
+        name: string
+        avatar_url: string
+      } | null
+    }>
+    /** Pass as `cursor` to fetch the next page of versions. */
+    next_cursor: string | null
+  }>({
+    url: "/api/v1/recipes/{recipe_id}/versions/",
+    method: "get",
+    params,
+    pathParamNames: ["recipe_id"],
+  })
+}
@@ -0,0 +1,44 @@
+// generated by recipeyak.api.base.codegen
+import { http } from "@/apiClient"
+
+/**
+ * Schedule many recipes at once, like when planning out a month.
+ *
+ * Either every recipe is scheduled or none are.
+ */
+export function scheduledRecipeBulkCreate(params: {
+  scheduled_recipes: ReadonlyArray<{
+    recipe: number
+    on: string
+  }>
+}) {
+  return http<{
+    scheduled_recipes: Array<{
+      id: number
+      created: string
+      createdBy: {
+        id: number
+        name: string
+        avatar_url: string
+      } | null
+      team: number | null
+      user: number | null
+      recipe: {
+        id: number
+        name: string
+        author: string | null
+        archivedAt: string | null
+        primaryImage: {
+          id: string
+          url: string
+          backgroundUrl: string | null
+        } | null
+      }
+      on: string
+    }>
+  }>({
+    url: "/api/v1/calendar/bulk/",
+    method: "post",
+    params,
+  })
+}
@@ -31,7 +31,6 @@ import { cookDetailURL, recipeURL } from "@/urls"
 
 type RecentSchedule = Recipe["recentSchedules"][number]
 type Ingredient = Recipe["ingredients"][number]
-type Versions = Recipe["versions"]
 
 function ingredientToString(ingre: Ingredient) {
   const s = ingre.quantity.trim() + " " + ingre.name.trim()
@@ -49,13 +48,11 @@ export function RecipeTitleDropdown({
   recipeAuthor,
   recipeImageUrl,
   recipeRecentScheduleHistory,
-  versions,
   toggleEditing,
   editingEnabled,
 }: {
   recipeId: number
   recipeName: string
-  versions: Versions
   recipeImageUrl: {
     id: string
     url: string
@@ -293,7 +290,7 @@ export function RecipeTitleDropdown({
         </div>
       </Modal>
       <RecipeVersionModal
-        versions={versions}
+        recipeId={recipeId}
         isOpen={showVersionModal}
         onOpenChange={setShowVersionModal}
       />
@@ -8,15 +8,24 @@ import {
 } from "@sanity/diff-match-patch"
 import { isSameYear, parseISO } from "date-fns"
 import { clamp, sortBy } from "lodash-es"
-import { useState } from "react"
+import { useEffect, useState } from "react"
 
 import { assertNever } from "@/assert"
 import { clx } from "@/classnames"
 import { Avatar } from "@/components/Avatar"
+import { Button } from "@/components/Buttons"
 import { Image } from "@/components/Image"
+import { Loader } from "@/components/Loader"
 import { Modal } from "@/components/Modal"
 import { formatAbsoluteDateTime, formatHumanDate } from "@/date"
-import { RecipeFetchResponse } from "@/queries/useRecipeFetch"
+import {
+  RecipeVersionFetchResponse,
+  useRecipeVersionFetch,
+} from "@/queries/useRecipeVersionFetch"
+import {
+  RecipeVersionSummary,
+  useRecipeVersionsList,
+} from "@/queries/useRecipeVersionsList"
 import { urlToDomain } from "@/text"
 import { useGlobalEvent } from "@/useGlobalEvent"
 
@@ -272,7 +281,7 @@ function StepsDiff({
   diff,
   type,
 }: {
-  diff: FieldDiff<Versions[number]["steps"]>
+  diff: FieldDiff<Ver["steps"]>
   type: "before" | "after"
 }) {
   const stepsAfter = diff.toValue
@@ -309,7 +318,7 @@ function StepsDiff({
   )
 }
 
-type Ingredient = Versions[number]["ingredients"][number]
+type Ingredient = Ver["ingredients"][number]
 
 function IngredientsDiff({
   diff,
@@ -397,7 +406,7 @@ function ImageDiff({
   diff,
   type,
 }: {
-  diff: FieldDiff<Versions[number]["primary_image"] | null>
+  diff: FieldDiff<Ver["primary_image"] | null>
   type: "before" | "after"
 }) {
   if (type === "before" && diff.fromValue == null) {
@@ -440,9 +449,9 @@ type DiffMapping = {
   time: FieldDiff<string | null>
   servings: FieldDiff<string | null>
   tags: FieldDiff<string[] | null>
-  primary_image: FieldDiff<Versions[number]["primary_image"] | null>
-  ingredients: FieldDiff<Versions[number]["ingredients"]>
-  steps: FieldDiff<Versions[number]["steps"]>
+  primary_image: FieldDiff<Ver["primary_image"] | null>
+  ingredients: FieldDiff<Ver["ingredients"]>
+  steps: FieldDiff<Ver["steps"]>
 }
 
 function RecipeView({
@@ -479,16 +488,10 @@ function RecipeView({
   )
 }
 
-type Ver = Versions[number]
-
-function getVersions(
-  currentVersion: number,
-  chngs: Versions,
-): [Ver | undefined, Ver, DiffMapping] {
-  const prev = chngs.at(currentVersion + 1)
-  const cur = chngs[currentVersion]
+type Ver = RecipeVersionFetchResponse
 
-  const diffMapping: DiffMapping = {
+function getDiffMapping(prev: Ver | undefined, cur: Ver): DiffMapping {
+  return {
     archived_at: {
       fromValue: prev?.archived_at ?? null,
       toValue: cur.archived_at,
@@ -530,24 +533,41 @@ function getVersions(
       toValue: cur.steps ?? [],
     },
   }
-  return [prev, cur, diffMapping]
 }
 
-type Versions = RecipeFetchResponse["versions"]
-
 function SideBySideDiff({
-  versions,
-  currentVersion,
+  recipeId,
+  versionId,
+  prevVersionId,
 }: {
-  versions: Versions
-  currentVersion: number
+  recipeId: number
+  versionId: number
+  /** undefined for the oldest version */
+  prevVersionId: number | undefined
 }) {
-  const [prev, cur, diffMapping] = getVersions(currentVersion, versions)
+  // only fetch the two snapshots we're comparing, rather than every version
+  const cur = useRecipeVersionFetch({ recipeId, versionId })
+  const prev = useRecipeVersionFetch({ recipeId, versionId: prevVersionId })
+  if (cur.isError || prev.isError) {
+    return <div className="grow text-center">error loading version</div>
+  }
+  if (cur.data == null || (prevVersionId != null && prev.data == null)) {
+    return (
+      <div className="grow">
+        <Loader />
+      </div>
+    )
+  }
+  const diffMapping = getDiffMapping(prev.data, cur.data)
   return (
     <div className="flex h-full grow flex-col gap-4 md:flex-row md:overflow-y-auto">
       {/* in a side by side diff, we show the deleted changes on the left side (previous version), and the added changes on the right side (current version) */}
-      <RecipeView recipeVersion={prev} diffs={diffMapping} type={"before"} />
-      <RecipeView recipeVersion={cur} diffs={diffMapping} type={"after"} />
+      <RecipeView
+        recipeVersion={prev.data}
+        diffs={diffMapping}
+        type={"before"}
+      />
+      <RecipeView recipeVersion={cur.data} diffs={diffMapping} type={"after"} />
     </div>
   )
 }
@@ -565,10 +585,16 @@ function VersionList({
   versions,
   currentVersion,
   setCurrentVersion,
+  hasMore,
+  loadingMore,
+  loadMore,
 }: {
-  versions: Versions
+  versions: readonly RecipeVersionSummary[]
   currentVersion: number
   setCurrentVersion: (_: number) => void
+  hasMore: boolean
+  loadingMore: boolean
+  loadMore: () => void
 }) {
   return (
     <div className="grow md:h-full md:min-w-[350px] md:max-w-[350px]">
@@ -592,11 +618,27 @@ function VersionList({
           </div>
         </div>
       ))}
+      {hasMore && (
+        <Button size="small" loading={loadingMore} onClick={loadMore}>
+          Load more
+        </Button>
+      )}
     </div>
   )
 }
-function RecipeVersionDiff({ versions }: { versions: Versions }) {
+function RecipeVersionDiff({ recipeId }: { recipeId: number }) {
   const [currentVersion, setCurrentVersion] = useState<number>(0)
+  const res = useRecipeVersionsList({ recipeId })
+  const versions = res.data?.pages.flatMap((page) => page.versions) ?? []
+  const { hasNextPage, isFetchingNextPage, fetchNextPage } = res
+  // the diff needs the version before the selected one, so fetch the next
+  // page when we select the last version we have
+  const needsNextPage = currentVersion >= versions.length - 1
+  useEffect(() => {
+    if (needsNextPage && hasNextPage && !isFetchingNextPage) {
+      void fetchNextPage()
+    }
+  }, [needsNextPage, hasNextPage, isFetchingNextPage, fetchNextPage])
   useGlobalEvent({
     keyDown: (e) => {
       switch (e.key) {
@@ -613,27 +655,51 @@ function RecipeVersionDiff({ versions }: { versions: Versions }) {
       }
     },
   })
+  if (res.isPending) {
+    return <Loader />
+  }
+  if (res.isError) {
+    return <div className="mt-10 text-center">error loading versions</div>
+  }
   if (versions.length === 0) {
     return <div className="mt-10 text-center">No versions found</div>
   }
+  const version = versions[currentVersion]
+  const prevVersion = versions.at(currentVersion + 1)
   return (
     <div className="flex h-full w-full flex-wrap gap-2 overflow-y-auto md:flex-nowrap md:[overflow-y:unset]">
       <VersionList
         currentVersion={currentVersion}
         versions={versions}
         setCurrentVersion={setCurrentVersion}
+        hasMore={hasNextPage}
+        loadingMore={isFetchingNextPage}
+        loadMore={() => {
+          void fetchNextPage()
+        }}
       />
-      <SideBySideDiff currentVersion={currentVersion} versions={versions} />
+      {/* wait for the next page before diffing the last version we have */}
+      {prevVersion == null && hasNextPage ? (
+        <div className="grow">
+          <Loader />
+        </div>
+      ) : (
+        <SideBySideDiff
+          recipeId={recipeId}
+          versionId={version.id}
+          prevVersionId={prevVersion?.id}
+        />
+      )}
     </div>
   )
 }
 
 export function RecipeVersionModal({
-  versions,
+  recipeId,
   isOpen,
   onOpenChange,
 }: {
-  versions: Versions
+  recipeId: number
   isOpen: boolean
   onOpenChange: (_: boolean) => void
 }) {
@@ -644,7 +710,7 @@ export function RecipeVersionModal({
       full
       onOpenChange={onOpenChange}
     >
-      <RecipeVersionDiff versions={versions} />
+      <RecipeVersionDiff recipeId={recipeId} />
     </Modal>
   )
 }
@@ -1,8 +1,8 @@
-import { QueryClient, useQuery } from "@tanstack/react-query"
+import { QueryClient, useQuery, useQueryClient } from "@tanstack/react-query"
 import { useChannel } from "ably/react"
 
 import { recipeRetrieve } from "@/api/recipeRetrieve"
-import { ResponseFromUse } from "@/queries/useQueryUtilTypes"
+import { PickVariant, ResponseFromUse } from "@/queries/useQueryUtilTypes"
 import { useTeamId } from "@/useTeamId"
 
 export function useRecipeFetch({ recipeId }: { recipeId: number }) {
@@ -11,10 +11,39 @@ export function useRecipeFetch({ recipeId }: { recipeId: number }) {
     queryKey: getQueryKey({ teamId, recipeId }),
     queryFn: () => recipeRetrieve({ recipe_id: recipeId }),
   })
+  const queryClient = useQueryClient()
   useChannel(`team:${teamId}:recipe:${recipeId}`, (message) => {
     switch (message.name) {
       case "recipe_modified": {
-        void res.refetch()
+        const data: RecipeModifiedMessage = message.data
+        const recipe = queryClient.getQueryData<Recipe>(
+          getQueryKey({ teamId, recipeId }),
+        )
+        if (recipe == null || data.seq == null) {
+          void res.refetch()
+          return
+        }
+        if (data.seq <= recipe.realtime_seq) {
+          // already have the change, probably from our own refetch
+          return
+        }
+        if (data.patch == null || data.seq !== recipe.realtime_seq + 1) {
+          // missed a message, or the change isn't patchable
+          void res.refetch()
+          return
+        }
+        const patch = data.patch
+        const seq = data.seq
+        cacheUpsertRecipe(queryClient, {
+          teamId,
+          recipeId,
+          updater: (prev) => {
+            if (prev == null) {
+              return prev
+            }
+            return { ...applyRecipePatch(prev, patch), realtime_seq: seq }
+          },
+        })
       }
     }
   })
@@ -53,3 +82,75 @@ export function cacheUpsertRecipe(
     updater,
   )
 }
+
+type Recipe = Awaited<ReturnType<typeof recipeRetrieve>>
+type TimelineItem = Recipe["timelineItems"][number]
+type Ingredient = Recipe["ingredients"][number]
+type Step = Recipe["steps"][number]
+type Section = Recipe["sections"][number]
+type Note = PickVariant<TimelineItem, "note">
+
+type RecipePatch =
+  | { kind: "ingredient"; op: "upsert"; id: number; value: Ingredient }
+  | { kind: "step"; op: "upsert"; id: number; value: Step }
+  | { kind: "section"; op: "upsert"; id: number; value: Section }
+  | { kind: "note"; op: "upsert"; id: string; value: Note }
+  | {
+      kind: "ingredient" | "step" | "section" | "note"
+      op: "delete"
+      id: number | string
+    }
+
+/** see `recipeyak.realtime.publish_recipe` */
+type RecipeModifiedMessage = {
+  id: number
+  seq: number | null
+  patch: RecipePatch | null
+}
+
+function upsert<T extends { id: unknown }>(items: T[], value: T): T[] {
+  if (items.some((x) => x.id === value.id)) {
+    return items.map((x) => (x.id === value.id ? value : x))
+  }
+  return [...items, value]
+}
+
+function applyRecipePatch(recipe: Recipe, patch: RecipePatch): Recipe {
+  if (patch.op === "delete") {
+    switch (patch.kind) {
+      case "ingredient":
+        return {
+          ...recipe,
+          ingredients: recipe.ingredients.filter((x) => x.id !== patch.id),
+        }
+      case "step":
+        return {
+          ...recipe,
+          steps: recipe.steps.filter((x) => x.id !== patch.id),
+        }
+      case "section":
+        return {
+          ...recipe,
+          sections: recipe.sections.filter((x) => x.id !== patch.id),
+        }
+      case "note":
+        return {
+          ...recipe,
+          timelineItems: recipe.timelineItems.filter((x) => x.id !== patch.id),
+        }
+    }
+  }
+  switch (patch.kind) {
+    case "ingredient":
+      return { ...recipe, ingredients: upsert(recipe.ingredients, patch.value) }
+    case "step":
+      return { ...recipe, steps: upsert(recipe.steps, patch.value) }
+    case "section":
+      return { ...recipe, sections: upsert(recipe.sections, patch.value) }
+    case "note":
+      return {
+        ...recipe,
+        timelineItems: upsert<TimelineItem>(recipe.timelineItems, patch.value),
+      }
+  }
+}
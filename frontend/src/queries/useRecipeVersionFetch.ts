@@ -0,0 +1,35 @@
+import { useQuery } from "@tanstack/react-query"
+
+import { recipeVersionRetrieve } from "@/api/recipeVersionRetrieve"
+import { ResponseFromUse } from "@/queries/useQueryUtilTypes"
+import { useTeamId } from "@/useTeamId"
+
+export function useRecipeVersionFetch({
+  recipeId,
+  versionId,
+}: {
+  recipeId: number
+  /** undefined skips fetching, e.g., the oldest version has no previous */
+  versionId: number | undefined
+}) {
+  const teamId = useTeamId()
+  return useQuery({
+    queryKey: [teamId, "recipes", recipeId, "versions", versionId],
+    queryFn: () => {
+      if (versionId == null) {
+        throw Error("query should be disabled without a version")
+      }
+      return recipeVersionRetrieve({
+        recipe_id: recipeId,
+        version_id: versionId,
+      })
+    },
+    enabled: versionId != null,
+    // versions are never modified
+    staleTime: Infinity,
+  })
+}
+
+export type RecipeVersionFetchResponse = ResponseFromUse<
+  typeof useRecipeVersionFetch
+>
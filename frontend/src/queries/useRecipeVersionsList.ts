@@ -0,0 +1,19 @@
+import { useInfiniteQuery } from "@tanstack/react-query"
+
+import { recipeVersionsList } from "@/api/recipeVersionsList"
+import { useTeamId } from "@/useTeamId"
+
+export type RecipeVersionSummary = Awaited<
+  ReturnType<typeof recipeVersionsList>
+>["versions"][number]
+
+export function useRecipeVersionsList({ recipeId }: { recipeId: number }) {
+  const teamId = useTeamId()
+  return useInfiniteQuery({
+    queryKey: [teamId, "recipes", recipeId, "versions"],
+    queryFn: ({ pageParam }) =>
+      recipeVersionsList({ recipe_id: recipeId, cursor: pageParam }),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next_cursor,
+  })
+}
@@ -56,6 +56,19 @@ export function useScheduledRecipeList({
         })
         break
       }
+      case "scheduled_recipes_updated": {
+        // eslint-disable-next-line @typescript-eslint/no-unsafe-assignment, @typescript-eslint/no-unsafe-argument
+        const apiRes: ScheduledRecipeUpdated[] = JSON.parse(message.data)
+        apiRes.forEach((updatedCalRecipe) => {
+          onScheduledRecipeUpdateSuccess({
+            queryClient,
+            scheduledRecipeId: updatedCalRecipe.id,
+            teamId,
+            updatedCalRecipe,
+          })
+        })
+        break
+      }
       case "scheduled_recipe_delete": {
         // eslint-disable-next-line @typescript-eslint/no-unsafe-assignment, @typescript-eslint/no-unsafe-argument
         const apiRes: { recipeId: number } = JSON.parse(message.data)